@@ -0,0 +1,170 @@
+"""
+Seeded generators of synthetic events.
+
+Every generator takes a ``random.Random`` instance, so a seed always produces the same
+corpus and results stay comparable across commits.
+"""
+
+import csv
+import random
+import string
+from collections import defaultdict
+from functools import lru_cache
+
+import orjson
+
+from schema_parser.functions.parse_win_event_log.parser import FIELD_MAPPING_PATH
+
+METHODS = ("GET", "GET", "GET", "POST", "PUT", "DELETE", "HEAD")
+STATUSES = (200, 200, 200, 201, 204, 301, 304, 400, 401, 403, 404, 500, 503)
+PATHS = ("/", "/index.html", "/api/v1/users", "/api/v1/orders", "/static/app.js", "/login")
+AGENTS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0",
+    "curl/8.4.0",
+    "python-requests/2.31.0",
+)
+ACCESS_LOG_PATTERN = (
+    r"^(?P<client_ip>\S+) \S+ (?P<user>\S+) \[(?P<timestamp>[^\]]+)\] "
+    r'"(?P<method>\S+) (?P<path>\S+) (?P<protocol>[^"]+)" (?P<status>\d{3}) (?P<bytes>\d+) '
+    r'"(?P<referrer>[^"]*)" "(?P<user_agent>[^"]*)"$'
+)
+
+
+def _word(rng: random.Random, length: int = 8) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=length))
+
+
+def _ip(rng: random.Random) -> str:
+    return ".".join(str(rng.randint(1, 254)) for _ in range(4))
+
+
+def _scalar(rng: random.Random) -> str | int | float | bool:
+    kind = rng.random()
+    if kind < 0.6:
+        return _word(rng, rng.randint(4, 24))
+    if kind < 0.85:
+        return rng.randint(0, 1_000_000)
+    if kind < 0.95:
+        return round(rng.uniform(0, 1000), 3)
+    return rng.random() < 0.5
+
+
+def nested_value(rng: random.Random, size: int, depth: int) -> dict:
+    """Returns a dictionary with ``size`` leaves spread over ``depth`` levels of nesting."""
+    if depth <= 1 or size <= 4:
+        return {f"{_word(rng, 6)}_{index}": _scalar(rng) for index in range(size)}
+    children = rng.randint(2, 4)
+    leaves = max(1, size // (children + 1))
+    value = {f"{_word(rng, 6)}_{index}": _scalar(rng) for index in range(leaves)}
+    remaining = size - leaves
+    for index in range(children):
+        child_size = remaining // (children - index)
+        remaining -= child_size
+        value[f"{_word(rng, 5)}_obj_{index}"] = nested_value(rng, child_size, depth - 1)
+    return value
+
+
+def nested_json_event(rng: random.Random, size: int = 50, depth: int = 4) -> dict:
+    """Returns an event with a serialized nested JSON document in the ``raw`` field."""
+    return {
+        "raw": orjson.dumps(nested_value(rng, size, depth)).decode(),
+        "source": "synthetic",
+    }
+
+
+def access_log_event(rng: random.Random) -> dict:
+    """Returns an event with an Apache combined log line in the ``message`` field."""
+    timestamp = (
+        f"{rng.randint(1, 28):02d}/Oct/2025:{rng.randint(0, 23):02d}:"
+        f"{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d} +0000"
+    )
+    path = rng.choice(PATHS)
+    if rng.random() < 0.3:
+        path = f"{path}?id={rng.randint(1, 99999)}&q={_word(rng, 6)}"
+    referrer = rng.choice(("-", f"https://{_word(rng, 6)}.example.com/"))
+    message = (
+        f"{_ip(rng)} - {rng.choice(('-', _word(rng, 5)))} [{timestamp}] "
+        f'"{rng.choice(METHODS)} {path} HTTP/1.1" {rng.choice(STATUSES)} '
+        f'{rng.randint(0, 50000)} "{referrer}" "{rng.choice(AGENTS)}"'
+    )
+    return {"message": message, "host": f"web-{rng.randint(1, 20):02d}"}
+
+
+@lru_cache(maxsize=1)
+def windows_event_fields() -> dict[str, list[tuple[str, str]]]:
+    """Returns the ``(section, field)`` pairs of every event ID in ``field_mapping.csv``."""
+    fields: dict[str, list[tuple[str, str]]] = defaultdict(list)
+    with FIELD_MAPPING_PATH.open(newline="", encoding="utf-8") as mapping:
+        for row in csv.DictReader(mapping):
+            fields[row["event_id"]].append((row["viewer_field_group"], row["viewer_field_name"]))
+    return dict(fields)
+
+
+def _windows_value(rng: random.Random, name: str) -> str:
+    lowered = name.lower()
+    if "security id" in lowered or lowered.endswith("sid"):
+        domain = f"{rng.randint(10**8, 10**9)}-{rng.randint(10**8, 10**9)}"
+        return f"S-1-5-21-{domain}-{rng.randint(500, 5000)}"
+    if "logon id" in lowered or "guid" in lowered:
+        return hex(rng.randint(0, 2**32))
+    if "address" in lowered:
+        return _ip(rng)
+    if "port" in lowered:
+        return str(rng.randint(1024, 65535))
+    if "name" in lowered:
+        return _word(rng, rng.randint(4, 12)).upper()
+    return _word(rng, rng.randint(3, 16))
+
+
+def windows_event(rng: random.Random) -> dict:
+    """Returns an event with Windows Event Log text for an event ID of ``field_mapping.csv``."""
+    fields = windows_event_fields()
+    event_id = rng.choice(sorted(fields))
+    lines = [
+        f"10/{rng.randint(1, 28):02d}/2025 {rng.randint(1, 12):02d}:{rng.randint(0, 59):02d}:00 AM",
+        "LogName=Security",
+        "SourceName=Microsoft Windows security auditing.",
+        f"EventCode={event_id}",
+        "EventType=0",
+        "Type=Information",
+        f"ComputerName={_word(rng, 8).upper()}.example.com",
+        f"RecordNumber={rng.randint(10**6, 10**9)}",
+        "Keywords=Audit Success",
+        f"Message=Synthetic event {event_id}.",
+    ]
+    section = None
+    for group, name in fields[event_id]:
+        if group != section:
+            lines.extend(("", f"{group}:"))
+            section = group
+        lines.append(f"\t{name}:\t\t{_windows_value(rng, name)}")
+    return {"raw": "\n".join(lines)}
+
+
+def windows_fields_event(rng: random.Random) -> dict:
+    """Returns an event with the parsed sections of an event ID of ``field_mapping.csv``."""
+    fields = windows_event_fields()
+    event_id = rng.choice(sorted(fields))
+    event: dict = {"EventID": event_id, "ComputerName": f"{_word(rng, 8).upper()}.example.com"}
+    for group, name in fields[event_id]:
+        event.setdefault(group, {})[name] = _windows_value(rng, name)
+    return event
+
+
+def wide_event(rng: random.Random, width: int = 200) -> dict:
+    """Returns a flat event with ``width`` top-level fields and a nested ``user`` object."""
+    event = {f"field_{index}": _scalar(rng) for index in range(width)}
+    event["user"] = {
+        "name": _word(rng),
+        "domain": _word(rng, 6).upper(),
+        "id": rng.randint(1000, 99999),
+        "groups": [_word(rng, 5) for _ in range(3)],
+    }
+    return event
+
+
+def corpus(generator, count: int, seed: int, **kwargs) -> list[dict]:
+    """Returns ``count`` events of a generator for a seed."""
+    rng = random.Random(seed)
+    return [generator(rng, **kwargs) for _ in range(count)]
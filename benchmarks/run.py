@@ -0,0 +1,375 @@
+"""
+Benchmarks of the core functions, end-to-end pipelines and the query normalizer.
+
+Inputs come from the seeded generators in ``benchmarks.generators``. Every case
+reports events per second and the p50 and p99 latency of a single event, and the
+results are written as JSON to compare them across commits::
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --cases regex,pipeline_windows --events 5000
+
+Function cases call the function directly on fresh copies of the inputs, once per
+step of their configuration, so functions that take a microsecond or two run enough
+times per event to be timed reliably. Pipeline cases call
+``ParserManager.configured_parser`` with the options of the case, including the copy
+of the event. The time of a fixed calibration workload is recorded with the results, so
+``benchmarks.compare`` can normalize them for the speed of the machine.
+"""
+
+import argparse
+import copy
+import platform
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any
+
+import orjson
+
+from benchmarks import generators
+from schema_parser.manager import ParserManager
+
+DEFAULT_EVENTS = 2000
+DEFAULT_SEED = 1337
+WIDE_DROPPED = ",".join(f"field_{index}" for index in range(0, 200, 4))
+FLAT_RENAMES = tuple(
+    ("rename", {"from_field": f"field_{index}", "to_field": f"renamed.field_{index}"})
+    for index in range(0, 600, 12)
+)
+WIDE_MAPPING = ", ".join(
+    [f"field_{index}:renamed.field_{index}" for index in range(0, 200, 4)] + ["user.name:user_name"]
+)
+SAMPLED_HOSTS = ",".join(f"web-{index:02d}" for index in range(1, 11))
+FLAT_SETS = tuple(("set", {"field": f"tags.tag_{index}", "value": index}) for index in range(50))
+
+
+def config(*steps: tuple[str, dict[str, Any]], name: str | None = None) -> dict:
+    """Returns a version 2 parser configuration of ``(function, args)`` steps."""
+    parser_config: dict[str, Any] = {
+        "version": 2,
+        "steps": [{"function": function, "args": args} for function, args in steps],
+    }
+    if name is not None:
+        parser_config["name"] = name
+    return parser_config
+
+
+@dataclass(frozen=True)
+class Case:
+    """A benchmark case: a kind, a corpus and the configuration run on it."""
+
+    name: str
+    kind: str
+    corpus: Callable[[int, int], list]
+    parser_config: dict | None = None
+    options: dict[str, Any] = field(default_factory=dict)
+
+
+def _corpus(generator: Callable, **kwargs: Any) -> Callable[[int, int], list[dict]]:
+    return partial(generators.corpus, generator, **kwargs)
+
+
+JSON_EVENTS = _corpus(generators.nested_json_event, size=50, depth=4)
+LARGE_JSON_EVENTS = _corpus(generators.nested_json_event, size=500, depth=6)
+ACCESS_LOG_EVENTS = _corpus(generators.access_log_event)
+WINDOWS_EVENTS = _corpus(generators.windows_event)
+WIDE_EVENTS = _corpus(generators.wide_event, width=200)
+WIDER_EVENTS = _corpus(generators.wide_event, width=600)
+WINDOWS_FIELDS_EVENTS = _corpus(generators.windows_fields_event)
+
+QUERIES = (
+    'parse_json(field="raw") | drop(fields="raw")',
+    'parse_win_event_log(field="raw") | drop(fields="raw") '
+    '| rename(from="EventID", to="event.code")',
+    'drop(fields="field_0,field_4,*_tmp") | rename(from="field_1", to="renamed") '
+    '| extract(field="user") | keep(fields="renamed,name,domain")',
+    'regex(field="message", pattern="^(?P<client_ip>\\S+) ") if startswith(field="message", '
+    'value="1") | optional set(field="event.kind", value="web") | sample(rate=0.5, key="host")',
+)
+
+
+def _queries(count: int, seed: int) -> list[str]:
+    return [QUERIES[index % len(QUERIES)] for index in range(count)]
+
+
+CASES = (
+    Case("parse_json", "function", JSON_EVENTS, config(("parse_json", {"field": "raw"}))),
+    Case(
+        "parse_json_large", "function", LARGE_JSON_EVENTS, config(("parse_json", {"field": "raw"}))
+    ),
+    Case(
+        "regex",
+        "function",
+        ACCESS_LOG_EVENTS,
+        config(("regex", {"field": "message", "pattern": generators.ACCESS_LOG_PATTERN})),
+    ),
+    Case(
+        "parse_win_event_log",
+        "function",
+        WINDOWS_EVENTS,
+        config(("parse_win_event_log", {"field": "raw"})),
+    ),
+    Case("drop", "function", WIDE_EVENTS, config(("drop", {"fields": WIDE_DROPPED}))),
+    Case(
+        "rename",
+        "function",
+        WIDE_EVENTS,
+        config(("rename", {"from_field": "field_1", "to_field": "renamed.field"})),
+    ),
+    Case("extract", "function", WIDE_EVENTS, config(("extract", {"field": "user"}))),
+    Case(
+        "keep", "function", WIDE_EVENTS, config(("keep", {"fields": "field_1,field_2,user.name"}))
+    ),
+    Case("set", "function", WIDE_EVENTS, config(*FLAT_SETS)),
+    Case(
+        "filter",
+        "function",
+        ACCESS_LOG_EVENTS,
+        config(("filter", {"field": "host", "values": SAMPLED_HOSTS})),
+    ),
+    Case(
+        "require",
+        "function",
+        WIDE_EVENTS,
+        config(("require", {"fields": f"{WIDE_DROPPED},user.name"})),
+    ),
+    Case(
+        "sample", "function", ACCESS_LOG_EVENTS, config(("sample", {"rate": 0.5, "key": "host"}))
+    ),
+    Case("rename_map", "function", WIDE_EVENTS, config(("rename_map", {"mapping": WIDE_MAPPING}))),
+    Case(
+        "map_fields",
+        "function",
+        WINDOWS_FIELDS_EVENTS,
+        config(("map_fields", {"table": "windows_event_log", "key_field": "EventID"})),
+    ),
+    Case(
+        "pipeline_json",
+        "pipeline",
+        JSON_EVENTS,
+        config(("parse_json", {"field": "raw"}), ("drop", {"fields": "raw"}), name="json"),
+    ),
+    Case(
+        "pipeline_access_log",
+        "pipeline",
+        ACCESS_LOG_EVENTS,
+        config(
+            ("regex", {"field": "message", "pattern": generators.ACCESS_LOG_PATTERN}),
+            ("drop", {"fields": "message"}),
+            ("set", {"field": "event.kind", "value": "web"}),
+            name="access_log",
+        ),
+    ),
+    Case(
+        "pipeline_windows",
+        "pipeline",
+        WINDOWS_EVENTS,
+        config(
+            ("parse_win_event_log", {"field": "raw"}),
+            ("drop", {"fields": "raw"}),
+            ("rename", {"from_field": "EventID", "to_field": "event.code"}),
+            name="windows",
+        ),
+    ),
+    Case(
+        "pipeline_wide",
+        "pipeline",
+        WIDE_EVENTS,
+        config(
+            ("drop", {"fields": WIDE_DROPPED}),
+            ("rename", {"from_field": "field_1", "to_field": "renamed"}),
+            ("extract", {"field": "user"}),
+            ("keep", {"fields": "renamed,name,domain,field_2,field_3"}),
+            name="wide",
+        ),
+    ),
+    Case(
+        "pipeline_flat_wide",
+        "pipeline",
+        WIDER_EVENTS,
+        config(*FLAT_RENAMES, *FLAT_SETS, name="flat_wide"),
+        {"flat_native": True},
+    ),
+    Case("query_normalizer", "query", _queries),
+)
+
+
+def _runner(case: Case, manager: ParserManager) -> Callable[[Any], Any]:
+    if case.kind == "query":
+        return manager.query_normalizer.parse_query
+    if case.kind == "pipeline":
+        return partial(manager.configured_parser, parser_config=case.parser_config, **case.options)
+    # Functions modify their input, so every event is a fresh copy made before timing
+    calls = [
+        partial(manager.core_functions[step["function"]].execute, **step["args"])
+        for step in case.parser_config["steps"]
+    ]
+    if len(calls) == 1:
+        return calls[0]
+
+    def run_calls(data: dict) -> dict:
+        for call in calls:
+            data = call(data)
+        return data
+
+    return run_calls
+
+
+def _percentile(latencies: list[int], percentile: float) -> int:
+    index = min(len(latencies) - 1, int(len(latencies) * percentile / 100))
+    return latencies[index]
+
+
+def measure(
+    run: Callable[[Any], Any], inputs: list, repeat: int = 1, warmup: int = 100
+) -> dict[str, Any]:
+    """
+    Runs a callable on every input and measures its latency.
+
+    Args:
+        run: Callable taking a single input
+        inputs: Inputs, consumed once per repetition
+        repeat: Number of passes over the inputs
+        warmup: Number of inputs run before measuring
+
+    Returns:
+        Dictionary with the number of events, events per second and latency percentiles
+    """
+    for item in copy.deepcopy(inputs[:warmup]):
+        run(item)
+
+    latencies = []
+    total = 0
+    for _ in range(repeat):
+        batch = copy.deepcopy(inputs)
+        for item in batch:
+            start = perf_counter_ns()
+            run(item)
+            elapsed = perf_counter_ns() - start
+            latencies.append(elapsed)
+            total += elapsed
+    latencies.sort()
+    return {
+        "events": len(latencies),
+        "events_per_sec": len(latencies) / total * 1e9 if total else 0.0,
+        "p50_ns": _percentile(latencies, 50),
+        "p99_ns": _percentile(latencies, 99),
+        "mean_ns": total // len(latencies) if latencies else 0,
+    }
+
+
+def run_case(case: Case, events: int, seed: int) -> dict[str, Any]:
+    """Runs a benchmark case on a generated corpus."""
+    manager = ParserManager()
+    inputs = case.corpus(events, seed)
+    result = measure(_runner(case, manager), inputs)
+    return {"kind": case.kind, **result}
+
+
+def _calibration_workload() -> int:
+    # Dictionary, string and loop operations like the parser's, without the library
+    data = {f"key_{index}": str(index) for index in range(2000)}
+    total = 0
+    for key, value in data.items():
+        if key.startswith("key_1"):
+            total += len(value.split("1"))
+    return total
+
+
+def calibrate(rounds: int = 20) -> int:
+    """
+    Returns the fastest time in nanoseconds of a fixed pure-Python workload.
+
+    Dividing latencies by it normalizes them for the speed of the machine.
+    """
+    fastest = None
+    for _ in range(rounds):
+        start = perf_counter_ns()
+        _calibration_workload()
+        elapsed = perf_counter_ns() - start
+        fastest = elapsed if fastest is None else min(fastest, elapsed)
+    return fastest
+
+
+def _commit() -> str | None:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def run_benchmarks(
+    cases: list[Case] | None = None, events: int = DEFAULT_EVENTS, seed: int = DEFAULT_SEED
+) -> dict[str, Any]:
+    """Runs benchmark cases and returns the results with the environment they ran in."""
+    calibration_ns = calibrate()
+    results = {case.name: run_case(case, events, seed) for case in cases or CASES}
+    return {
+        "metadata": {
+            "calibration_ns": min(calibration_ns, calibrate()),
+            "timestamp": time.time(),
+            "commit": _commit(),
+            "python": sys.version,
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "events": events,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def select_cases(names: str | None) -> list[Case]:
+    """Returns the cases with the given comma-separated names, or all of them."""
+    if not names:
+        return list(CASES)
+    by_name = {case.name: case for case in CASES}
+    unknown = [name for name in names.split(",") if name not in by_name]
+    if unknown:
+        raise SystemExit(f"Unknown cases: {', '.join(unknown)}. Known: {', '.join(by_name)}")
+    return [by_name[name] for name in names.split(",")]
+
+
+def format_results(report: dict[str, Any]) -> str:
+    lines = [f"{'case':<24}{'kind':<10}{'events/s':>12}{'p50 us':>10}{'p99 us':>10}"]
+    for name, result in report["results"].items():
+        lines.append(
+            f"{name:<24}{result['kind']:<10}{result['events_per_sec']:>12.0f}"
+            f"{result['p50_ns'] / 1000:>10.1f}{result['p99_ns'] / 1000:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--events", type=int, default=DEFAULT_EVENTS, help="Events per case")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Corpus seed")
+    parser.add_argument("--cases", help="Comma-separated case names. Default: all")
+    parser.add_argument("--output", type=Path, help="JSON file to write the results to")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(select_cases(args.cases), events=args.events, seed=args.seed)
+    print(format_results(report))
+    if args.output:
+        args.output.write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
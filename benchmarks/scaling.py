@@ -0,0 +1,284 @@
+"""
+Multi-core throughput scaling harness.
+
+Runs a parser configuration on a corpus with thread and process pools of increasing
+size and reports at every level the throughput in events per second, the per-core
+efficiency (throughput divided by the single-worker throughput times the number of
+workers) and the p50 and p99 latency of a single event::
+
+    python -m benchmarks.scaling --case pipeline_windows --workers 1,2,4,8
+    python -m benchmarks.scaling --query 'parse_json(field="raw")' --events-file events.jsonl
+
+Events that fail to parse are counted at every level, and the run fails if there are
+any, so a broken query is not benchmarked silently.
+
+Threads only scale on a free-threaded CPython build (3.13t and later), which is
+detected with ``sys._is_gil_enabled``. ``--python`` runs the harness again with other
+interpreters, e.g. a free-threaded build, and reports all of them together.
+"""
+
+import argparse
+import os
+import platform
+import subprocess
+import sys
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any
+
+import orjson
+
+from benchmarks.run import DEFAULT_EVENTS, DEFAULT_SEED, select_cases
+from schema_parser.manager import ParserManager
+
+EXECUTORS: dict[str, Callable[..., Executor]] = {
+    "thread": ThreadPoolExecutor,
+    "process": ProcessPoolExecutor,
+}
+DEFAULT_CHUNK_SIZE = 256
+
+# Parser of the current worker, set by the pool initializer
+_manager: ParserManager | None = None
+_parser_config: dict | None = None
+_parser_options: dict[str, Any] = {}
+
+
+def gil_enabled() -> bool:
+    """Returns whether the GIL is enabled, which is always the case before Python 3.13."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def _initialize(parser_config: dict, options: dict[str, Any]) -> None:
+    global _manager, _parser_config, _parser_options
+    _manager = ParserManager()
+    _parser_config = parser_config
+    _parser_options = options
+
+
+def _parse_chunk(events: list[dict]) -> tuple[list[int], int]:
+    latencies = []
+    errors = 0
+    for event in events:
+        start = perf_counter_ns()
+        try:
+            _manager.configured_parser(event, _parser_config, **_parser_options)
+        except Exception:
+            errors += 1
+        latencies.append(perf_counter_ns() - start)
+    return latencies, errors
+
+
+def _chunks(events: list[dict], size: int) -> list[list[dict]]:
+    return [events[index : index + size] for index in range(0, len(events), size)]
+
+
+def _percentile(latencies: list[int], percentile: float) -> int:
+    return latencies[min(len(latencies) - 1, int(len(latencies) * percentile / 100))]
+
+
+def measure_level(
+    executor: str,
+    workers: int,
+    events: list[dict],
+    parser_config: dict,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    options: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Parses all events with a pool of workers and measures the throughput.
+
+    The pool is started and warmed up before measuring, so worker start-up is not
+    included. Events are sent to the workers in chunks. Failed events are counted in
+    ``errors`` and included in the latencies. ``options`` are passed to
+    ``configured_parser``, e.g. ``{"flat_native": True}``.
+    """
+    chunks = _chunks(events, chunk_size)
+    pool_class = EXECUTORS[executor]
+    initargs = (parser_config, options or {})
+    with pool_class(workers, initializer=_initialize, initargs=initargs) as pool:
+        list(pool.map(_parse_chunk, chunks[:workers]))
+        start = perf_counter_ns()
+        results = list(pool.map(_parse_chunk, chunks))
+        elapsed = perf_counter_ns() - start
+    latencies = [latency for chunk_latencies, _ in results for latency in chunk_latencies]
+    latencies.sort()
+    return {
+        "executor": executor,
+        "workers": workers,
+        "events": len(latencies),
+        "errors": sum(errors for _, errors in results),
+        "events_per_sec": len(latencies) / elapsed * 1e9,
+        "p50_ns": _percentile(latencies, 50),
+        "p99_ns": _percentile(latencies, 99),
+    }
+
+
+def run_scaling(
+    events: list[dict],
+    parser_config: dict,
+    worker_counts: list[int],
+    executors: list[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    options: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Measures every executor at every worker count and adds the per-core efficiency."""
+    results = []
+    for executor in executors:
+        single = None
+        for workers in worker_counts:
+            level = measure_level(
+                executor, workers, events, parser_config, chunk_size, options
+            )
+            if single is None:
+                # Efficiency is relative to the smallest measured level
+                single = level["events_per_sec"] / workers
+            level["efficiency"] = level["events_per_sec"] / (single * workers)
+            results.append(level)
+    return {
+        "metadata": {
+            "python": sys.version,
+            "executable": sys.executable,
+            "implementation": platform.python_implementation(),
+            "gil_enabled": gil_enabled(),
+            "cpu_count": os.cpu_count(),
+            "events": len(events),
+            "chunk_size": chunk_size,
+            "options": options or {},
+        },
+        "results": results,
+    }
+
+
+def _default_workers() -> list[int]:
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+    return counts
+
+
+def _load_events(path: Path) -> list[dict]:
+    return [orjson.loads(line) for line in path.read_bytes().splitlines() if line.strip()]
+
+
+def _run_interpreter(python: str, argv: list[str]) -> dict[str, Any]:
+    # The interpreter needs its own installation of the package and its dependencies
+    paths = [str(Path(__file__).parent.parent), os.environ.get("PYTHONPATH", "")]
+    output = subprocess.run(
+        [python, "-m", "benchmarks.scaling", *argv, "--json"],
+        capture_output=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, paths))},
+    )
+    # The exit status is 1 when events failed, which the report also shows
+    if not output.stdout:
+        raise RuntimeError(f"{python} failed: {output.stderr.decode()}")
+    return orjson.loads(output.stdout)
+
+
+def format_report(report: dict[str, Any]) -> str:
+    metadata = report["metadata"]
+    gil = "enabled" if metadata["gil_enabled"] else "disabled"
+    lines = [
+        f"{metadata['implementation']} {metadata['python'].split()[0]}, GIL {gil}, "
+        f"{metadata['cpu_count']} CPUs, {metadata['events']} events",
+        f"{'executor':<10}{'workers':>8}{'events/s':>12}{'efficiency':>12}"
+        f"{'p50 us':>10}{'p99 us':>10}{'errors':>8}",
+    ]
+    for level in report["results"]:
+        lines.append(
+            f"{level['executor']:<10}{level['workers']:>8}{level['events_per_sec']:>12.0f}"
+            f"{level['efficiency']:>12.2f}{level['p50_ns'] / 1000:>10.1f}"
+            f"{level['p99_ns'] / 1000:>10.1f}{level['errors']:>8}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.scaling",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--case", default="pipeline_windows", help="Pipeline case of the suite")
+    source.add_argument("--query", help="Parser query, used with --events-file")
+    parser.add_argument("--events-file", type=Path, help="JSON Lines corpus for --query")
+    parser.add_argument("--events", type=int, default=DEFAULT_EVENTS * 5, help="Generated events")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Corpus seed")
+    parser.add_argument("--workers", help="Comma-separated worker counts. Default: 1, 2, 4...CPUs")
+    parser.add_argument(
+        "--executors", default="thread,process", help="Executors. Default: thread,process"
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument(
+        "--python", action="append", default=[], help="Other interpreter to run the harness with"
+    )
+    parser.add_argument("--json", action="store_true", help="Write the report as JSON")
+    parser.add_argument("--output", type=Path, help="JSON file to write the reports to")
+    args = parser.parse_args(argv)
+
+    options: dict[str, Any] = {}
+    if args.query is not None:
+        if args.events_file is None:
+            parser.error("--query requires --events-file")
+        parser_config = ParserManager.query_normalizer.parse_query(args.query, version=2)
+        events = _load_events(args.events_file)
+    else:
+        case = select_cases(args.case)[0]
+        if case.kind != "pipeline":
+            parser.error(f"{args.case} is not a pipeline case")
+        parser_config = case.parser_config
+        options = case.options
+        events = case.corpus(args.events, args.seed)
+
+    workers = [int(count) for count in args.workers.split(",")] if args.workers else None
+    executors = args.executors.split(",")
+    unknown = [executor for executor in executors if executor not in EXECUTORS]
+    if unknown:
+        parser.error(f"Unknown executors: {', '.join(unknown)}")
+    reports = [
+        run_scaling(
+            events,
+            parser_config,
+            workers or _default_workers(),
+            executors,
+            args.chunk_size,
+            options,
+        )
+    ]
+
+    # The other interpreters get the same arguments, without the interpreters and outputs
+    forwarded = []
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg in ("--python", "--output"):
+            skip = True
+        elif not arg.startswith(("--python=", "--output=")) and arg != "--json":
+            forwarded.append(arg)
+    reports.extend(_run_interpreter(python, forwarded) for python in args.python)
+
+    if args.json:
+        output = reports[0] if len(reports) == 1 else reports
+        sys.stdout.write(orjson.dumps(output).decode() + "\n")
+    else:
+        print("\n\n".join(format_report(report) for report in reports))
+    if args.output:
+        args.output.write_bytes(orjson.dumps(reports, option=orjson.OPT_INDENT_2))
+
+    errors = sum(level["errors"] for report in reports for level in report["results"])
+    if errors:
+        sys.stderr.write(f"{errors} events failed to parse, the results are not valid\n")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Command line interface.
+
+Parses events from a JSON Lines file (or standard input) with a query or a parser
+configuration and writes the results as JSON Lines::
+
+    python -m schema_parser --query 'parse_json(field="raw")' --events events.jsonl
+
+Lines that are not valid JSON and events that fail to parse are reported on standard
+error with their line number and skipped; the exit status is 1 if there were any.
+With ``--profile-memory``, a sample of the events is profiled with
+``schema_parser.memory_profiler.MemoryProfiler`` and the report is written instead.
+"""
+
+import argparse
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO
+
+import orjson
+
+from schema_parser.core.lazy_json import dumps
+from schema_parser.core.outcomes import FILTERED
+from schema_parser.manager import ParserManager
+from schema_parser.memory_profiler import MemoryProfiler
+
+
+def _report(line_number: int, message: str) -> None:
+    sys.stderr.write(f"Line {line_number}: {message}\n")
+
+
+def _read_events(stream: IO[bytes], failed: list[int]) -> Iterator[tuple[int, dict]]:
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_number, orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            _report(line_number, f"invalid JSON: {e}")
+            failed.append(line_number)
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m schema_parser", description="Parses JSON Lines events."
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--query", help="Parser query")
+    source.add_argument("--config", type=Path, help="JSON file with a parser configuration")
+    parser.add_argument(
+        "--events", type=Path, help="JSON Lines file with events. Default: standard input"
+    )
+    parser.add_argument("--flatten", action="store_true", help="Flatten the results")
+    parser.add_argument("--flat-native", action="store_true", help="Run in flat-native mode")
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="Write a memory allocation profile of the steps instead of the results",
+    )
+    parser.add_argument(
+        "--every", type=_positive_int, default=1, help="Profile every n-th event. Default: 1"
+    )
+    parser.add_argument("--max-events", type=int, help="Maximum number of profiled events")
+    parser.add_argument(
+        "--count-blocks", action="store_true", help="Count memory blocks, which is much slower"
+    )
+    parser.add_argument("--json", action="store_true", help="Write the profile as JSON")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parser().parse_args(argv)
+    manager = ParserManager()
+    if args.query is not None:
+        parser_config = manager.query_normalizer.parse_query(args.query, version=2)
+    else:
+        parser_config = orjson.loads(args.config.read_bytes())
+    options = {"flatten": args.flatten, "flat_native": args.flat_native}
+
+    failed: list[int] = []
+    with args.events.open("rb") if args.events else sys.stdin.buffer as stream:
+        events = _read_events(stream, failed)
+        if args.profile_memory:
+            profiler = MemoryProfiler(manager, count_blocks=args.count_blocks)
+            report = profiler.profile(
+                (event for _, event in events),
+                parser_config,
+                every=args.every,
+                max_events=args.max_events,
+                **options,
+            )
+            if args.json:
+                print(orjson.dumps(report.to_dict(), option=orjson.OPT_INDENT_2).decode())
+            else:
+                print(report.format_table())
+            return 1 if failed else 0
+
+        for line_number, event in events:
+            try:
+                result = manager.configured_parser(event, parser_config, **options)
+                if result is not FILTERED:
+                    sys.stdout.write(dumps(result).decode() + "\n")
+            except Exception as e:
+                _report(line_number, f"{type(e).__name__}: {e}")
+                failed.append(line_number)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+Adaptive load shedding with optional steps.
+
+Steps marked as ``optional`` (e.g. enrichment or recursive JSON decoding) can be
+skipped when the parser falls behind. ``AdaptiveExecutor`` runs a parser
+configuration on a stream or batch of events and switches to degraded mode, in which
+optional steps are skipped, when the input queue depth or the recent per-event latency
+passes a threshold. It switches back once both are below the resume thresholds, which
+are lower than the thresholds, so the mode does not flap around a single value.
+"""
+
+import logging
+from collections import deque
+from collections.abc import Iterable, Sized
+from time import perf_counter_ns
+from typing import Any
+
+from schema_parser.core.outcomes import FILTERED, Filtered
+from schema_parser.manager import ParserManager
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveExecutor:
+    """
+    Runs a parser configuration and skips optional steps under load.
+
+    Args:
+        parser_config: Parser configuration with optional steps
+        max_queue_depth: Queue depth above which optional steps are skipped
+        max_latency_ms: Mean per-event latency in milliseconds above which optional
+            steps are skipped
+        resume_queue_depth: Queue depth at or below which optional steps run again.
+            Default: half of ``max_queue_depth``
+        resume_latency_ms: Mean latency at or below which optional steps run again.
+            Default: half of ``max_latency_ms``
+        latency_window: Number of recent events the mean latency is computed over
+        manager: Parser manager, a new ``ParserManager`` by default
+        **options: Other options of ``configured_parser``
+
+    Raises:
+        ValueError: If no threshold is given or a resume threshold exceeds its
+            threshold
+
+    Example:
+        executor = AdaptiveExecutor(parser_config, max_queue_depth=10000, max_latency_ms=2)
+        while True:
+            event = queue.get()
+            result = executor.parse(event, queue_depth=queue.qsize())
+    """
+
+    def __init__(
+        self,
+        parser_config: dict,
+        max_queue_depth: int | None = None,
+        max_latency_ms: float | None = None,
+        resume_queue_depth: int | None = None,
+        resume_latency_ms: float | None = None,
+        latency_window: int = 100,
+        manager: ParserManager | None = None,
+        **options: Any,
+    ):
+        if max_queue_depth is None and max_latency_ms is None:
+            raise ValueError("Either max_queue_depth or max_latency_ms must be given")
+        if max_queue_depth is not None and resume_queue_depth is None:
+            resume_queue_depth = max_queue_depth // 2
+        if max_latency_ms is not None and resume_latency_ms is None:
+            resume_latency_ms = max_latency_ms / 2
+        if max_queue_depth is not None and resume_queue_depth > max_queue_depth:
+            raise ValueError("resume_queue_depth must not exceed max_queue_depth")
+        if max_latency_ms is not None and resume_latency_ms > max_latency_ms:
+            raise ValueError("resume_latency_ms must not exceed max_latency_ms")
+
+        self.manager = manager or ParserManager()
+        self.parser_config = parser_config
+        self.options = options
+        self.max_queue_depth = max_queue_depth
+        self.max_latency_ns = None if max_latency_ms is None else max_latency_ms * 1e6
+        self.resume_queue_depth = resume_queue_depth
+        self.resume_latency_ns = None if resume_latency_ms is None else resume_latency_ms * 1e6
+
+        self.degraded = False
+        self.events = 0
+        self.degraded_events = 0
+        self.mode_changes = 0
+        self._latencies: deque[int] = deque(maxlen=latency_window)
+        self._latency_total = 0
+
+    @property
+    def latency_ms(self) -> float:
+        """Mean latency of the recent events in milliseconds."""
+        if not self._latencies:
+            return 0.0
+        return self._latency_total / len(self._latencies) / 1e6
+
+    def parse(self, event: dict, queue_depth: int | None = None) -> dict | Filtered:
+        """
+        Parses an event, skipping optional steps in degraded mode.
+
+        Args:
+            event: Event to parse
+            queue_depth: Current number of events waiting in the input queue, if known
+
+        Returns:
+            Result of ``configured_parser``
+        """
+        self._update_mode(queue_depth)
+        start = perf_counter_ns()
+        result = self.manager.configured_parser(
+            event, self.parser_config, skip_optional=self.degraded, **self.options
+        )
+        self._record_latency(perf_counter_ns() - start)
+        self.events += 1
+        if self.degraded:
+            self.degraded_events += 1
+        return result
+
+    def process(self, events: Iterable[dict], keep_filtered: bool = False) -> list[dict | Filtered]:
+        """
+        Parses a batch of events like ``ParserManager.batch_parser``.
+
+        The events of a sized batch that are not parsed yet count as the queue depth.
+        """
+        remaining = len(events) if isinstance(events, Sized) else None
+        results = []
+        for event in events:
+            if remaining is not None:
+                remaining -= 1
+            result = self.parse(event, queue_depth=remaining)
+            if result is not FILTERED or keep_filtered:
+                results.append(result)
+        return results
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the number of events processed in total and in degraded mode."""
+        return {
+            "events": self.events,
+            "degraded_events": self.degraded_events,
+            "mode_changes": self.mode_changes,
+            "degraded": self.degraded,
+            "latency_ms": self.latency_ms,
+        }
+
+    def _record_latency(self, latency: int) -> None:
+        if len(self._latencies) == self._latencies.maxlen:
+            self._latency_total -= self._latencies[0]
+        self._latencies.append(latency)
+        self._latency_total += latency
+
+    def _update_mode(self, queue_depth: int | None) -> None:
+        latency = self._latency_total / len(self._latencies) if self._latencies else 0.0
+        if not self.degraded:
+            overloaded = (
+                self.max_queue_depth is not None
+                and queue_depth is not None
+                and queue_depth > self.max_queue_depth
+            ) or (self.max_latency_ns is not None and latency > self.max_latency_ns)
+            if overloaded:
+                self.degraded = True
+                self.mode_changes += 1
+                logger.warning(
+                    f"Skipping optional steps: queue depth {queue_depth}, "
+                    f"latency {latency / 1e6:.3f} ms"
+                )
+            return
+
+        drained = (
+            self.resume_queue_depth is None
+            or queue_depth is None
+            or queue_depth <= self.resume_queue_depth
+        ) and (self.resume_latency_ns is None or latency <= self.resume_latency_ns)
+        if drained:
+            self.degraded = False
+            self.mode_changes += 1
+            logger.info(
+                f"Running optional steps again after {self.degraded_events} degraded events"
+            )
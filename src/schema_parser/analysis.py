@@ -0,0 +1,312 @@
+"""
+Static analysis of parser pipelines.
+
+The analysis walks the steps of a pipeline backwards and tracks which field paths are
+live, i.e. can still influence the fields the caller consumes. Two kinds of liveness
+are tracked:
+
+- full: the whole subtree under the path is needed
+- shape: only the existence and the type of the value at the path are needed
+  (e.g. ``rename`` fails when the source field is missing)
+
+The result is used to push projections down into ``parse_json`` steps, so parsed
+objects only keep the subpaths the rest of the pipeline actually reads.
+"""
+
+import copy
+from dataclasses import dataclass, field
+from typing import Any
+
+from schema_parser.core.path_trie import is_glob
+from schema_parser.pipeline import PipelineStep, dump_steps, get_config_version, load_steps
+
+ROOT = ""
+
+
+def _covers(prefix: str, path: str) -> bool:
+    """Returns True if ``path`` is ``prefix`` itself or lies under it."""
+    return not prefix or path == prefix or path.startswith(f"{prefix}.")
+
+
+def _join(prefix: str, path: str) -> str:
+    if not path:
+        return prefix
+    if not prefix:
+        return path
+    return f"{prefix}.{path}"
+
+
+def _relative(prefix: str, path: str) -> str:
+    return path[len(prefix) + 1 :] if prefix else path
+
+
+def _minimize(paths: set[str]) -> set[str]:
+    """Removes paths that are already covered by another path of the set."""
+    return {
+        path for path in paths if not any(other != path and _covers(other, path) for other in paths)
+    }
+
+
+@dataclass(slots=True)
+class LivePaths:
+    """Paths that are live at some point of a pipeline."""
+
+    full: set[str] = field(default_factory=set)
+    shape: set[str] = field(default_factory=set)
+
+    @classmethod
+    def everything(cls) -> "LivePaths":
+        return cls(full={ROOT})
+
+    def without(self, prefix: str) -> None:
+        """Kills every live path under ``prefix``."""
+        self.full = {path for path in self.full if not _covers(prefix, path)}
+        self.shape = {path for path in self.shape if not _covers(prefix, path)}
+
+    def under(self, prefix: str) -> tuple[set[str], set[str]]:
+        """Returns the live paths under ``prefix``, relative to it."""
+        full = {_relative(prefix, path) for path in self.full if _covers(prefix, path)}
+        shape = {_relative(prefix, path) for path in self.shape if _covers(prefix, path)}
+        return full, shape
+
+    def needs_whole(self, prefix: str) -> bool:
+        """Returns True if the whole subtree under ``prefix`` is live."""
+        return any(_covers(path, prefix) for path in self.full)
+
+    def to_paths(self) -> list[str]:
+        """
+        Returns the minimal list of paths whose subtrees satisfy this liveness.
+
+        A shape requirement is satisfied by any full path under it (projections keep
+        the values on the way to a selected path), otherwise it is upgraded to full.
+        The root shape is always kept by a projection.
+        """
+        paths = set(self.full)
+        for path in self.shape - {ROOT}:
+            if not any(_covers(path, other) or _covers(other, path) for other in self.full):
+                paths.add(path)
+        return sorted(_minimize(paths))
+
+
+class LivenessAnalyzer:
+    """
+    Backward liveness analysis over the steps of a pipeline.
+
+    Every transfer method receives the live paths after the step and updates them to
+    the live paths before the step. Unknown functions make everything live. A step
+    with a guard or an optional step may be skipped, so the live paths before it are
+    the union of both cases, plus the field the guard reads.
+    """
+
+    def __init__(self):
+        self.transfer_functions = {
+            "parse_json": self._parse_json,
+            "regex": self._read_field,
+            "parse_win_event_log": self._read_field,
+            "rename": self._rename,
+            "drop": self._drop,
+            "set": self._set,
+            "extract": self._extract,
+            "keep": self._keep,
+            "filter": self._check_fields,
+            "require": self._check_fields,
+            "sample": self._check_fields,
+        }
+
+    def analyze(
+        self, steps: list[PipelineStep], output_fields: list[str] | None = None
+    ) -> tuple[LivePaths, list[str | None]]:
+        """
+        Runs the analysis.
+
+        Args:
+            steps: Pipeline steps
+            output_fields: Fields of the result the caller consumes. ``None`` means
+                the whole result.
+
+        Returns:
+            The live paths of the input event and, for every step, the projection
+            that can be pushed into it (comma-separated paths) or None.
+        """
+        if output_fields is None:
+            live = LivePaths.everything()
+        else:
+            live = LivePaths(full={path for path in output_fields if path is not None})
+
+        projections: list[str | None] = [None] * len(steps)
+        for index in range(len(steps) - 1, -1, -1):
+            step = steps[index]
+            transfer = self.transfer_functions.get(step.function)
+            if transfer is None:
+                live = LivePaths.everything()
+                continue
+            if step.guard is None and not step.optional:
+                live, projections[index] = transfer(live, step.args)
+                continue
+            skipped = LivePaths(set(live.full), set(live.shape))
+            live, projections[index] = transfer(live, step.args)
+            live.full.update(skipped.full)
+            live.shape.update(skipped.shape)
+            if step.guard is not None:
+                live.full.add(step.guard["field"])
+        return live, projections
+
+    @staticmethod
+    def _parse_json(live: LivePaths, args: dict[str, Any]) -> tuple[LivePaths, str | None]:
+        field_name = args["field"]
+        if args.get("in_place", False):
+            projection = None
+            if not live.needs_whole(field_name):
+                full, shape = live.under(field_name)
+                projection = ",".join(LivePaths(full=full, shape=shape).to_paths())
+            live.without(field_name)
+            live.full.add(field_name)
+            return live, projection
+
+        projection = None if live.needs_whole(ROOT) else ",".join(live.to_paths())
+        # A missing or empty field returns the event unchanged, so what is live after
+        # the step stays live before it
+        live.full.add(field_name)
+        return live, projection
+
+    @staticmethod
+    def _read_field(live: LivePaths, args: dict[str, Any]) -> tuple[LivePaths, None]:
+        # The step builds a new result from a single field
+        return LivePaths(full={args["field"]}), None
+
+    @staticmethod
+    def _check_fields(live: LivePaths, args: dict[str, Any]) -> tuple[LivePaths, None]:
+        # The step does not modify the data, it only reads the checked fields
+        fields = args.get("field") or args.get("fields") or args["key"]
+        live.full.update(field.strip() for field in fields.split(",") if field.strip())
+        return live, None
+
+    @staticmethod
+    def _rename(live: LivePaths, args: dict[str, Any]) -> tuple[LivePaths, None]:
+        source, target = args["from_field"], args["to_field"]
+        if _covers(source, target) or _covers(target, source):
+            return LivePaths.everything(), None
+
+        def move(paths: set[str]) -> set[str]:
+            moved = set()
+            for path in paths:
+                if _covers(target, path):
+                    moved.add(_join(source, _relative(target, path)))
+                elif not _covers(source, path):
+                    moved.add(path)
+            return moved
+
+        target_consumed = any(_covers(path, target) for path in live.full)
+        before = LivePaths(full=move(live.full), shape=move(live.shape))
+        if target_consumed:
+            before.full.add(source)
+        # Rename fails when the source field is missing
+        before.shape.add(source)
+        return before, None
+
+    @staticmethod
+    def _drop(live: LivePaths, args: dict[str, Any]) -> tuple[LivePaths, None]:
+        for field_name in args["fields"].split(","):
+            if field_name.strip():
+                live.without(field_name.strip())
+        return live, None
+
+    @staticmethod
+    def _set(live: LivePaths, args: dict[str, Any]) -> tuple[LivePaths, None]:
+        live.without(args["field"])
+        return live, None
+
+    @staticmethod
+    def _extract(live: LivePaths, args: dict[str, Any]) -> tuple[LivePaths, None]:
+        field_name = args["field"]
+        before = LivePaths()
+        for paths, before_paths in ((live.full, before.full), (live.shape, before.shape)):
+            for path in paths:
+                # A top-level key after the step comes either from the extracted
+                # dictionary or from the data itself
+                before_paths.add(_join(field_name, path))
+                if not _covers(field_name, path):
+                    before_paths.add(path)
+        before.shape.add(field_name)
+        return before, None
+
+    @staticmethod
+    def _keep(live: LivePaths, args: dict[str, Any]) -> tuple[LivePaths, None]:
+        before = LivePaths()
+        for field_name in args["fields"].split(","):
+            field_name = field_name.strip()
+            if not field_name:
+                continue
+            parts = field_name.split(".")
+            glob_index = next((i for i, part in enumerate(parts) if is_glob(part)), None)
+            if glob_index is not None:
+                # Everything under the literal prefix of a glob pattern may be kept
+                before.full.add(".".join(parts[:glob_index]))
+            elif live.needs_whole(field_name):
+                before.full.add(field_name)
+            else:
+                full, shape = live.under(field_name)
+                before.full.update(_join(field_name, path) for path in full)
+                before.shape.update(_join(field_name, path) for path in shape)
+        # Nothing outside the kept fields survives the step
+        return before, None
+
+
+def required_paths(parser_config: dict, output_fields: list[str] | None = None) -> list[str]:
+    """
+    Computes the paths of the input event a pipeline reads to produce ``output_fields``.
+
+    Args:
+        parser_config: Parser configuration
+        output_fields: Fields of the result the caller consumes. ``None`` means the
+            whole result.
+
+    Returns:
+        Sorted minimal list of input paths. ``[""]`` means the whole event.
+    """
+    live, _ = LivenessAnalyzer().analyze(load_steps(parser_config), output_fields)
+    return live.to_paths()
+
+
+def push_down_projection(parser_config: dict, output_fields: list[str]) -> dict:
+    """
+    Returns a copy of the parser configuration with projections pushed into ``parse_json``.
+
+    Every ``parse_json`` step gets a ``paths`` argument listing the subpaths of the
+    parsed value the rest of the pipeline reads, so the other subtrees are discarded
+    right after decoding. The result restricted to ``output_fields`` is unchanged.
+    ``parse_json`` steps that already have ``paths`` are left as they are.
+
+    Args:
+        parser_config: Parser configuration
+        output_fields: Fields of the result the caller consumes
+
+    Returns:
+        A new parser configuration
+    """
+    steps = load_steps(copy.deepcopy(parser_config))
+    _, projections = LivenessAnalyzer().analyze(steps, output_fields)
+
+    if get_config_version(parser_config) != 1:
+        for step, projection in zip(steps, projections):
+            if step.function == "parse_json" and "paths" not in step.args:
+                if projection is not None:
+                    step.args["paths"] = projection
+        return dump_steps(
+            steps, version=get_config_version(parser_config), name=parser_config.get("name")
+        )
+
+    # Steps of the same function share arguments in version 1, so their
+    # projections are merged
+    result = copy.deepcopy(parser_config)
+    merged: dict[str, list[str | None]] = {}
+    for step, projection in zip(steps, projections):
+        if step.function == "parse_json" and "paths" not in step.args:
+            merged.setdefault(step.function, []).append(projection)
+
+    for function_name, function_projections in merged.items():
+        if None in function_projections:
+            continue
+        paths = {path for projection in function_projections for path in projection.split(",")}
+        result["args"][function_name]["paths"] = ",".join(sorted(_minimize(paths - {ROOT})))
+    return result
@@ -0,0 +1,140 @@
+import copy
+from collections.abc import Callable, Iterator, MutableMapping
+from typing import Any
+
+import orjson
+
+from schema_parser.core.exceptions import ParseJsonFunctionError
+
+
+class LazyJson(MutableMapping):
+    """
+    Mapping proxy over a raw JSON object string that is parsed on first access.
+
+    Key access, iteration, length and mutation parse the string with orjson once and
+    work on the parsed dictionary afterwards. A proxy that was never accessed is
+    serialized back to the original string by ``dumps`` / ``json_default``. The string
+    is validated with one orjson parse whose result is discarded (once per proxy), so
+    events that are only routed onward still cost a parse, but are never transformed
+    or re-serialized. The original string is written even if ``transform`` would
+    change the parsed value.
+
+    Args:
+        raw: JSON object string
+        field: Name of the field the string was read from, used in error messages
+        transform: Optional post-processing applied to the parsed dictionary
+    """
+
+    __slots__ = ("raw", "field", "transform", "_value", "_valid")
+
+    def __init__(
+        self,
+        raw: str,
+        field: str | None = None,
+        transform: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+    ):
+        self.raw = raw
+        self.field = field
+        self.transform = transform
+        self._value: dict[str, Any] | None = None
+        self._valid: bool | None = None
+
+    @property
+    def parsed(self) -> bool:
+        """Whether the raw string has been parsed."""
+        return self._value is not None
+
+    @property
+    def valid(self) -> bool:
+        """Whether the raw string is valid JSON. Validated on first use."""
+        if self._valid is None:
+            try:
+                orjson.loads(self.raw)
+            except orjson.JSONDecodeError:
+                self._valid = False
+            else:
+                self._valid = True
+        return self._valid
+
+    @property
+    def value(self) -> dict[str, Any]:
+        """The parsed dictionary. Parses the raw string on first access."""
+        if self._value is None:
+            try:
+                value = orjson.loads(self.raw)
+            except orjson.JSONDecodeError as e:
+                raise ParseJsonFunctionError(
+                    message=f"Failed to load JSON from field `{self.field}` - {e}",
+                    field=self.field,
+                    field_value=self.raw,
+                )
+            if not isinstance(value, dict):
+                raise ParseJsonFunctionError(
+                    message=(
+                        f"Field `{self.field}` contains unsupported data type: "
+                        f"{type(value).__name__}. Expected a JSON object for lazy parsing."
+                    ),
+                    field=self.field,
+                    field_value=self.raw,
+                )
+            if self.transform is not None:
+                value = self.transform(value)
+            self._value = value
+        return self._value
+
+    def __getitem__(self, key: str) -> Any:
+        return self.value[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.value[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self.value[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.value)
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.value
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> "LazyJson | dict[str, Any]":
+        if self._value is None:
+            proxy = LazyJson(self.raw, self.field, self.transform)
+            proxy._valid = self._valid
+            return proxy
+        return copy.deepcopy(self._value, memo)
+
+    def __repr__(self) -> str:
+        if self._value is None:
+            return f"LazyJson({self.raw!r})"
+        return f"LazyJson({self._value!r})"
+
+
+def json_default(obj: Any) -> Any:
+    """
+    ``default`` hook for ``orjson.dumps`` that serializes ``LazyJson`` proxies.
+
+    Proxies that were never accessed are embedded as their original JSON text. Text
+    that is not valid JSON is serialized as the original string instead, so it cannot
+    corrupt the output.
+    """
+    if isinstance(obj, LazyJson):
+        if obj.parsed:
+            return obj.value
+        if not obj.valid:
+            return obj.raw
+        return orjson.Fragment(obj.raw)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(obj: Any, option: int | None = None) -> bytes:
+    """Serializes ``obj`` with orjson, supporting ``LazyJson`` proxies."""
+    return orjson.dumps(obj, default=json_default, option=option)
+
+
+def is_json_object(value: str) -> bool:
+    """Cheap check whether a string looks like a JSON object."""
+    return value.lstrip()[:1] == "{"
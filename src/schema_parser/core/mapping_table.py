@@ -0,0 +1,210 @@
+import csv
+import os
+import sys
+import threading
+from collections.abc import Iterator, Mapping
+from types import MappingProxyType
+
+Entries = Mapping[tuple[str, ...], str]
+
+
+class MappingTable:
+    """
+    Field mappings indexed by a discriminator value such as an EventID or a logsource.
+
+    Every entry maps a tuple of source values (e.g. a section and a field name) to a
+    target field, so a lookup is a single dictionary access per discriminator value.
+    The table is read-only: ``index`` and the entries are ``MappingProxyType`` views.
+
+    Args:
+        index: Mapping of discriminator values to entries
+
+    Example:
+        table = MappingTable({"4688": {("Subject", "Account Name"): "SubjectUserName"}})
+        table.lookup("4688", "Subject", "Account Name")  # "SubjectUserName"
+    """
+
+    __slots__ = ("index", "_index")
+
+    def __init__(self, index: dict[str, dict[tuple[str, ...], str]]):
+        self._index = index
+        self.index: Mapping[str, Entries] = MappingProxyType(
+            {key: MappingProxyType(entries) for key, entries in index.items()}
+        )
+
+    def get(self, key: str) -> Entries | None:
+        """Returns the entries of a discriminator value, or None if there are none."""
+        return self.index.get(key)
+
+    def lookup(self, key: str | None, *source: str) -> str | None:
+        """Returns the target field of a source, or None if it is not mapped."""
+        entries = self._index.get(key)
+        if entries is None:
+            return None
+        return entries.get(source)
+
+    def footprint(self, seen: set[int] | None = None) -> int:
+        """
+        Returns the approximate memory used by the table in bytes.
+
+        Args:
+            seen: Ids of objects that are already counted, e.g. strings shared with
+                other tables. Updated with the objects of this table.
+        """
+        seen = set() if seen is None else seen
+        size = sys.getsizeof(self._index)
+
+        def count(obj: object) -> int:
+            if id(obj) in seen:
+                return 0
+            seen.add(id(obj))
+            return sys.getsizeof(obj)
+
+        for key, entries in self._index.items():
+            size += count(key) + sys.getsizeof(entries)
+            for source, target in entries.items():
+                size += sys.getsizeof(source) + count(target)
+                size += sum(count(value) for value in source)
+        return size
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+def read_mapping_table(
+    path: str,
+    key_column: str = "key",
+    source_columns: tuple[str, ...] = ("from_field",),
+    target_column: str = "to_field",
+) -> MappingTable:
+    """
+    Reads a mapping table from a CSV file.
+
+    All strings are interned, so field names repeated within and across tables are
+    stored once per process.
+
+    Args:
+        path: Path of the CSV file
+        key_column: Column with the discriminator value
+        source_columns: Columns that identify the source of an entry
+        target_column: Column with the target field
+
+    Returns:
+        The table
+
+    Raises:
+        ValueError: If a column is missing
+    """
+    intern = sys.intern
+    index: dict[str, dict[tuple[str, ...], str]] = {}
+    with open(path, encoding="utf-8", newline="") as infile:
+        reader = csv.DictReader(infile)
+        columns = (key_column, *source_columns, target_column)
+        missing = [column for column in columns if column not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"Mapping table {path} has no columns: {', '.join(missing)}")
+
+        for row in reader:
+            source = tuple(intern(row[column].strip()) for column in source_columns)
+            entries = index.setdefault(intern(row[key_column].strip()), {})
+            entries[source] = intern(row[target_column].strip())
+    return MappingTable(index)
+
+
+class MappingRegistry:
+    """
+    Process-wide registry of mapping tables.
+
+    Every table is read once per process and shared by all pipelines that reference
+    it, either by path or by a registered name such as a logsource. Loading is
+    thread-safe.
+    """
+
+    def __init__(self):
+        self._tables: dict[tuple, MappingTable] = {}
+        self._names: dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def load(
+        self,
+        path: str,
+        key_column: str = "key",
+        source_columns: tuple[str, ...] = ("from_field",),
+        target_column: str = "to_field",
+    ) -> MappingTable:
+        """Returns the table of a CSV file, reading it on first use."""
+        table_key = self._table_key(path, key_column, source_columns, target_column)
+        table = self._tables.get(table_key)
+        if table is None:
+            with self._lock:
+                table = self._tables.get(table_key)
+                if table is None:
+                    table = read_mapping_table(*table_key)
+                    self._tables[table_key] = table
+        return table
+
+    def register(
+        self,
+        name: str,
+        path: str,
+        key_column: str = "key",
+        source_columns: tuple[str, ...] = ("from_field",),
+        target_column: str = "to_field",
+    ) -> MappingTable:
+        """Registers a table under a name (e.g. a logsource) and loads it."""
+        table = self.load(path, key_column, source_columns, target_column)
+        self._names[name] = self._table_key(path, key_column, source_columns, target_column)
+        return table
+
+    @staticmethod
+    def _table_key(
+        path: str, key_column: str, source_columns: tuple[str, ...], target_column: str
+    ) -> tuple:
+        # The same file referenced by different relative paths is read once
+        return (os.path.abspath(path), key_column, tuple(source_columns), target_column)
+
+    def get(self, table: str) -> MappingTable:
+        """Returns a table by registered name, or loads a CSV file with default columns."""
+        table_key = self._names.get(table)
+        if table_key is not None:
+            return self._tables[table_key]
+        return self.load(table)
+
+    def names(self) -> list[str]:
+        """Returns the registered table names."""
+        return list(self._names)
+
+    def footprint(self) -> dict[str, int]:
+        """
+        Reports the approximate memory used by every table in bytes.
+
+        Tables are reported by registered name or by path. Strings shared by several
+        tables are counted for the first one only, so ``total`` is the memory used by
+        all tables together.
+        """
+        labels = {table_key: name for name, table_key in self._names.items()}
+        seen: set[int] = set()
+        report = {}
+        for table_key, table in list(self._tables.items()):
+            report[labels.get(table_key, table_key[0])] = table.footprint(seen)
+        report["total"] = sum(report.values())
+        return report
+
+
+MAPPING_REGISTRY = MappingRegistry()
+
+
+def load_mapping_table(
+    path: str,
+    key_column: str = "key",
+    source_columns: tuple[str, ...] = ("from_field",),
+    target_column: str = "to_field",
+) -> MappingTable:
+    """Loads a mapping table through the process-wide ``MAPPING_REGISTRY``."""
+    return MAPPING_REGISTRY.load(path, key_column, source_columns, target_column)
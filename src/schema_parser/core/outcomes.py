@@ -0,0 +1,18 @@
+class Filtered:
+    """
+    Outcome of an event that was filtered out by a ``filter`` or ``require`` step.
+
+    There is a single instance, ``FILTERED``; compare results with ``is``.
+    """
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "FILTERED"
+
+    def __reduce__(self) -> str:
+        # Unpickled as the module-level instance, so identity checks keep working
+        return "FILTERED"
+
+
+FILTERED = Filtered()
@@ -0,0 +1,184 @@
+import re
+from collections.abc import Iterable
+from fnmatch import translate
+from functools import lru_cache
+from typing import Any
+
+from schema_parser.core.lazy_json import LazyJson
+
+GLOB_CHARACTERS = frozenset("*?[")
+
+
+def is_glob(segment: str) -> bool:
+    """Returns True if a path segment is a glob pattern such as ``*`` or ``*_tmp``."""
+    return not GLOB_CHARACTERS.isdisjoint(segment)
+
+
+class PathTrie:
+    """
+    Prefix trie of dot-separated field paths.
+
+    Every node corresponds to a path segment. A terminal node marks the end of a
+    path inserted into the trie, so the whole subtree under it is selected. Segments
+    with glob characters (``*``, ``?``, ``[``) match any key accepted by ``fnmatch``,
+    e.g. ``winlog.*.raw`` or ``*_tmp``.
+
+    Example:
+        trie = PathTrie(["user.name", "event"])
+        trie.project({"user": {"name": "John", "id": 1}, "event": {"id": 2}, "x": 1})
+        # {"user": {"name": "John"}, "event": {"id": 2}}
+    """
+
+    __slots__ = ("children", "patterns", "terminal")
+
+    def __init__(self, paths: Iterable[str] = ()):
+        self.children: dict[str, PathTrie] = {}
+        self.patterns: dict[str, tuple[re.Pattern, PathTrie]] = {}
+        self.terminal = False
+        for path in paths:
+            self.insert(path)
+
+    def insert(self, path: str) -> None:
+        """Inserts a dot-separated path. An empty path selects the whole object."""
+        node = self
+        if path:
+            for part in path.split("."):
+                node = node._child(part)
+        node.terminal = True
+
+    def _child(self, part: str) -> "PathTrie":
+        if is_glob(part):
+            entry = self.patterns.get(part)
+            if entry is None:
+                entry = self.patterns[part] = (re.compile(translate(part)), PathTrie())
+            return entry[1]
+        child = self.children.get(part)
+        if child is None:
+            child = self.children[part] = PathTrie()
+        return child
+
+    def project(self, obj: dict[str, Any]) -> dict[str, Any]:
+        """
+        Builds a new dictionary containing only the selected paths of ``obj``.
+
+        Selected subtrees are shared with ``obj``, not copied. Values found on the way
+        to a selected path are kept in shape: dictionaries are kept and non-dictionary
+        values are kept as is, so existence and type checks on them behave the same on
+        the projected dictionary. A dictionary with values keeps at least one leaf, so
+        it does not turn into an empty dictionary that the flat representation treats
+        as missing.
+        """
+        if self.terminal:
+            return obj
+        return _walk((self,), obj, strict=False)
+
+    def select(self, obj: dict[str, Any]) -> dict[str, Any]:
+        """
+        Builds a new dictionary containing only the values under the selected paths.
+
+        Unlike ``project``, values on the way to a selected path that do not contain
+        it are not kept, so the result has no empty dictionaries added by the walk.
+        Selected subtrees are shared with ``obj``, not copied.
+        """
+        if self.terminal:
+            return obj
+        return _walk((self,), obj, strict=True)
+
+    def remove(self, obj: dict[str, Any]) -> None:
+        """Deletes the values under the selected paths from ``obj`` in a single walk."""
+        _remove((self,), obj)
+
+    def selects_flat(self, key: str) -> bool:
+        """Returns True if a flat (dot-keyed) key lies under a selected path."""
+        nodes: list[PathTrie] = [self]
+        for part in key.split("."):
+            if any(node.terminal for node in nodes):
+                return True
+            nodes = _match(nodes, part)
+            if not nodes:
+                return False
+        return any(node.terminal for node in nodes)
+
+
+def _match(nodes: Iterable[PathTrie], key: str) -> list[PathTrie]:
+    matched = []
+    for node in nodes:
+        child = node.children.get(key)
+        if child is not None:
+            matched.append(child)
+        for pattern, pattern_child in node.patterns.values():
+            if pattern.match(key):
+                matched.append(pattern_child)
+    return matched
+
+
+def _walk(nodes: tuple[PathTrie, ...], obj: dict[str, Any], strict: bool) -> dict[str, Any]:
+    if len(nodes) == 1 and not nodes[0].patterns:
+        # Only exact segments: look up the selected keys instead of scanning the object
+        keys: Iterable[str] = nodes[0].children
+    else:
+        keys = list(obj)
+
+    result: dict[str, Any] = {}
+    for key in keys:
+        if key not in obj:
+            continue
+        matched = _match(nodes, key)
+        if not matched:
+            continue
+        value = obj[key]
+        if any(node.terminal for node in matched):
+            result[key] = value
+            continue
+        if isinstance(value, LazyJson):
+            value = value.value
+        if isinstance(value, dict):
+            selected = _walk(tuple(matched), value, strict)
+            if selected or not strict:
+                result[key] = selected
+        elif not strict:
+            result[key] = value
+    if not result and not strict:
+        return _any_leaf(obj) or result
+    return result
+
+
+def _any_leaf(obj: dict[str, Any]) -> dict[str, Any] | None:
+    """Returns a dictionary with a single leaf of ``obj``, or None if it has no leaves."""
+    for key, value in obj.items():
+        if isinstance(value, LazyJson):
+            value = value.value
+        if not isinstance(value, dict):
+            return {key: value}
+        leaf = _any_leaf(value)
+        if leaf is not None:
+            return {key: leaf}
+    return None
+
+
+def _remove(nodes: tuple[PathTrie, ...], obj: dict[str, Any]) -> None:
+    if len(nodes) == 1 and not nodes[0].patterns:
+        keys: Iterable[str] = nodes[0].children
+    else:
+        keys = list(obj)
+
+    for key in keys:
+        if key not in obj:
+            continue
+        matched = _match(nodes, key)
+        if not matched:
+            continue
+        if any(node.terminal for node in matched):
+            del obj[key]
+            continue
+        value = obj[key]
+        if isinstance(value, LazyJson):
+            value = value.value
+        if isinstance(value, dict):
+            _remove(tuple(matched), value)
+
+
+@lru_cache(maxsize=1024)
+def compile_paths(paths: str) -> PathTrie:
+    """Compiles a comma-separated list of paths into a cached ``PathTrie``."""
+    return PathTrie([path.strip() for path in paths.split(",") if path.strip()])
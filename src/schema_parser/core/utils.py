@@ -1,5 +1,11 @@
+import copy
 from typing import Any
 
+from schema_parser.core.lazy_json import LazyJson
+
+# Immutable leaf types that flatten_copy shares instead of copying
+ATOMIC_TYPES = frozenset({str, int, float, bool, type(None)})
+
 
 def is_empty_value(value: Any) -> bool:
     """
@@ -24,36 +30,44 @@ def is_empty_value(value: Any) -> bool:
     return False
 
 
-def get_value(obj: dict[str, Any], path: str) -> Any:
+def get_value(obj: dict[str, Any], path: str, literal_keys: bool = True) -> Any:
     """
     Get a value from a nested dictionary using a dot-separated path.
 
     If the path is a single key, it will return the value of the key.
     If the path is a nested path, it will return the value of the nested path.
+    ``LazyJson`` values on the way are parsed on access.
 
     Args:
         obj: The dictionary to search in
         path: The dot-separated path to the value
+        literal_keys: Whether to look up the path as a literal key first.
+            Can be disabled for data normalized with ``normalize_keys``.
 
     Returns:
         The value at the specified path, or None if the path is not found
     """
-    if path in obj:
+    if literal_keys and path in obj:
         return obj[path]
     parts = path.split(".")
     cur: Any = obj
     for p in parts:
-        if not isinstance(cur, dict) or p not in cur:
+        if not isinstance(cur, dict):
+            if not isinstance(cur, LazyJson):
+                return None
+            cur = cur.value
+        if p not in cur:
             return None
         cur = cur[p]
     return cur
 
 
-def set_value(obj: dict[str, Any], path: str, value: Any) -> None:
+def set_value(obj: dict[str, Any], path: str, value: Any, literal_keys: bool = True) -> None:
     """
     Set a value in a nested dictionary using a dot-separated path.
 
     Creates intermediate dictionaries if they don't exist.
+    ``LazyJson`` values on the way are parsed on access.
     If a direct key exists with the same name as the path (e.g., "a.b" exists as a key),
     it will be replaced with the nested structure.
 
@@ -61,6 +75,8 @@ def set_value(obj: dict[str, Any], path: str, value: Any) -> None:
         obj: The dictionary to modify
         path: The dot-separated path to set
         value: The value to set
+        literal_keys: Whether to remove a literal key equal to the path first.
+            Can be disabled for data normalized with ``normalize_keys``.
 
     Example:
         set_value({"a": {}}, "a.b.c", "value")  # {"a": {"b": {"c": "value"}}}
@@ -71,30 +87,34 @@ def set_value(obj: dict[str, Any], path: str, value: Any) -> None:
         return
 
     # If path exists as a direct key, remove it first
-    if path in obj:
+    if literal_keys and path in obj:
         del obj[path]
 
     parts = path.split(".")
     cur: Any = obj
     for p in parts[:-1]:
-        if p not in cur:
-            cur[p] = {}
-        elif not isinstance(cur[p], dict):
-            cur[p] = {}
-        cur = cur[p]
+        child = cur.get(p)
+        if isinstance(child, LazyJson):
+            child = child.value
+        elif not isinstance(child, dict):
+            child = cur[p] = {}
+        cur = child
     cur[parts[-1]] = value
 
 
-def delete_value(obj: dict[str, Any], path: str) -> Any:
+def delete_value(obj: dict[str, Any], path: str, literal_keys: bool = True) -> Any:
     """
     Delete a value from a nested dictionary using a dot-separated path.
 
     If a direct key exists with the same name as the path (e.g., "a.b" exists as a key),
     it will be deleted instead of trying to access the nested path.
+    ``LazyJson`` values on the way are parsed on access.
 
     Args:
         obj: The dictionary to modify
         path: The dot-separated path to delete
+        literal_keys: Whether to delete a literal key equal to the path first.
+            Can be disabled for data normalized with ``normalize_keys``.
 
     Returns:
         The deleted value, or None if the path was not found
@@ -107,15 +127,328 @@ def delete_value(obj: dict[str, Any], path: str) -> Any:
         return obj.pop(path, None)
 
     # If path exists as a direct key, delete it first
-    if path in obj:
+    if literal_keys and path in obj:
         return obj.pop(path)
 
     parts = path.split(".")
     cur: Any = obj
     for p in parts[:-1]:
-        if not isinstance(cur, dict) or p not in cur:
+        cur = _as_dict(cur)
+        if cur is None or p not in cur:
             return None
         cur = cur[p]
-    if not isinstance(cur, dict):
+    cur = _as_dict(cur)
+    if cur is None:
         return None
     return cur.pop(parts[-1], None)
+
+
+def _as_dict(value: Any) -> dict[str, Any] | None:
+    """Returns the dictionary behind a value (parsing a ``LazyJson``) or None."""
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, LazyJson):
+        return value.value
+    return None
+
+
+def normalize_keys(obj: dict[str, Any]) -> dict[str, Any]:
+    """
+    Convert a dictionary with mixed dotted and nested keys into canonical nested form.
+
+    Literal dotted keys (e.g. ``{"a.b": 1}``) are expanded into nested dictionaries and
+    merged with existing nested keys. Keys are applied in order, so a later key replaces
+    a non-dictionary value at the same path, like ``set_value`` does. The input is not
+    modified: dictionaries are rebuilt and lists are deep copied.
+
+    Args:
+        obj: The dictionary to normalize
+
+    Returns:
+        A new dictionary without dotted keys
+
+    Example:
+        normalize_keys({"a.b": 1, "a": {"c": 2}})  # {"a": {"b": 1, "c": 2}}
+    """
+    result: dict[str, Any] = {}
+    for key, value in obj.items():
+        if isinstance(value, dict):
+            value = normalize_keys(value)
+        elif isinstance(value, (list, LazyJson)):
+            value = copy.deepcopy(value)
+
+        cur = result
+        if "." in key:
+            *parents, key = key.split(".")
+            for part in parents:
+                child = cur.get(part)
+                if not isinstance(child, dict):
+                    child = cur[part] = {}
+                cur = child
+
+        existing = cur.get(key)
+        if isinstance(existing, dict) and isinstance(value, dict):
+            _merge_into(existing, value)
+        else:
+            cur[key] = value
+    return result
+
+
+def _merge_into(target: dict[str, Any], source: dict[str, Any]) -> None:
+    for key, value in source.items():
+        existing = target.get(key)
+        if isinstance(existing, dict) and isinstance(value, dict):
+            _merge_into(existing, value)
+        else:
+            target[key] = value
+
+
+def flatten_value(value: dict[str, Any], prefix: str = "") -> dict[str, Any]:
+    """
+    Flatten a nested dictionary into a single-level dictionary with dot-separated keys.
+
+    Empty dictionaries are dropped, matching ``flatten_dict.flatten(..., reducer="dot")``.
+    Lists and other values are kept as leaves.
+
+    Args:
+        value: The dictionary to flatten
+        prefix: Optional key prefix for every produced key
+
+    Returns:
+        A new flat dictionary
+
+    Example:
+        flatten_value({"a": {"b": 1}, "c": 2})  # {"a.b": 1, "c": 2}
+        flatten_value({"b": 1}, "a")  # {"a.b": 1}
+    """
+    flat: dict[str, Any] = {}
+    _flatten_into(flat, f"{prefix}." if prefix else "", value)
+    return flat
+
+
+def _flatten_into(flat: dict[str, Any], prefix: str, value: dict[str, Any]) -> None:
+    for key, item in value.items():
+        if isinstance(item, dict):
+            _flatten_into(flat, f"{prefix}{key}.", item)
+        else:
+            flat[f"{prefix}{key}"] = item
+
+
+def flatten_copy(value: dict[str, Any]) -> dict[str, Any]:
+    """
+    Flatten a nested dictionary like ``flatten_value``, copying its values.
+
+    Strings, numbers, booleans and None are shared, other leaves such as lists are
+    deep-copied, so the result is independent of ``value`` without a separate
+    ``copy.deepcopy`` of the nested form.
+
+    Args:
+        value: The dictionary to flatten
+
+    Returns:
+        A new flat dictionary
+    """
+    flat: dict[str, Any] = {}
+    _flatten_copy_into(flat, "", value)
+    return flat
+
+
+def _flatten_copy_into(flat: dict[str, Any], prefix: str, value: dict[str, Any]) -> None:
+    for key, item in value.items():
+        item_type = type(item)
+        if item_type in ATOMIC_TYPES:
+            flat[f"{prefix}{key}"] = item
+        elif isinstance(item, dict):
+            _flatten_copy_into(flat, f"{prefix}{key}.", item)
+        else:
+            flat[f"{prefix}{key}"] = copy.deepcopy(item)
+
+
+def _index_key(prefixes: dict[str, dict[str, None]], key: str) -> None:
+    index = key.find(".")
+    while index != -1:
+        prefix = key[:index]
+        keys = prefixes.get(prefix)
+        if keys is None:
+            keys = prefixes[prefix] = {}
+        keys[key] = None
+        index = key.find(".", index + 1)
+
+
+def _unindex_key(prefixes: dict[str, dict[str, None]], key: str) -> None:
+    index = key.find(".")
+    while index != -1:
+        prefix = key[:index]
+        keys = prefixes[prefix]
+        del keys[key]
+        if not keys:
+            del prefixes[prefix]
+        index = key.find(".", index + 1)
+
+
+class FlatDict(dict):
+    """
+    Flat (dot-keyed) dictionary with an index of the prefixes of its keys.
+
+    The index maps every ``prefix.`` to the keys under it, in the order of the
+    dictionary. It is built on the first call of ``has_subtree`` or ``subtree_keys``,
+    then kept up to date by every change of the dictionary. The flat helpers below
+    use it to find the keys of a subtree, or that there are none, without scanning
+    all keys on every call.
+
+    Example:
+        flat = FlatDict({"a.b": 1, "a.c": 2, "c": 3})
+        flat.has_subtree("a")  # True
+        flat.subtree_keys("a")  # ["a.b", "a.c"]
+        flat.has_subtree("c")  # False
+    """
+
+    # A class attribute, so the index is also unset while copy and pickle restore items
+    _prefixes: dict[str, dict[str, None]] | None = None
+
+    def _index(self) -> dict[str, dict[str, None]]:
+        if self._prefixes is None:
+            self._prefixes = {}
+            for key in self:
+                if "." in key:
+                    _index_key(self._prefixes, key)
+        return self._prefixes
+
+    def has_subtree(self, path: str) -> bool:
+        """Returns whether any key starts with ``path.``."""
+        return path in self._index()
+
+    def subtree_keys(self, path: str) -> list[str]:
+        """Returns the keys that start with ``path.``, in the order of the dictionary."""
+        keys = self._index().get(path)
+        return list(keys) if keys else []
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if self._prefixes is not None and key not in self:
+            _index_key(self._prefixes, key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        if self._prefixes is not None:
+            _unindex_key(self._prefixes, key)
+
+    def pop(self, key: str, *default: Any) -> Any:
+        if self._prefixes is not None and key in self:
+            _unindex_key(self._prefixes, key)
+        return super().pop(key, *default)
+
+    def popitem(self) -> tuple[str, Any]:
+        key, value = super().popitem()
+        if self._prefixes is not None:
+            _unindex_key(self._prefixes, key)
+        return key, value
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        if self._prefixes is None:
+            super().update(*args, **kwargs)
+            return
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other: Any) -> "FlatDict":
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        super().clear()
+        self._prefixes = None
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> "FlatDict":
+        return FlatDict(copy.deepcopy(dict(self), memo))
+
+    def __reduce__(self) -> tuple[type, tuple[dict[str, Any]]]:
+        return FlatDict, (dict(self),)
+
+
+def _subtree_keys(flat: dict[str, Any], path: str) -> list[str]:
+    if type(flat) is FlatDict:
+        keys = flat._index().get(path)
+        return list(keys) if keys else []
+    prefix = f"{path}."
+    return [key for key in flat if key.startswith(prefix)]
+
+
+def get_flat_value(flat: dict[str, Any], path: str) -> Any:
+    """
+    Get a value from a flat (dot-keyed) dictionary.
+
+    A leaf stored under ``path`` is returned as is. Otherwise all keys under the
+    ``path.`` prefix are collected into a flat dictionary relative to ``path``.
+
+    Args:
+        flat: The flat dictionary to search in
+        path: The dot-separated path to the value
+
+    Returns:
+        The leaf value, a flat dictionary of the subtree, or None if the path is not found
+
+    Example:
+        get_flat_value({"a.b": 1, "a.c": 2}, "a")  # {"b": 1, "c": 2}
+    """
+    if path in flat:
+        return flat[path]
+    size = len(path) + 1
+    subtree = {key[size:]: flat[key] for key in _subtree_keys(flat, path)}
+    return subtree or None
+
+
+def pop_flat_value(flat: dict[str, Any], path: str) -> Any:
+    """
+    Delete a leaf or a whole subtree from a flat (dot-keyed) dictionary.
+
+    Args:
+        flat: The flat dictionary to modify
+        path: The dot-separated path to delete
+
+    Returns:
+        The deleted leaf, a flat dictionary of the deleted subtree relative to ``path``,
+        or None if the path was not found
+    """
+    if path in flat:
+        return flat.pop(path)
+    keys = _subtree_keys(flat, path)
+    if not keys:
+        return None
+    size = len(path) + 1
+    return {key[size:]: flat.pop(key) for key in keys}
+
+
+def set_flat_value(flat: dict[str, Any], path: str, value: Any) -> None:
+    """
+    Set a value in a flat (dot-keyed) dictionary.
+
+    Mirrors ``set_value`` on the nested form: any previous value or subtree at ``path``
+    is replaced and leaf ancestors (e.g. ``"a"`` when setting ``"a.b"``) are removed.
+    Dictionary values are stored flattened under the ``path.`` prefix.
+
+    Args:
+        flat: The flat dictionary to modify
+        path: The dot-separated path to set
+        value: The value to set
+
+    Example:
+        set_flat_value({"a": "old"}, "a.b", {"c": 1})  # {"a.b.c": 1}
+    """
+    pop_flat_value(flat, path)
+    index = path.find(".")
+    while index != -1:
+        ancestor = path[:index]
+        if ancestor in flat:
+            del flat[ancestor]
+        index = path.find(".", index + 1)
+
+    if isinstance(value, dict):
+        _flatten_into(flat, f"{path}.", value)
+    else:
+        flat[path] = value
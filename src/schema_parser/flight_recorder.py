@@ -0,0 +1,151 @@
+"""
+Flight recorder of the slowest events of every pipeline.
+
+Tail latency usually comes from a few pathological inputs, such as huge Message blocks
+or regexes that backtrack. ``FlightRecorder`` keeps the N slowest events of every
+pipeline in tumbling time windows, with a truncated copy of the input, the time of
+every step and the step that dominated, so the events can be reproduced offline.
+Only events slower than the fastest kept one are serialized.
+
+Enable it with ``ParserManager.enable_flight_recorder``.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+from schema_parser.core.lazy_json import dumps
+from schema_parser.core.outcomes import FILTERED
+from schema_parser.instrumentation import PipelineRun
+
+
+def _truncate(event: Any, max_input_chars: int) -> str:
+    try:
+        text = dumps(event).decode()
+    except TypeError:
+        text = repr(event)
+    if len(text) > max_input_chars:
+        return f"{text[:max_input_chars]}... ({len(text)} chars)"
+    return text
+
+
+class FlightRecorder:
+    """
+    Keeps the slowest events of every pipeline per time window.
+
+    Args:
+        capacity: Number of events kept per pipeline and window
+        window_seconds: Length of a window. When a window ends, its events are kept as
+            the previous window and a new one starts.
+        max_input_chars: Number of characters of the serialized input that are kept
+
+    Example:
+        recorder = manager.enable_flight_recorder(capacity=10, window_seconds=300)
+        ...
+        recorder.export("slow_events.json")
+    """
+
+    def __init__(
+        self, capacity: int = 10, window_seconds: float = 60.0, max_input_chars: int = 4096
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.window_seconds = window_seconds
+        self.max_input_chars = max_input_chars
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._window_start = time.monotonic()
+        # Min-heaps of (elapsed_ns, sequence, entry) by pipeline name
+        self._current: dict[str, list[tuple[int, int, dict[str, Any]]]] = {}
+        self._previous: dict[str, list[dict[str, Any]]] = {}
+
+    def merge(self, run: PipelineRun, elapsed: int, result: Any, error: Exception | None) -> None:
+        """Records an event measured by a ``PipelineRun`` if it is among the slowest."""
+        with self._lock:
+            self._rotate()
+            heap = self._current.setdefault(run.name, [])
+            if len(heap) >= self.capacity and elapsed <= heap[0][0]:
+                return
+
+        # Serialized outside of the lock, only for events that are kept
+        entry = self._entry(run, elapsed, result, error)
+        with self._lock:
+            heap = self._current.setdefault(run.name, [])
+            item = (elapsed, next(self._sequence), entry)
+            if len(heap) < self.capacity:
+                heapq.heappush(heap, item)
+            elif elapsed > heap[0][0]:
+                heapq.heapreplace(heap, item)
+
+    def _entry(
+        self, run: PipelineRun, elapsed: int, result: Any, error: Exception | None
+    ) -> dict[str, Any]:
+        steps = [
+            {"step": f"{index}:{function}", "elapsed_ns": step_elapsed, "error": step_error}
+            for index, function, step_elapsed, _, _, step_error in run.records
+        ]
+        dominant = max(steps, key=lambda step: step["elapsed_ns"], default=None)
+        if error is not None:
+            outcome = f"error: {type(error).__name__}"
+        else:
+            outcome = "filtered" if result is FILTERED else "ok"
+        return {
+            "pipeline": run.name,
+            "timestamp": time.time(),
+            "elapsed_ns": elapsed,
+            "outcome": outcome,
+            "dominant_step": None if dominant is None else dominant["step"],
+            "steps": steps,
+            "input": _truncate(run.event, self.max_input_chars),
+        }
+
+    def _rotate(self) -> None:
+        now = time.monotonic()
+        if now - self._window_start < self.window_seconds:
+            return
+        # Windows without events in between leave the previous window empty
+        complete = now - self._window_start < 2 * self.window_seconds
+        self._previous = self._sorted(self._current) if complete else {}
+        self._current = {}
+        self._window_start = now
+
+    @staticmethod
+    def _sorted(
+        heaps: dict[str, list[tuple[int, int, dict[str, Any]]]],
+    ) -> dict[str, list[dict[str, Any]]]:
+        return {
+            name: [entry for _, _, entry in sorted(heap, key=lambda item: item[0], reverse=True)]
+            for name, heap in heaps.items()
+        }
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Returns the slowest events of the current and the previous window.
+
+        Returns:
+            Dictionary with ``current`` and ``previous`` mappings of pipeline names to
+            events, slowest first
+        """
+        with self._lock:
+            self._rotate()
+            return {
+                "window_seconds": self.window_seconds,
+                "current": self._sorted(self._current),
+                "previous": self._previous,
+            }
+
+    def export(self, path: str | Path) -> None:
+        """Writes the snapshot to a JSON file."""
+        Path(path).write_bytes(orjson.dumps(self.snapshot(), option=orjson.OPT_INDENT_2))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._current = {}
+            self._previous = {}
+            self._window_start = time.monotonic()
@@ -1,23 +1,43 @@
 from .drop import DropFunction
 from .extract import ExtractFunction
+from .filter import FilterFunction
+from .keep import KeepFunction
+from .map_fields import MapFieldsFunction
 from .parse_json import ParseJsonFunction
 from .parse_win_event_log import ParseWinEventLogFunction
 from .regex import RegexFunction
 from .rename import RenameFunction
+from .rename_map import RenameMapFunction
+from .require import RequireFunction
+from .sample import SampleFunction
 from .set import SetFunction
 
-CORE_FUNCTIONS = {
-    "parse_json": ParseJsonFunction(),
-    "regex": RegexFunction(),
-    "rename": RenameFunction(),
-    "drop": DropFunction(),
-    "set": SetFunction(),
-    "parse_win_event_log": ParseWinEventLogFunction(),
-    "extract": ExtractFunction(),
+FUNCTION_CLASSES = {
+    "parse_json": ParseJsonFunction,
+    "regex": RegexFunction,
+    "rename": RenameFunction,
+    "drop": DropFunction,
+    "set": SetFunction,
+    "parse_win_event_log": ParseWinEventLogFunction,
+    "extract": ExtractFunction,
+    "rename_map": RenameMapFunction,
+    "keep": KeepFunction,
+    "map_fields": MapFieldsFunction,
+    "filter": FilterFunction,
+    "require": RequireFunction,
+    "sample": SampleFunction,
+}
+
+CORE_FUNCTIONS = {name: function_class() for name, function_class in FUNCTION_CLASSES.items()}
+
+# Functions for data normalized with `normalize_keys`: they skip literal dotted key checks
+CANONICAL_FUNCTIONS = {
+    name: function_class(literal_keys=False) for name, function_class in FUNCTION_CLASSES.items()
 }
 
 __all__ = [
-    "FUNCTIONS",
+    "CORE_FUNCTIONS",
+    "CANONICAL_FUNCTIONS",
     "ParseJsonFunction",
     "RegexFunction",
     "RenameFunction",
@@ -25,4 +45,10 @@ __all__ = [
     "SetFunction",
     "ParseWinEventLogFunction",
     "ExtractFunction",
+    "RenameMapFunction",
+    "KeepFunction",
+    "MapFieldsFunction",
+    "FilterFunction",
+    "RequireFunction",
+    "SampleFunction",
 ]
@@ -1,9 +1,23 @@
 from abc import ABC, abstractmethod
 from typing import Any
 
+from flatten_dict import unflatten
+
+from schema_parser.core.utils import flatten_value
+
 
 class BaseFunction(ABC):
-    """Base class for all data processing functions"""
+    """Base class for all data processing functions
+
+    Args:
+        literal_keys: Whether path lookups should check literal dotted keys
+            (e.g. ``{"a.b": 1}``) before traversing nested dictionaries. Instances
+            created with ``literal_keys=False`` expect data normalized with
+            ``normalize_keys``.
+    """
+
+    def __init__(self, literal_keys: bool = True):
+        self.literal_keys = literal_keys
 
     @abstractmethod
     def execute(self, data: dict[str, Any], **kwargs: Any) -> dict[str, Any]:
@@ -18,3 +32,21 @@ class BaseFunction(ABC):
             Updated data dictionary
         """
         pass
+
+    def execute_flat(self, data: dict[str, Any], **kwargs: Any) -> dict[str, Any]:
+        """
+        Executes the function on flat (dot-keyed) input data
+
+        Functions that can work on the flat key space directly override this method.
+        The default implementation unflattens the data, runs ``execute`` and flattens
+        the result again.
+
+        Args:
+            data: Flat input data dictionary
+            **kwargs: Function arguments
+
+        Returns:
+            Updated flat data dictionary
+        """
+        result = self.execute(data=unflatten(data, splitter="dot"), **kwargs)
+        return flatten_value(result)
@@ -1,15 +1,60 @@
+from functools import lru_cache
 from typing import Any
 
-from schema_parser.core.utils import delete_value
+from schema_parser.core.path_trie import PathTrie, compile_paths, is_glob
+from schema_parser.core.utils import delete_value, pop_flat_value
 
 from .base import BaseFunction
 
 
+@lru_cache(maxsize=1024)
+def compile_fields(fields: str) -> tuple[list[str], PathTrie | None]:
+    """
+    Splits a comma-separated list of fields into exact paths and a glob matcher.
+
+    Returns:
+        The exact paths and a ``PathTrie`` of the paths with glob segments
+        (e.g. ``winlog.*.raw``, ``*_tmp``), or None if there are none
+    """
+    field_list = [field.strip() for field in fields.split(",") if field.strip()]
+    patterns = [field for field in field_list if any(map(is_glob, field.split(".")))]
+    exact = [field for field in field_list if field not in patterns]
+    return exact, PathTrie(patterns) if patterns else None
+
+
 class DropFunction(BaseFunction):
     """Function for dropping fields"""
 
     def execute(self, data: dict[str, Any], fields: str) -> dict[str, Any]:
-        field_list = [field.strip() for field in fields.split(",") if field.strip()]
-        for field in field_list:
-            delete_value(data, field)
+        """
+        Deletes the listed fields from the data.
+
+        Args:
+            data: Input data dictionary
+            fields: Comma-separated list of paths. Segments may be glob patterns,
+                e.g. ``"winlog.*.raw,*_tmp"``; matching fields are removed in a
+                single walk of the data.
+
+        Returns:
+            Updated data dictionary
+        """
+        if not self.literal_keys:
+            # Without literal dotted keys all paths are removed in a single walk
+            compile_paths(fields).remove(data)
+            return data
+
+        exact, matcher = compile_fields(fields)
+        for field in exact:
+            delete_value(data, field, literal_keys=self.literal_keys)
+        if matcher is not None:
+            matcher.remove(data)
+        return data
+
+    def execute_flat(self, data: dict[str, Any], fields: str) -> dict[str, Any]:
+        exact, matcher = compile_fields(fields)
+        for field in exact:
+            pop_flat_value(data, field)
+        if matcher is not None:
+            for key in [key for key in data if matcher.selects_flat(key)]:
+                del data[key]
         return data
@@ -1,6 +1,12 @@
 from typing import Any
 
-from schema_parser.core.utils import delete_value, get_value, is_empty_value
+from schema_parser.core.lazy_json import LazyJson
+from schema_parser.core.utils import (
+    delete_value,
+    get_value,
+    is_empty_value,
+    pop_flat_value,
+)
 
 from .base import BaseFunction
 
@@ -25,7 +31,7 @@ class ExtractFunction(BaseFunction):
             After extract(field="user"):
             Output: {'user_name': 'test', 'user_id': '1', 'some_field': 'some_value'}
         """
-        field_value = get_value(data, field)
+        field_value = get_value(data, field, literal_keys=self.literal_keys)
 
         if field_value is None:
             # Silently ignore if field is not found
@@ -36,14 +42,41 @@ class ExtractFunction(BaseFunction):
         if is_empty_value(field_value) and not isinstance(field_value, dict):
             return data
 
-        nested_dict = delete_value(data, field)
+        nested_dict = delete_value(data, field, literal_keys=self.literal_keys)
 
         if nested_dict is None:
             return data
 
+        if isinstance(nested_dict, LazyJson):
+            nested_dict = nested_dict.value
+
         if not isinstance(nested_dict, dict):
             raise ValueError(f"Field {field} does not contain a dictionary")
 
         # Merge the nested dictionary into the parent (even if it's empty)
         data.update(nested_dict)
         return data
+
+    def execute_flat(self, data: dict[str, Any], field: str) -> dict[str, Any]:
+        """
+        Extracts a flattened subtree and merges it with the top level of flat data.
+
+        Every top-level key of the extracted subtree replaces the whole subtree with
+        the same name in the data, the same way ``dict.update`` does on nested data.
+        """
+        if field in data:
+            # A leaf is either an empty value or not a dictionary
+            if is_empty_value(data[field]):
+                return data
+            raise ValueError(f"Field {field} does not contain a dictionary")
+
+        field_value = pop_flat_value(data, field)
+        if field_value is None:
+            return data
+
+        for name in {key.split(".", 1)[0] for key in field_value}:
+            # Both a leaf and a subtree with the name are replaced
+            data.pop(name, None)
+            pop_flat_value(data, name)
+        data.update(field_value)
+        return data
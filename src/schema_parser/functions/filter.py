@@ -0,0 +1,125 @@
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any
+
+from schema_parser.core.outcomes import FILTERED, Filtered
+from schema_parser.core.utils import get_flat_value, get_value
+
+from .base import BaseFunction
+
+
+def _text(value: Any) -> str | None:
+    # Numbers and booleans are compared by their string form, e.g. 4688 matches "4688"
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float, bool)):
+        return str(value)
+    return None
+
+
+def equals_condition(expected: Any) -> Callable[[Any], bool]:
+    """Returns a predicate that checks whether a field value equals ``expected``."""
+    expected_text = _text(expected)
+    if expected_text is None:
+        return lambda value: value == expected
+    return lambda value: value == expected or _text(value) == expected_text
+
+
+def compile_condition(
+    equals: Any = None, values: str | None = None, startswith: str | None = None
+) -> Callable[[Any], bool]:
+    """
+    Compiles the condition of a ``filter`` step into a predicate on the field value.
+
+    Conditions are cached, except for unhashable ``equals`` values such as lists.
+
+    Raises:
+        ValueError: If not exactly one of ``equals``, ``values`` and ``startswith``
+            is given
+    """
+    try:
+        return _compile_condition(equals, values, startswith)
+    except TypeError:
+        # Unhashable values cannot be cached
+        return _compile_condition.__wrapped__(equals, values, startswith)
+
+
+@lru_cache(maxsize=1024, typed=True)
+def _compile_condition(
+    equals: Any, values: str | None, startswith: str | None
+) -> Callable[[Any], bool]:
+    conditions = [condition for condition in (equals, values, startswith) if condition is not None]
+    if len(conditions) != 1:
+        raise ValueError("Exactly one of equals, in and startswith must be given")
+
+    if equals is not None:
+        return equals_condition(equals)
+    if values is not None:
+        allowed = frozenset(value.strip() for value in values.split(",") if value.strip())
+        return lambda value: _text(value) in allowed
+    prefix = str(startswith)
+    return lambda value: isinstance(value, str) and value.startswith(prefix)
+
+
+class FilterFunction(BaseFunction):
+    """Function for ending processing of events that do not match a condition"""
+
+    def execute(
+        self,
+        data: dict[str, Any],
+        field: str,
+        equals: Any = None,
+        values: str | None = None,
+        startswith: str | None = None,
+        exclude: bool = False,
+    ) -> dict[str, Any] | Filtered:
+        """
+        Keeps events whose field matches the condition and filters out the others.
+
+        Exactly one condition must be given. Filtered events are not an error: the
+        step returns ``FILTERED`` and the parser stops processing the event.
+
+        Args:
+            data: Input data dictionary
+            field: Field to check
+            equals: Value the field must equal
+            values: Comma-separated list of values the field must be one of
+                (``in`` in queries)
+            startswith: Prefix the field must start with
+            exclude: Whether to filter out the matching events instead
+
+        Returns:
+            The unchanged data dictionary, or ``FILTERED``
+
+        Example:
+            Input: {'level': 'debug', 'message': '...'}
+            After filter(field="level", in="debug,trace", exclude=true):
+            Output: FILTERED
+        """
+        value = get_value(data, field, literal_keys=self.literal_keys)
+        return self._decide(data, value, equals, values, startswith, exclude)
+
+    def execute_flat(
+        self,
+        data: dict[str, Any],
+        field: str,
+        equals: Any = None,
+        values: str | None = None,
+        startswith: str | None = None,
+        exclude: bool = False,
+    ) -> dict[str, Any] | Filtered:
+        value = get_flat_value(data, field)
+        return self._decide(data, value, equals, values, startswith, exclude)
+
+    @staticmethod
+    def _decide(
+        data: dict[str, Any],
+        value: Any,
+        equals: Any,
+        values: str | None,
+        startswith: str | None,
+        exclude: bool,
+    ) -> dict[str, Any] | Filtered:
+        if compile_condition(equals, values, startswith)(value) != exclude:
+            return data
+        return FILTERED
@@ -0,0 +1,56 @@
+from typing import Any
+
+from schema_parser.core.path_trie import compile_paths, is_glob
+from schema_parser.core.utils import FlatDict
+
+from .base import BaseFunction
+from .drop import compile_fields
+
+
+class KeepFunction(BaseFunction):
+    """Function for keeping only the selected fields"""
+
+    def execute(self, data: dict[str, Any], fields: str) -> dict[str, Any]:
+        """
+        Builds a new dictionary with only the selected fields of the data.
+
+        Kept subtrees are shared with the input, not copied, and the input is not
+        modified. Missing fields are ignored.
+
+        Args:
+            data: Input data dictionary
+            fields: Comma-separated list of paths to keep. Segments may be glob
+                patterns, e.g. ``"user.name,winlog.*.Image,*_id"``.
+
+        Returns:
+            New dictionary with the kept fields
+
+        Example:
+            Input: {'user': {'name': 'John', 'id': 1}, 'event': 'x', 'noise': 'y'}
+            After keep(fields="user.name,event"):
+            Output: {'user': {'name': 'John'}, 'event': 'x'}
+        """
+        result = compile_paths(fields).select(data)
+        if self.literal_keys:
+            # Literal dotted keys are kept the same way other functions look them up
+            for field in fields.split(","):
+                field = field.strip()
+                if "." in field and not is_glob(field) and field in data:
+                    result[field] = data[field]
+        return result
+
+    def execute_flat(self, data: dict[str, Any], fields: str) -> dict[str, Any]:
+        exact, matcher = compile_fields(fields)
+        if matcher is not None or not isinstance(data, FlatDict):
+            trie = compile_paths(fields)
+            return {key: value for key, value in data.items() if trie.selects_flat(key)}
+
+        # Without glob patterns the kept keys are looked up in the prefix index
+        result = {}
+        for field in exact:
+            if field in data:
+                result[field] = data[field]
+            else:
+                for key in data.subtree_keys(field):
+                    result[key] = data[key]
+        return result
@@ -0,0 +1,109 @@
+from collections.abc import Callable
+from functools import lru_cache, partial
+from typing import Any
+
+from schema_parser.core.mapping_table import MAPPING_REGISTRY, MappingTable
+from schema_parser.core.utils import get_flat_value, get_value
+
+from .base import BaseFunction
+from .rename_map import RenameMap
+
+
+def compile_field_maps(table: str) -> dict[str, RenameMap]:
+    """
+    Returns the ``RenameMap`` of every discriminator value of a mapping table.
+
+    ``table`` is a name registered in ``MAPPING_REGISTRY`` or the path of a CSV file
+    with ``key``, ``from_field`` and ``to_field`` columns. The source field of a table
+    with several source columns is the path joined from its non-empty columns, e.g.
+    ``Subject.Security ID`` for the ``windows_event_log`` table. Tables are loaded and
+    compiled once per process and shared by all pipelines.
+    """
+    return _compile(MAPPING_REGISTRY.get(table))
+
+
+def _source_field(source: tuple[str, ...]) -> str:
+    return ".".join(part for part in source if part)
+
+
+@lru_cache(maxsize=128)
+def _compile(mapping_table: MappingTable) -> dict[str, RenameMap]:
+    return {
+        key: RenameMap(tuple((_source_field(source), target) for source, target in entries.items()))
+        for key, entries in mapping_table.index.items()
+    }
+
+
+class MapFieldsFunction(BaseFunction):
+    """Function for renaming fields with a mapping table selected by a discriminator"""
+
+    def execute(
+        self,
+        data: dict[str, Any],
+        table: str,
+        key_field: str | None = None,
+        key: str | None = None,
+        drop_unmapped: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Renames fields with the mappings of the discriminator value of the event.
+
+        Args:
+            data: Input data dictionary
+            table: Name of a table registered in ``MAPPING_REGISTRY`` (e.g.
+                ``"windows_event_log"``) or path of a CSV mapping table with ``key``,
+                ``from_field`` and ``to_field`` columns
+            key_field: Field holding the discriminator value (e.g. ``"EventID"``)
+            key: Fixed discriminator value (e.g. a logsource), used instead of
+                ``key_field``
+            drop_unmapped: Whether to drop all fields that are not mapped
+
+        Returns:
+            Updated data dictionary. Events without a discriminator value or with a
+            value that is not in the table are returned unchanged.
+
+        Raises:
+            ValueError: If neither ``key_field`` nor ``key`` is given
+
+        Example:
+            Table rows: key=1,from_field=Image,to_field=process.executable
+            Input: {'EventID': 1, 'Image': 'a.exe'}
+            After map_fields(table="sysmon.csv", key_field="EventID"):
+            Output: {'EventID': 1, 'process': {'executable': 'a.exe'}}
+        """
+        getter = partial(get_value, literal_keys=self.literal_keys)
+        rename_map = compile_field_maps(table).get(self._get_key(getter, data, key_field, key))
+        if rename_map is None:
+            return data
+        return rename_map.apply(data, drop_unmapped, literal_keys=self.literal_keys)
+
+    def execute_flat(
+        self,
+        data: dict[str, Any],
+        table: str,
+        key_field: str | None = None,
+        key: str | None = None,
+        drop_unmapped: bool = False,
+    ) -> dict[str, Any]:
+        rename_map = compile_field_maps(table).get(
+            self._get_key(get_flat_value, data, key_field, key)
+        )
+        if rename_map is None:
+            return data
+        return rename_map.apply_flat(data, drop_unmapped)
+
+    @staticmethod
+    def _get_key(
+        getter: Callable[[dict[str, Any], str], Any],
+        data: dict[str, Any],
+        key_field: str | None,
+        key: str | None,
+    ) -> str | None:
+        if key is not None:
+            return key
+        if key_field is None:
+            raise ValueError("Either key_field or key must be given")
+        value = getter(data, key_field)
+        if value is None or isinstance(value, dict):
+            return None
+        return str(value)
@@ -1,12 +1,109 @@
+from collections.abc import Callable
+from functools import partial
 from typing import Any
 
 import orjson
 
 from schema_parser.core.exceptions import ParseJsonFunctionError
-from schema_parser.core.utils import get_value, is_empty_value, set_value
+from schema_parser.core.lazy_json import LazyJson, is_json_object
+from schema_parser.core.path_trie import PathTrie, compile_paths
+from schema_parser.core.utils import (
+    flatten_value,
+    get_flat_value,
+    get_value,
+    is_empty_value,
+    set_flat_value,
+    set_value,
+)
 
 from .base import BaseFunction
 
+DEFAULT_MAX_DEPTH = 10
+
+
+def _transform_parsed(
+    value: Any, paths: str | None, max_depth: int, decode_paths: str | None
+) -> Any:
+    # Project first, so subtrees that are discarded anyway are not decoded
+    if paths is not None and isinstance(value, dict):
+        value = compile_paths(paths).project(value)
+    if max_depth <= 0:
+        return value
+    if decode_paths is None:
+        return decode_embedded_json(value, max_depth)
+    return _decode_paths(value, compile_paths(decode_paths), max_depth)
+
+
+def _loads_container(value: str) -> Any:
+    """Decodes a string holding a JSON object or array, or returns None."""
+    if value.lstrip()[:1] not in ("{", "["):
+        return None
+    try:
+        decoded = orjson.loads(value)
+    except orjson.JSONDecodeError:
+        return None
+    return decoded if isinstance(decoded, (dict, list)) else None
+
+
+def decode_embedded_json(value: Any, max_depth: int) -> Any:
+    """
+    Decodes JSON objects and arrays embedded as strings anywhere in ``value``.
+
+    Dictionaries and lists are updated in place. Strings that are not valid JSON
+    objects or arrays are left as is.
+
+    Args:
+        value: Parsed JSON value
+        max_depth: Maximum number of nested decoding levels
+
+    Returns:
+        The value with embedded JSON decoded
+    """
+    if isinstance(value, dict):
+        for key, item in value.items():
+            decoded = decode_embedded_json(item, max_depth)
+            if decoded is not item:
+                value[key] = decoded
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            decoded = decode_embedded_json(item, max_depth)
+            if decoded is not item:
+                value[index] = decoded
+    elif max_depth > 0 and isinstance(value, str):
+        decoded = _loads_container(value)
+        if decoded is not None:
+            return decode_embedded_json(decoded, max_depth - 1)
+    return value
+
+
+def _decode_paths(value: Any, node: PathTrie, max_depth: int) -> Any:
+    if isinstance(value, list):
+        for index, item in enumerate(value):
+            decoded = _decode_paths(item, node, max_depth)
+            if decoded is not item:
+                value[index] = decoded
+        return value
+    if not isinstance(value, dict):
+        return value
+
+    for key, child in node.children.items():
+        item = value.get(key)
+        if item is None:
+            continue
+        if child.terminal:
+            decoded = decode_embedded_json(item, max_depth)
+        elif isinstance(item, str):
+            # The path continues inside an embedded JSON string
+            decoded = _loads_container(item) if max_depth > 0 else None
+            if decoded is None:
+                continue
+            decoded = _decode_paths(decoded, child, max_depth - 1)
+        else:
+            decoded = _decode_paths(item, child, max_depth)
+        if decoded is not item:
+            value[key] = decoded
+    return value
+
 
 class ParseJsonFunction(BaseFunction):
     """Function for parsing JSON from a field.
@@ -20,6 +117,22 @@ class ParseJsonFunction(BaseFunction):
         in_place: If True, replaces the field value with parsed JSON and returns
             the modified data dictionary. If False (default), returns only the
             parsed JSON value (must be a dict).
+        paths: Optional comma-separated list of paths (relative to the parsed value)
+            to keep. Other subtrees of a parsed object are discarded right after
+            decoding. Usually set by ``schema_parser.analysis.push_down_projection``.
+        lazy: If True and in_place=True, a JSON object is stored as a ``LazyJson``
+            proxy that is parsed on first access. Proxies that are never accessed
+            are serialized back to the original string by ``LazyJson`` aware dumps,
+            after one validating parse. Invalid JSON is only reported on first
+            access. With ``paths`` or ``recursive`` an untouched proxy is serialized
+            as the original, untransformed string, while a proxy that was accessed is
+            serialized as the transformed value. Ignored in flat mode.
+        recursive: If True, JSON objects and arrays embedded as strings in the parsed
+            value are decoded as well, in the same step.
+        max_depth: Maximum number of nested decoding levels when recursive=True.
+        decode_paths: Optional comma-separated list of paths (relative to the parsed
+            value) to decode when recursive=True. Embedded JSON outside of these
+            subtrees is left as is. Paths may cross embedded JSON strings.
 
     Returns:
         If in_place=True: Modified data dictionary with parsed JSON in the field.
@@ -30,17 +143,76 @@ class ParseJsonFunction(BaseFunction):
             parsed value is not a dict when in_place=False.
     """
 
-    def execute(self, data: dict[str, Any], field: str, in_place: bool = False) -> dict[str, Any]:
-        field_value = get_value(data, field)
+    def execute(
+        self,
+        data: dict[str, Any],
+        field: str,
+        in_place: bool = False,
+        paths: str | None = None,
+        lazy: bool = False,
+        recursive: bool = False,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        decode_paths: str | None = None,
+    ) -> dict[str, Any]:
+        field_value = get_value(data, field, literal_keys=self.literal_keys)
 
-        if field_value is None:
-            # Silently ignore if field is not found
+        # Silently ignore if field is not found.
+        # Treat null, empty string, empty array, and empty dict as empty (ignore them)
+        if is_empty_value(field_value):
             return data
 
-        # Treat null, empty string, empty array, and empty dict as empty (ignore them)
+        transform = self._get_transform(paths, recursive, max_depth, decode_paths)
+        if lazy and in_place and isinstance(field_value, str) and is_json_object(field_value):
+            lazy_value = LazyJson(field_value, field=field, transform=transform)
+            set_value(data, field, lazy_value, literal_keys=self.literal_keys)
+            return data
+
+        parsed_value = self._load(field, field_value, transform)
+        if in_place:
+            set_value(data, field, parsed_value, literal_keys=self.literal_keys)
+            return data
+        return self._ensure_dict(field, field_value, parsed_value)
+
+    def execute_flat(
+        self,
+        data: dict[str, Any],
+        field: str,
+        in_place: bool = False,
+        paths: str | None = None,
+        lazy: bool = False,
+        recursive: bool = False,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        decode_paths: str | None = None,
+    ) -> dict[str, Any]:
+        # Parsed objects are flattened right away, so lazy parsing does not apply
+        field_value = get_flat_value(data, field)
+
         if is_empty_value(field_value):
             return data
 
+        transform = self._get_transform(paths, recursive, max_depth, decode_paths)
+        parsed_value = self._load(field, field_value, transform)
+        if in_place:
+            set_flat_value(data, field, parsed_value)
+            return data
+        return flatten_value(self._ensure_dict(field, field_value, parsed_value))
+
+    @staticmethod
+    def _get_transform(
+        paths: str | None, recursive: bool, max_depth: int, decode_paths: str | None
+    ) -> Callable[[Any], Any] | None:
+        """Returns the post-processing applied to a parsed value, if any."""
+        if paths is None and not recursive:
+            return None
+        return partial(
+            _transform_parsed,
+            paths=paths,
+            max_depth=max_depth if recursive else 0,
+            decode_paths=decode_paths,
+        )
+
+    @staticmethod
+    def _load(field: str, field_value: Any, transform: Callable[[Any], Any] | None = None) -> Any:
         # Field value must be a string to parse as JSON
         if not isinstance(field_value, str):
             raise ParseJsonFunctionError(
@@ -51,22 +223,29 @@ class ParseJsonFunction(BaseFunction):
 
         try:
             parsed_value = orjson.loads(field_value)
-
-            if in_place:
-                set_value(data, field, parsed_value)
-                return data
-            else:
-                if isinstance(parsed_value, dict):
-                    return parsed_value
-                type_name = type(parsed_value).__name__
-                raise ValueError(
-                    f"Field `{field}` contains unsupported data type: {type_name}. "
-                    f"Expected dict when in_place=False. "
-                    f"Use in_place=True to parse any JSON type."
-                )
-        except (orjson.JSONDecodeError, ValueError) as e:
+        except orjson.JSONDecodeError as e:
             raise ParseJsonFunctionError(
                 message=f"Failed to load JSON from field `{field}` - {e}",
                 field=field,
-                field_value=get_value(data, field),
+                field_value=field_value,
             )
+
+        if transform is not None:
+            return transform(parsed_value)
+        return parsed_value
+
+    @staticmethod
+    def _ensure_dict(field: str, field_value: str, parsed_value: Any) -> dict[str, Any]:
+        if isinstance(parsed_value, dict):
+            return parsed_value
+        type_name = type(parsed_value).__name__
+        raise ParseJsonFunctionError(
+            message=(
+                f"Failed to load JSON from field `{field}` - "
+                f"Field `{field}` contains unsupported data type: {type_name}. "
+                f"Expected dict when in_place=False. "
+                f"Use in_place=True to parse any JSON type."
+            ),
+            field=field,
+            field_value=field_value,
+        )
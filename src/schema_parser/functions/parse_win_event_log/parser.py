@@ -1,9 +1,11 @@
-import csv
 import re
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+from schema_parser.core.mapping_table import MAPPING_REGISTRY
+
 from ..base import BaseFunction
 
 
@@ -17,30 +19,40 @@ class ParserState:
     last_key: str | None = None
 
 
+FIELD_MAPPING_PATH = Path(__file__).parent / "field_mapping.csv"
+FIELDS_MAPPING_TABLE = MAPPING_REGISTRY.register(
+    "windows_event_log",
+    str(FIELD_MAPPING_PATH),
+    key_column="event_id",
+    source_columns=("viewer_field_group", "viewer_field_name"),
+    target_column="sigma_field",
+)
+
+
+@lru_cache(maxsize=1)
 def load_field_mapping() -> dict:
-    """Loads the field mapping from the CSV file."""
-
-    # TODO: Move this logic to logsource mapping?
-    mapping = {}
-    csv_path = Path(__file__).parent / "field_mapping.csv"
-
-    with open(csv_path, encoding="utf-8") as infile:
-        reader = csv.DictReader(infile)
-        for row in reader:
-            event_id = row["event_id"]
-            sigma_field = row["sigma_field"]
-            viewer_field_group = row["viewer_field_group"].strip()
-            viewer_field_name = row["viewer_field_name"].strip()
-
-            if event_id not in mapping:
-                mapping[event_id] = {}
-            if viewer_field_group not in mapping[event_id]:
-                mapping[event_id][viewer_field_group] = {}
-            mapping[event_id][viewer_field_group][viewer_field_name] = sigma_field
+    """
+    Returns the field mapping as nested dictionaries.
+
+    The result maps an event ID to a section to a field name to the Sigma field. It is
+    built from ``FIELDS_MAPPING_TABLE``, which the parser itself uses, on first use
+    and cached, so processes that only parse events do not hold the mapping twice.
+    ``FIELDS_MAPPING_BY_EVENT_ID`` returns the same dictionary.
+    """
+    mapping: dict[str, dict[str, dict[str, str]]] = {}
+    for event_id, entries in FIELDS_MAPPING_TABLE.index.items():
+        event_mapping = mapping[event_id] = {}
+        for (viewer_field_group, viewer_field_name), sigma_field in entries.items():
+            event_mapping.setdefault(viewer_field_group, {})[viewer_field_name] = sigma_field
     return mapping
 
 
-FIELDS_MAPPING_BY_EVENT_ID = load_field_mapping()
+def __getattr__(name: str) -> Any:
+    if name == "FIELDS_MAPPING_BY_EVENT_ID":
+        return load_field_mapping()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 EVENT_ID_PATTERN = re.compile(r"EventCode\s*=\s*(\d+)")
 KV_PATTERN = re.compile(r"^\s*([^:=\n]+?)\s*[:=]\s*(.*)$")
 SECTION_PATTERN = re.compile(r"^([a-zA-Z \(\)]+?):$")
@@ -143,11 +155,8 @@ class ParseWinEventLogFunction(BaseFunction):
         if not line.startswith(" ") and not line.startswith("\t"):
             state.current_section = None
 
-        new_key = (
-            FIELDS_MAPPING_BY_EVENT_ID.get(state.event_id, {})
-            .get(state.current_section or "", {})
-            .get(key)
-        )
+        section = state.current_section or ""
+        new_key = FIELDS_MAPPING_TABLE.lookup(state.event_id, section, key)
 
         # If key not in section - leave it even if it is not in the mapping
         if state.current_section:
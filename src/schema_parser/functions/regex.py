@@ -1,4 +1,6 @@
 import re
+from collections.abc import Callable
+from functools import partial
 from typing import Any
 
 from schema_parser.core.exceptions import (
@@ -6,7 +8,7 @@ from schema_parser.core.exceptions import (
     RegexFunctionUnexpectedError,
     RegexPatternMatchError,
 )
-from schema_parser.core.utils import get_value
+from schema_parser.core.utils import get_flat_value, get_value
 
 from .base import BaseFunction
 
@@ -15,8 +17,22 @@ class RegexFunction(BaseFunction):
     """Function for parsing a field using regular expression"""
 
     def execute(self, data: dict[str, Any], pattern: str, field: str) -> dict[str, Any]:
+        getter = partial(get_value, literal_keys=self.literal_keys)
+        return self._match(getter, data, pattern, field)
+
+    def execute_flat(self, data: dict[str, Any], pattern: str, field: str) -> dict[str, Any]:
+        # Group names are identifiers, so the match result is already flat
+        return self._match(get_flat_value, data, pattern, field)
+
+    @staticmethod
+    def _match(
+        getter: Callable[[dict[str, Any], str], Any],
+        data: dict[str, Any],
+        pattern: str,
+        field: str,
+    ) -> dict[str, Any]:
         try:
-            field_value = get_value(data, field)
+            field_value = getter(data, field)
 
             if field_value is None:
                 raise RegexPatternMatchError(
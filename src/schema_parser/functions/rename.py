@@ -1,6 +1,12 @@
 from typing import Any
 
-from schema_parser.core.utils import delete_value, get_value, set_value
+from schema_parser.core.utils import (
+    delete_value,
+    get_value,
+    pop_flat_value,
+    set_flat_value,
+    set_value,
+)
 
 from .base import BaseFunction
 
@@ -9,14 +15,23 @@ class RenameFunction(BaseFunction):
     """Function for renaming a field"""
 
     def execute(self, data: dict[str, Any], from_field: str, to_field: str) -> dict[str, Any]:
-        field_data = get_value(data, from_field)
+        field_data = get_value(data, from_field, literal_keys=self.literal_keys)
 
         if field_data is None:
             raise ValueError(f"Field {from_field} not found in data")
 
-        deleted_value = delete_value(data, from_field)
+        deleted_value = delete_value(data, from_field, literal_keys=self.literal_keys)
         if deleted_value is None:
             raise ValueError(f"Field {from_field} not found in data")
 
-        set_value(data, to_field, deleted_value)
+        set_value(data, to_field, deleted_value, literal_keys=self.literal_keys)
+        return data
+
+    def execute_flat(self, data: dict[str, Any], from_field: str, to_field: str) -> dict[str, Any]:
+        field_data = pop_flat_value(data, from_field)
+
+        if field_data is None:
+            raise ValueError(f"Field {from_field} not found in data")
+
+        set_flat_value(data, to_field, field_data)
         return data
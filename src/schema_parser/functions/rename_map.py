@@ -0,0 +1,275 @@
+import csv
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+from schema_parser.core.lazy_json import LazyJson
+from schema_parser.core.utils import set_flat_value, set_value
+
+from .base import BaseFunction
+
+
+class RenameNode:
+    """Node of a ``RenameMap`` trie. ``source`` is set on nodes that are renamed."""
+
+    __slots__ = ("children", "source")
+
+    def __init__(self):
+        self.children: dict[str, RenameNode] = {}
+        self.source: str | None = None
+
+
+class RenameMap:
+    """
+    Prefix trie of the source fields of a rename mapping.
+
+    Every source field is a path in the trie, so all sources can be found in a single
+    walk of the event. Source fields may not overlap (e.g. ``a`` and ``a.b``), since
+    the subtree of a source field is moved as a whole.
+
+    Args:
+        items: Pairs of source and target fields
+
+    Raises:
+        ValueError: If source fields are empty or overlap
+    """
+
+    __slots__ = ("root", "targets", "dotted_sources")
+
+    def __init__(self, items: tuple[tuple[str, str], ...]):
+        self.root = RenameNode()
+        self.targets: dict[str, str] = {}
+        self.dotted_sources: list[str] = []
+        for source, target in items:
+            self._insert(source, target)
+
+    def _insert(self, source: str, target: str) -> None:
+        if not source or not target:
+            raise ValueError(f"Invalid rename mapping entry: {source!r} -> {target!r}")
+        if source in self.targets:
+            raise ValueError(f"Field {source} is mapped more than once")
+
+        node = self.root
+        for part in source.split("."):
+            # Segments of mapped fields repeat across many mappings
+            part = sys.intern(part)
+            if node.source is not None:
+                raise ValueError(f"Fields {node.source} and {source} overlap")
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = RenameNode()
+            node = child
+        if node.children:
+            raise ValueError(f"Field {source} overlaps other mapped fields")
+
+        node.source = source
+        self.targets[source] = target
+        if "." in source:
+            self.dotted_sources.append(source)
+
+    def apply(
+        self, data: dict[str, Any], drop_unmapped: bool = False, literal_keys: bool = True
+    ) -> dict[str, Any]:
+        """
+        Moves every mapped field of ``data`` to its target field.
+
+        All source fields are read before any target is written. Missing source
+        fields are skipped.
+
+        Args:
+            data: Data dictionary, modified in place unless ``drop_unmapped`` is set
+            drop_unmapped: Whether to return a new dictionary with only the mapped fields
+            literal_keys: Whether literal dotted keys are renamed like in ``rename``
+
+        Returns:
+            Updated data dictionary
+        """
+        found: dict[str, Any] = {}
+        if literal_keys:
+            # A literal dotted key is renamed instead of the nested path, as in rename
+            for source in self.dotted_sources:
+                if source in data:
+                    found[source] = data.pop(source)
+        self.collect(data, found)
+
+        result = {} if drop_unmapped else data
+        for source, target in self.targets.items():
+            if source in found:
+                set_value(result, target, found[source], literal_keys=literal_keys)
+        return result
+
+    def apply_flat(self, data: dict[str, Any], drop_unmapped: bool = False) -> dict[str, Any]:
+        """Same as ``apply`` for flat (dot-keyed) data."""
+        found: dict[str, Any] = {}
+        for key in list(data):
+            match = self.match_flat(key)
+            if match is None:
+                continue
+            source, rest = match
+            if not rest:
+                found[source] = data.pop(key)
+                continue
+            subtree = found.get(source)
+            if not isinstance(subtree, dict):
+                subtree = found[source] = {}
+            subtree[rest] = data.pop(key)
+
+        result = {} if drop_unmapped else data
+        for source, target in self.targets.items():
+            if source in found:
+                set_flat_value(result, target, found[source])
+        return result
+
+    def collect(self, obj: dict[str, Any], found: dict[str, Any]) -> None:
+        """Removes every source field from ``obj`` and stores its value in ``found``."""
+        self._collect(self.root, obj, found)
+
+    @classmethod
+    def _collect(cls, node: RenameNode, obj: dict[str, Any], found: dict[str, Any]) -> None:
+        for key, child in node.children.items():
+            if key not in obj:
+                continue
+            if child.source is not None:
+                if child.source not in found:
+                    found[child.source] = obj.pop(key)
+                continue
+            value = obj[key]
+            if isinstance(value, LazyJson):
+                value = value.value
+            if isinstance(value, dict):
+                cls._collect(child, value, found)
+
+    def match_flat(self, key: str) -> tuple[str, str] | None:
+        """
+        Finds the source field a flat key lies under.
+
+        Returns:
+            The source field and the rest of the key relative to it (empty for the
+            source field itself), or None if the key is not renamed
+        """
+        node = self.root
+        position = 0
+        while True:
+            end = key.find(".", position)
+            part = key[position:] if end == -1 else key[position:end]
+            node = node.children.get(part)
+            if node is None:
+                return None
+            if node.source is not None:
+                return node.source, "" if end == -1 else key[end + 1 :]
+            if end == -1:
+                return None
+            position = end + 1
+
+
+def parse_mapping(mapping: str) -> tuple[tuple[str, str], ...]:
+    """Parses an inline mapping such as ``"a.b:x, c:y.z"``."""
+    items = []
+    for entry in mapping.split(","):
+        if not entry.strip():
+            continue
+        source, separator, target = entry.partition(":")
+        if not separator:
+            raise ValueError(f"Invalid rename mapping entry: {entry.strip()!r}")
+        items.append((source.strip(), target.strip()))
+    return tuple(items)
+
+
+def load_mapping_file(path: str) -> tuple[tuple[str, str], ...]:
+    """
+    Loads a rename mapping from a file.
+
+    CSV files have ``from_field`` and ``to_field`` columns. JSON files contain an
+    object mapping source fields to target fields. The mapping is cached by path and
+    modification time, so a changed file is loaded again.
+    """
+    return _load_mapping_file(path, os.stat(path).st_mtime_ns)
+
+
+@lru_cache(maxsize=128)
+def _load_mapping_file(path: str, mtime_ns: int) -> tuple[tuple[str, str], ...]:
+    file_path = Path(path)
+    if file_path.suffix.lower() == ".json":
+        mapping = orjson.loads(file_path.read_bytes())
+        if not isinstance(mapping, dict):
+            raise ValueError(f"Rename mapping file {path} must contain a JSON object")
+        return tuple((str(source), str(target)) for source, target in mapping.items())
+
+    with open(file_path, encoding="utf-8", newline="") as infile:
+        return tuple(
+            (row["from_field"].strip(), row["to_field"].strip()) for row in csv.DictReader(infile)
+        )
+
+
+@lru_cache(maxsize=1024)
+def compile_rename_map(items: tuple[tuple[str, str], ...]) -> RenameMap:
+    """Compiles pairs of source and target fields into a cached ``RenameMap``."""
+    return RenameMap(items)
+
+
+@lru_cache(maxsize=1024)
+def compile_inline_mapping(mapping: str) -> RenameMap:
+    """Parses and compiles an inline mapping into a cached ``RenameMap``."""
+    return compile_rename_map(parse_mapping(mapping))
+
+
+@lru_cache(maxsize=128)
+def _compile_mapping_file(path: str, mtime_ns: int) -> RenameMap:
+    return compile_rename_map(_load_mapping_file(path, mtime_ns))
+
+
+class RenameMapFunction(BaseFunction):
+    """Function for renaming many fields in a single walk of the event"""
+
+    def execute(
+        self,
+        data: dict[str, Any],
+        mapping: dict[str, str] | str | None = None,
+        path: str | None = None,
+        drop_unmapped: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Moves every mapped field to its target field.
+
+        All source fields are read from the input before any target is written, so
+        mappings like ``a:b, b:a`` swap the fields. Missing source fields are skipped.
+
+        Args:
+            data: Input data dictionary
+            mapping: Dictionary or inline string (``"a.b:x, c:y"``) mapping source
+                fields to target fields
+            path: Path of a CSV or JSON mapping file, used if ``mapping`` is not given
+            drop_unmapped: Whether to drop all fields that are not mapped
+
+        Returns:
+            Updated data dictionary
+
+        Raises:
+            ValueError: If no mapping is given or source fields overlap
+        """
+        rename_map = self._get_rename_map(mapping, path)
+        return rename_map.apply(data, drop_unmapped, literal_keys=self.literal_keys)
+
+    def execute_flat(
+        self,
+        data: dict[str, Any],
+        mapping: dict[str, str] | str | None = None,
+        path: str | None = None,
+        drop_unmapped: bool = False,
+    ) -> dict[str, Any]:
+        rename_map = self._get_rename_map(mapping, path)
+        return rename_map.apply_flat(data, drop_unmapped)
+
+    @staticmethod
+    def _get_rename_map(mapping: dict[str, str] | str | None, path: str | None) -> RenameMap:
+        if isinstance(mapping, dict):
+            return compile_rename_map(tuple(mapping.items()))
+        if isinstance(mapping, str):
+            return compile_inline_mapping(mapping)
+        if path is not None:
+            return _compile_mapping_file(path, os.stat(path).st_mtime_ns)
+        raise ValueError("Either mapping or path must be given")
@@ -0,0 +1,44 @@
+from typing import Any
+
+from schema_parser.core.outcomes import FILTERED, Filtered
+from schema_parser.core.utils import get_flat_value, get_value
+
+from .base import BaseFunction
+
+
+def _split_fields(fields: str) -> list[str]:
+    return [field.strip() for field in fields.split(",") if field.strip()]
+
+
+class RequireFunction(BaseFunction):
+    """Function for ending processing of events that miss required fields"""
+
+    def execute(self, data: dict[str, Any], fields: str) -> dict[str, Any] | Filtered:
+        """
+        Filters out events in which any of the fields is missing or None.
+
+        Filtered events are not an error: the step returns ``FILTERED`` and the
+        parser stops processing the event.
+
+        Args:
+            data: Input data dictionary
+            fields: Comma-separated list of required fields
+
+        Returns:
+            The unchanged data dictionary, or ``FILTERED``
+
+        Example:
+            Input: {'user': {'name': 'John'}}
+            After require(fields="user.name,host.name"):
+            Output: FILTERED
+        """
+        for field in _split_fields(fields):
+            if get_value(data, field, literal_keys=self.literal_keys) is None:
+                return FILTERED
+        return data
+
+    def execute_flat(self, data: dict[str, Any], fields: str) -> dict[str, Any] | Filtered:
+        for field in _split_fields(fields):
+            if get_flat_value(data, field) is None:
+                return FILTERED
+        return data
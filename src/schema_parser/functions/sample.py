@@ -0,0 +1,125 @@
+import threading
+import zlib
+from functools import lru_cache
+from typing import Any
+
+from schema_parser.core.outcomes import FILTERED, Filtered
+from schema_parser.core.utils import get_flat_value, get_value
+
+from .base import BaseFunction
+
+HASH_RANGE = 1 << 32
+
+
+class SampleCounters:
+    """
+    Thread-safe counters of kept and shed events per ``sample`` step.
+
+    Steps are identified by their key field and rate, e.g. ``"host.name:0.1"``. Every
+    thread counts into its own dictionary, so recording a decision takes no lock; the
+    lock is only taken when a thread records its first decision and by ``snapshot``
+    and ``reset``, which sum and clear the dictionaries of all threads.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._thread_counts: list[dict[tuple[str, float], list[int]]] = []
+        self._lock = threading.Lock()
+
+    def _counts(self) -> dict[tuple[str, float], list[int]]:
+        counts = getattr(self._local, "counts", None)
+        if counts is None:
+            counts = self._local.counts = {}
+            with self._lock:
+                self._thread_counts.append(counts)
+        return counts
+
+    def record(self, key: str, rate: float, kept: bool) -> None:
+        counts = self._counts()
+        step_counts = counts.get((key, rate))
+        if step_counts is None:
+            step_counts = counts[(key, rate)] = [0, 0]
+        step_counts[0 if kept else 1] += 1
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        """Returns the kept and shed counts of every step, summed over all threads."""
+        totals: dict[tuple[str, float], list[int]] = {}
+        with self._lock:
+            thread_counts = list(self._thread_counts)
+        for counts in thread_counts:
+            # Copied first, since the thread may add a step while it is read
+            for step, (kept, shed) in counts.copy().items():
+                total = totals.setdefault(step, [0, 0])
+                total[0] += kept
+                total[1] += shed
+        return {
+            f"{key}:{rate}": {"kept": kept, "shed": shed}
+            for (key, rate), (kept, shed) in totals.items()
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            for counts in self._thread_counts:
+                counts.clear()
+
+
+SAMPLE_COUNTERS = SampleCounters()
+
+
+@lru_cache(maxsize=256)
+def _threshold(rate: float) -> int:
+    if not 0 <= rate <= 1:
+        raise ValueError(f"Sample rate must be between 0 and 1, got {rate}")
+    return int(rate * HASH_RANGE)
+
+
+def keeps(value: Any, rate: float) -> bool:
+    """
+    Returns True if an event with the key value is kept at the rate.
+
+    The decision is the CRC-32 of the value compared with ``rate * 2**32``, so it is
+    the same for a value in every process and every run, and a higher rate keeps a
+    superset of the values a lower rate keeps.
+    """
+    text = value if isinstance(value, str) else str(value)
+    return zlib.crc32(text.encode()) < _threshold(rate)
+
+
+class SampleFunction(BaseFunction):
+    """Function for keeping a deterministic fraction of events"""
+
+    def execute(self, data: dict[str, Any], rate: float, key: str) -> dict[str, Any] | Filtered:
+        """
+        Keeps the events whose key value hashes into the sampled fraction.
+
+        All events with the same key value get the same decision, so e.g. sampling by
+        ``host.name`` keeps every event of 10% of the hosts. Events without the key
+        field are kept. Shed events end processing like ``filter``. Decisions are
+        counted in ``SAMPLE_COUNTERS``.
+
+        Args:
+            data: Input data dictionary
+            rate: Fraction of key values to keep, between 0 and 1
+            key: Field whose value is hashed
+
+        Returns:
+            The unchanged data dictionary, or ``FILTERED``
+
+        Raises:
+            ValueError: If the rate is not between 0 and 1
+        """
+        value = get_value(data, key, literal_keys=self.literal_keys)
+        return self._decide(data, value, rate, key)
+
+    def execute_flat(
+        self, data: dict[str, Any], rate: float, key: str
+    ) -> dict[str, Any] | Filtered:
+        return self._decide(data, get_flat_value(data, key), rate, key)
+
+    @staticmethod
+    def _decide(
+        data: dict[str, Any], value: Any, rate: float, key: str
+    ) -> dict[str, Any] | Filtered:
+        kept = value is None or keeps(value, rate)
+        SAMPLE_COUNTERS.record(key, rate, kept)
+        return data if kept else FILTERED
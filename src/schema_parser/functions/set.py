@@ -1,11 +1,15 @@
 from typing import Any
 
-from schema_parser.core.utils import set_value
+from schema_parser.core.utils import set_flat_value, set_value
 
 from .base import BaseFunction
 
 
 class SetFunction(BaseFunction):
     def execute(self, data: dict[str, Any], field: str, value: Any) -> dict[str, Any]:
-        set_value(data, field, value)
+        set_value(data, field, value, literal_keys=self.literal_keys)
+        return data
+
+    def execute_flat(self, data: dict[str, Any], field: str, value: Any) -> dict[str, Any]:
+        set_flat_value(data, field, value)
         return data
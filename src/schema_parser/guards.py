@@ -0,0 +1,98 @@
+"""
+Guards for conditional step execution.
+
+A guard is a cheap check on a single field that is evaluated before a step runs; the
+step is skipped if the guard does not match. In queries a guard follows the step
+after ``if`` or ``when``::
+
+    regex(field="message", pattern="...") if startswith(field="message", value="<")
+    parse_json(field="payload") when exists(field="payload")
+
+In configurations a guard is a dictionary such as
+``{"type": "startswith", "field": "message", "value": "<"}``.
+
+Supported guards:
+    exists(field): the field is present and not None
+    startswith(field, value): the field is a string starting with ``value``
+    equals(field, value): the field equals ``value``; numbers and booleans are also
+        compared by their string form, so ``value="4688"`` matches ``4688`` and
+        ``value=4688`` matches ``"4688"``, like in ``filter``
+"""
+
+from collections.abc import Callable
+from functools import lru_cache, partial
+from typing import Any
+
+from schema_parser.core.utils import get_flat_value, get_value
+from schema_parser.functions.filter import equals_condition
+
+GUARD_TYPES = ("exists", "startswith", "equals")
+
+
+def _startswith(prefix: str) -> Callable[[Any], bool]:
+    return lambda value: isinstance(value, str) and value.startswith(prefix)
+
+
+class Guard:
+    """
+    Precompiled guard.
+
+    Args:
+        type: One of ``GUARD_TYPES``
+        field: Field the guard checks
+        value: Value compared with the field, not used by ``exists``
+
+    Raises:
+        ValueError: If the guard type is not supported or ``value`` is missing
+    """
+
+    __slots__ = ("type", "field", "value", "_check")
+
+    def __init__(self, type: str, field: str, value: Any = None):
+        if type not in GUARD_TYPES:
+            raise ValueError(f"Unsupported guard type {type}, expected one of {GUARD_TYPES}")
+        if type != "exists" and value is None:
+            raise ValueError(f"Guard {type} requires a value")
+        self.type = type
+        self.field = field
+        self.value = value
+        if type == "exists":
+            self._check: Callable[[Any], bool] = lambda value: value is not None
+        elif type == "startswith":
+            self._check = _startswith(str(value))
+        else:
+            self._check = equals_condition(value)
+
+    def matches(self, data: dict[str, Any], getter: Callable[[dict[str, Any], str], Any]) -> bool:
+        """Returns True if the step guarded by this guard should run on ``data``."""
+        return self._check(getter(data, self.field))
+
+    def to_dict(self) -> dict[str, Any]:
+        guard = {"type": self.type, "field": self.field}
+        if self.value is not None:
+            guard["value"] = self.value
+        return guard
+
+
+def compile_guard(guard: dict[str, Any]) -> Guard:
+    """
+    Compiles a guard dictionary, returning a cached ``Guard`` for repeated guards.
+
+    Guards with unhashable values such as lists are compiled without the cache.
+    """
+    try:
+        return _compile(guard["type"], guard["field"], guard.get("value"))
+    except TypeError:
+        return Guard(guard["type"], guard["field"], guard.get("value"))
+
+
+@lru_cache(maxsize=1024, typed=True)
+def _compile(type: str, field: str, value: Any) -> Guard:
+    return Guard(type, field, value)
+
+
+def field_getter(flat_native: bool, literal_keys: bool) -> Callable[[dict[str, Any], str], Any]:
+    """Returns the function guards read fields with for the given execution options."""
+    if flat_native:
+        return get_flat_value
+    return partial(get_value, literal_keys=literal_keys)
@@ -0,0 +1,82 @@
+"""
+Hooks called around the steps of ``ParserManager.configured_parser``.
+
+Hooks integrate tracers and profilers without changing the parser. Every hook gets
+the function name and the arguments of the step:
+
+- ``before(function, args, data)`` before the step runs
+- ``after(function, args, result, elapsed_ns)`` after the step returned
+- ``on_error(function, args, data, elapsed_ns, error)`` when the step raised; the error
+  is raised again afterwards
+
+Hooks must not modify the data. Errors raised by hooks are not caught. Steps skipped
+by a guard do not call hooks. While no hook is registered, the steps run without any
+hook code.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from time import perf_counter_ns
+from typing import Any
+
+BeforeHook = Callable[[str, dict[str, Any], dict[str, Any]], None]
+AfterHook = Callable[[str, dict[str, Any], Any, int], None]
+ErrorHook = Callable[[str, dict[str, Any], dict[str, Any], int, Exception], None]
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class StepHook:
+    """A set of hooks registered together with ``ParserManager.add_step_hook``."""
+
+    before: BeforeHook | None = None
+    after: AfterHook | None = None
+    on_error: ErrorHook | None = None
+
+
+class StepHooks:
+    """
+    Immutable collection of registered hooks.
+
+    Adding or removing a hook returns a new collection, so parsers running in other
+    threads keep using the hooks they started with.
+    """
+
+    __slots__ = ("hooks", "before", "after", "on_error")
+
+    def __init__(self, hooks: tuple[StepHook, ...] = ()):
+        self.hooks = hooks
+        self.before = tuple(hook.before for hook in hooks if hook.before is not None)
+        self.after = tuple(hook.after for hook in hooks if hook.after is not None)
+        self.on_error = tuple(hook.on_error for hook in hooks if hook.on_error is not None)
+
+    def __bool__(self) -> bool:
+        return bool(self.hooks)
+
+    def add(self, hook: StepHook) -> "StepHooks":
+        return StepHooks((*self.hooks, hook))
+
+    def remove(self, hook: StepHook) -> "StepHooks":
+        return StepHooks(tuple(registered for registered in self.hooks if registered is not hook))
+
+    def execute(
+        self,
+        function: str,
+        args: dict[str, Any],
+        execute: Callable[..., Any],
+        data: dict[str, Any],
+    ) -> Any:
+        """Runs a step function with the hooks called around it."""
+        for before in self.before:
+            before(function, args, data)
+        start = perf_counter_ns()
+        try:
+            result = execute(data=data, **args)
+        except Exception as e:
+            elapsed = perf_counter_ns() - start
+            for on_error in self.on_error:
+                on_error(function, args, data, elapsed, e)
+            raise
+        elapsed = perf_counter_ns() - start
+        for after in self.after:
+            after(function, args, result, elapsed)
+        return result
@@ -0,0 +1,275 @@
+"""
+Per-pipeline and per-step instrumentation of ``ParserManager.configured_parser``.
+
+Instrumentation is disabled by default and costs a single check per event then.
+When enabled with ``ParserManager.enable_instrumentation``, every pipeline (identified
+by the ``name`` key of its configuration) records per step:
+
+- the number of calls and of steps skipped by a guard
+- the number of errors by exception class
+- the total and maximum time in nanoseconds, measured with ``perf_counter_ns``
+- the total input and output size, as the number of top-level keys (leaves in
+  flat-native mode)
+
+Timings of an event are collected locally and merged under a lock once per event.
+"""
+
+import threading
+from collections.abc import Callable
+from time import perf_counter_ns
+from typing import Any, Protocol
+
+from schema_parser.core.outcomes import FILTERED
+
+DEFAULT_PIPELINE_NAME = "default"
+
+
+def pipeline_name(parser_config: dict) -> str:
+    """Returns the name of a parser configuration, used to group its statistics."""
+    return str(parser_config.get("name", DEFAULT_PIPELINE_NAME))
+
+
+def _size(data: Any) -> int:
+    return len(data) if isinstance(data, dict) else 0
+
+
+class StepStats:
+    """Statistics of a single step of a pipeline."""
+
+    __slots__ = (
+        "function",
+        "calls",
+        "skipped",
+        "errors",
+        "total_ns",
+        "max_ns",
+        "input_size",
+        "output_size",
+    )
+
+    def __init__(self, function: str):
+        self.function = function
+        self.calls = 0
+        self.skipped = 0
+        self.errors: dict[str, int] = {}
+        self.total_ns = 0
+        self.max_ns = 0
+        self.input_size = 0
+        self.output_size = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "function": self.function,
+            "calls": self.calls,
+            "skipped": self.skipped,
+            "errors": dict(self.errors),
+            "total_ns": self.total_ns,
+            "max_ns": self.max_ns,
+            "input_size": self.input_size,
+            "output_size": self.output_size,
+        }
+
+
+class PipelineStats:
+    """Statistics of a pipeline and its steps."""
+
+    __slots__ = ("events", "filtered", "errors", "total_ns", "max_ns", "steps")
+
+    def __init__(self):
+        self.events = 0
+        self.filtered = 0
+        self.errors: dict[str, int] = {}
+        self.total_ns = 0
+        self.max_ns = 0
+        self.steps: dict[tuple[int, str], StepStats] = {}
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "events": self.events,
+            "filtered": self.filtered,
+            "errors": dict(self.errors),
+            "total_ns": self.total_ns,
+            "max_ns": self.max_ns,
+            "steps": {
+                f"{index}:{function}": step.to_dict()
+                for (index, function), step in sorted(self.steps.items())
+            },
+        }
+
+
+class RunObserver(Protocol):
+    """Receiver of the measurements of every event, e.g. ``Instrumentation``."""
+
+    def merge(
+        self, run: "PipelineRun", elapsed: int, result: Any, error: Exception | None
+    ) -> None: ...
+
+
+class PipelineRun:
+    """
+    Measurements of a single event, passed to the observers by ``finish``.
+
+    Every record is ``(index, function, elapsed_ns, input_size, output_size, error)``,
+    where ``error`` is the exception class name, ``"skipped"`` or None.
+
+    Args:
+        observers: Receivers of the measurements
+        name: Name of the pipeline
+        event: Input event, not modified
+    """
+
+    __slots__ = ("observers", "name", "event", "start", "records")
+
+    def __init__(self, observers: tuple[RunObserver, ...], name: str, event: dict[str, Any]):
+        self.observers = observers
+        self.name = name
+        self.event = event
+        self.records: list[tuple[int, str, int, int, int, str | None]] = []
+        self.start = perf_counter_ns()
+
+    def execute(
+        self,
+        index: int,
+        function: str,
+        execute: Callable[..., Any],
+        /,
+        data: dict[str, Any],
+        **args: Any,
+    ) -> Any:
+        """Runs a step function and records its time and sizes."""
+        input_size = _size(data)
+        start = perf_counter_ns()
+        try:
+            result = execute(data=data, **args)
+        except Exception as e:
+            elapsed = perf_counter_ns() - start
+            self.records.append((index, function, elapsed, input_size, 0, type(e).__name__))
+            raise
+        elapsed = perf_counter_ns() - start
+        self.records.append((index, function, elapsed, input_size, _size(result), None))
+        return result
+
+    def skip(self, index: int, function: str) -> None:
+        """Records a step skipped by its guard."""
+        self.records.append((index, function, 0, 0, 0, "skipped"))
+
+    def finish(self, result: Any = None, error: Exception | None = None) -> None:
+        """Passes the measurements of the event to the observers."""
+        elapsed = perf_counter_ns() - self.start
+        for observer in self.observers:
+            observer.merge(self, elapsed, result, error)
+
+
+class Instrumentation:
+    """Thread-safe statistics of all instrumented pipelines."""
+
+    def __init__(self):
+        self._pipelines: dict[str, PipelineStats] = {}
+        self._lock = threading.Lock()
+
+    def merge(self, run: PipelineRun, elapsed: int, result: Any, error: Exception | None) -> None:
+        with self._lock:
+            stats = self._pipelines.get(run.name)
+            if stats is None:
+                stats = self._pipelines[run.name] = PipelineStats()
+            stats.events += 1
+            stats.total_ns += elapsed
+            stats.max_ns = max(stats.max_ns, elapsed)
+            if error is not None:
+                error_class = type(error).__name__
+                stats.errors[error_class] = stats.errors.get(error_class, 0) + 1
+            elif result is FILTERED:
+                stats.filtered += 1
+
+            for index, function, step_elapsed, input_size, output_size, step_error in run.records:
+                step = stats.steps.get((index, function))
+                if step is None:
+                    step = stats.steps[(index, function)] = StepStats(function)
+                if step_error == "skipped":
+                    step.skipped += 1
+                    continue
+                step.calls += 1
+                step.total_ns += step_elapsed
+                step.max_ns = max(step.max_ns, step_elapsed)
+                step.input_size += input_size
+                step.output_size += output_size
+                if step_error is not None:
+                    step.errors[step_error] = step.errors.get(step_error, 0) + 1
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """
+        Returns the statistics of every pipeline.
+
+        Steps are keyed by their position and function, e.g. ``"1:regex"``.
+        """
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self._pipelines.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._pipelines.clear()
+
+    def openmetrics(self) -> str:
+        """Returns the statistics in the OpenMetrics text format."""
+        return format_openmetrics(self.snapshot())
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items())
+
+
+def format_openmetrics(snapshot: dict[str, dict[str, Any]]) -> str:
+    """Formats a statistics snapshot in the OpenMetrics text format."""
+    families: dict[str, tuple[str, list[str]]] = {}
+
+    def sample(family: str, metric_type: str, suffix: str, labels: str, value: float) -> None:
+        lines = families.setdefault(family, (metric_type, []))[1]
+        lines.append(f"{family}{suffix}{{{labels}}} {value}")
+
+    for name, stats in snapshot.items():
+        labels = _labels(pipeline=name)
+        sample("schema_parser_pipeline_events", "counter", "_total", labels, stats["events"])
+        sample("schema_parser_pipeline_filtered", "counter", "_total", labels, stats["filtered"])
+        for error_class, count in stats["errors"].items():
+            error_labels = _labels(pipeline=name, error=error_class)
+            sample("schema_parser_pipeline_errors", "counter", "_total", error_labels, count)
+        seconds = stats["total_ns"] / 1e9
+        sample("schema_parser_pipeline_duration_seconds", "counter", "_total", labels, seconds)
+        sample(
+            "schema_parser_pipeline_duration_max_seconds",
+            "gauge",
+            "",
+            labels,
+            stats["max_ns"] / 1e9,
+        )
+
+        for key, step in stats["steps"].items():
+            index = key.split(":", 1)[0]
+            labels = _labels(pipeline=name, step=index, function=step["function"])
+            sample("schema_parser_step_calls", "counter", "_total", labels, step["calls"])
+            sample("schema_parser_step_skipped", "counter", "_total", labels, step["skipped"])
+            for error_class, count in step["errors"].items():
+                error_labels = _labels(
+                    pipeline=name, step=index, function=step["function"], error=error_class
+                )
+                sample("schema_parser_step_errors", "counter", "_total", error_labels, count)
+            seconds = step["total_ns"] / 1e9
+            sample("schema_parser_step_duration_seconds", "counter", "_total", labels, seconds)
+            sample(
+                "schema_parser_step_duration_max_seconds", "gauge", "", labels, step["max_ns"] / 1e9
+            )
+            sample("schema_parser_step_input_size", "counter", "_total", labels, step["input_size"])
+            sample(
+                "schema_parser_step_output_size", "counter", "_total", labels, step["output_size"]
+            )
+
+    lines = []
+    for family, (metric_type, samples) in families.items():
+        lines.append(f"# TYPE {family} {metric_type}")
+        lines.extend(samples)
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
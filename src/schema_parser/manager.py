@@ -1,11 +1,33 @@
 import copy
 import logging
+from collections.abc import Callable, Iterable, Sequence
+from functools import partial
+from typing import Any
 
 from flatten_dict import flatten as flatten_dict_func
 
-from schema_parser.functions import CORE_FUNCTIONS
+from schema_parser.analysis import push_down_projection
+from schema_parser.core.mapping_table import MAPPING_REGISTRY
+from schema_parser.core.outcomes import FILTERED, Filtered
+from schema_parser.core.utils import FlatDict, flatten_copy, flatten_value
+from schema_parser.core.utils import normalize_keys as normalize_keys_func
+from schema_parser.flight_recorder import FlightRecorder
+from schema_parser.functions import CANONICAL_FUNCTIONS, CORE_FUNCTIONS
+from schema_parser.functions.sample import SAMPLE_COUNTERS
+from schema_parser.guards import compile_guard, field_getter
+from schema_parser.hooks import AfterHook, BeforeHook, ErrorHook, StepHook, StepHooks
+from schema_parser.instrumentation import (
+    Instrumentation,
+    PipelineRun,
+    RunObserver,
+    format_openmetrics,
+    pipeline_name,
+)
+from schema_parser.optimizer import PipelineOptimizer
 from schema_parser.parsers import PREDEFINED_PARSERS
+from schema_parser.pipeline import PipelineStep, load_steps
 from schema_parser.query_normalizer import QueryNormalizer
+from schema_parser.router import Router
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +45,13 @@ class ParserManager:
     query_normalizer = QueryNormalizer()
     predefined_parsers = PREDEFINED_PARSERS
     core_functions = CORE_FUNCTIONS
+    canonical_functions = CANONICAL_FUNCTIONS
+    mapping_registry = MAPPING_REGISTRY
+    sample_counters = SAMPLE_COUNTERS
+    instrumentation: Instrumentation | None = None
+    flight_recorder: FlightRecorder | None = None
+    run_observers: tuple[RunObserver, ...] = ()
+    step_hooks = StepHooks()
 
     def configured_parser(
         self,
@@ -31,36 +60,373 @@ class ParserManager:
         suppress_errors: bool = False,
         log_errors: bool = False,
         flatten: bool = False,
-    ) -> dict:
-        steps = parser_config["steps"]
-        args = parser_config["args"]
-        result = copy.deepcopy(event)
+        flat_native: bool = False,
+        normalize_keys: bool = False,
+        skip_optional: bool = False,
+    ) -> dict | Filtered:
+        """
+        Runs the configured steps on a copy of the event.
+
+        With ``flat_native=True`` the event is flattened once up front and every step
+        operates on the flat, dot-keyed representation, so the result is already flat
+        and no final flatten pass is needed. Empty dictionaries do not exist in the flat
+        representation and are treated as missing fields. The event is copied while it
+        is flattened, and the steps get a ``FlatDict`` (see ``schema_parser.core.utils``),
+        so subtrees and missing fields are found without scanning all keys of the event.
+
+        With ``normalize_keys=True`` events with mixed dotted and nested keys are converted
+        into canonical nested form once up front (this also replaces the deep copy), and
+        the steps skip the literal dotted key checks on every field access.
+
+        A leading ``keep`` step runs on the event itself, so only the kept fields are
+        copied instead of the whole event. With ``flat_native=True`` it runs on the
+        flattened event like every other step.
+
+        Steps with a guard (see ``schema_parser.guards``) are skipped when the guard
+        does not match the current result.
+
+        Returns ``FILTERED`` (see ``schema_parser.core.outcomes``) as soon as a
+        ``filter`` or ``require`` step filters the event out; the remaining steps do
+        not run.
+
+        With ``skip_optional=True`` steps marked as optional are skipped, e.g. to shed
+        load (see ``schema_parser.adaptive``).
+
+        With instrumentation or the flight recorder enabled (see
+        ``enable_instrumentation`` and ``enable_flight_recorder``) every step is
+        measured, and registered hooks (see ``add_step_hook``) are called around every
+        step. Without either, the steps run without any measurement or hook code.
+        """
+        observers = self.run_observers
+        run = None
+        if observers:
+            run = PipelineRun(observers, pipeline_name(parser_config), event)
+        hooks = self.step_hooks
+        steps = load_steps(parser_config)
+        positions = range(len(steps))
+        if skip_optional:
+            positions = [index for index, step in enumerate(steps) if not step.optional]
+            steps = [steps[index] for index in positions]
+        functions = self.core_functions
+        keep_first = (
+            not normalize_keys
+            and not flat_native
+            and bool(steps)
+            and steps[0].function == "keep"
+            and steps[0].guard is None
+        )
+        if normalize_keys:
+            result = normalize_keys_func(event)
+            functions = self.canonical_functions
+        elif keep_first:
+            # Copied after the leading keep step
+            result = event
+        elif flat_native:
+            # Flattening builds new dictionaries, so only mutable leaves are copied
+            result = FlatDict(flatten_copy(event))
+        else:
+            result = copy.deepcopy(event)
 
         try:
-            for step in steps:
-                step_function = self.core_functions.get(step)
-                if not step_function:
-                    raise ValueError(f"Function {step} not found")
+            if keep_first:
+                # keep builds a new dictionary without modifying the event, so it runs
+                # before the copy and only the kept subtrees are copied
+                keep = functions["keep"].execute
+                if run is None and not hooks:
+                    result = keep(data=result, **steps[0].args)
+                else:
+                    result = self._execute_observed(
+                        positions[0], steps[0], keep, result, run, hooks
+                    )
+                result = copy.deepcopy(result)
+                steps, positions = steps[1:], positions[1:]
+            if flat_native and not isinstance(result, FlatDict):
+                result = FlatDict(flatten_value(result))
 
-                step_args = args.get(step, {})
-                result = step_function.execute(data=result, **step_args)
+            if run is None and not hooks:
+                result = self._run_steps(steps, result, functions, flat_native, normalize_keys)
+            else:
+                result = self._run_steps_observed(
+                    steps, positions, result, functions, flat_native, normalize_keys, run, hooks
+                )
+            if result is FILTERED:
+                if run is not None:
+                    run.finish(result)
+                return FILTERED
 
-            if flatten:
+            if flat_native:
+                result = dict(result)
+            elif flatten:
                 result = flatten_dict_func(result, reducer="dot")
+            if run is not None:
+                run.finish(result)
             return result
         except Exception as e:
+            if run is not None:
+                run.finish(error=e)
             if suppress_errors:
                 if log_errors:
                     logger.error(f"Error parsing event: {e}")
                 return event
             raise e
 
+    @staticmethod
+    def _run_steps(
+        steps: list[PipelineStep],
+        result: dict,
+        functions: dict[str, Any],
+        flat_native: bool,
+        normalize_keys: bool,
+    ) -> dict | Filtered:
+        getter = None
+        for step in steps:
+            if step.guard is not None:
+                getter = getter or field_getter(flat_native, not normalize_keys)
+                if not compile_guard(step.guard).matches(result, getter):
+                    continue
+
+            step_function = functions.get(step.function)
+            if not step_function:
+                raise ValueError(f"Function {step.function} not found")
+
+            if flat_native:
+                result = step_function.execute_flat(data=result, **step.args)
+                if type(result) is dict:
+                    # Steps that build a new dictionary return it without the index
+                    result = FlatDict(result)
+            else:
+                result = step_function.execute(data=result, **step.args)
+            if result is FILTERED:
+                return FILTERED
+        return result
+
+    def _run_steps_observed(
+        self,
+        steps: list[PipelineStep],
+        positions: Sequence[int],
+        result: dict,
+        functions: dict[str, Any],
+        flat_native: bool,
+        normalize_keys: bool,
+        run: PipelineRun | None,
+        hooks: StepHooks,
+    ) -> dict | Filtered:
+        # Same as _run_steps, with every step measured and called with the hooks
+        getter = None
+        for index, step in zip(positions, steps):
+            if step.guard is not None:
+                getter = getter or field_getter(flat_native, not normalize_keys)
+                if not compile_guard(step.guard).matches(result, getter):
+                    if run is not None:
+                        run.skip(index, step.function)
+                    continue
+
+            step_function = functions.get(step.function)
+            if not step_function:
+                raise ValueError(f"Function {step.function} not found")
+
+            execute = step_function.execute_flat if flat_native else step_function.execute
+            result = self._execute_observed(index, step, execute, result, run, hooks)
+            if result is FILTERED:
+                return FILTERED
+            if flat_native and type(result) is dict:
+                result = FlatDict(result)
+        return result
+
+    @staticmethod
+    def _execute_observed(
+        index: int,
+        step: PipelineStep,
+        execute: Callable[..., Any],
+        data: dict,
+        run: PipelineRun | None,
+        hooks: StepHooks,
+    ) -> Any:
+        if run is not None:
+            execute = partial(run.execute, index, step.function, execute)
+        if hooks:
+            return hooks.execute(step.function, step.args, execute, data)
+        return execute(data=data, **step.args)
+
+    def add_step_hook(
+        self,
+        before: BeforeHook | None = None,
+        after: AfterHook | None = None,
+        on_error: ErrorHook | None = None,
+    ) -> StepHook:
+        """
+        Registers hooks called around every step of ``configured_parser``.
+
+        See ``schema_parser.hooks`` for the arguments the hooks get.
+
+        Returns:
+            The registered hook, to be passed to ``remove_step_hook``
+        """
+        hook = StepHook(before, after, on_error)
+        self.step_hooks = self.step_hooks.add(hook)
+        return hook
+
+    def remove_step_hook(self, hook: StepHook) -> None:
+        """Unregisters hooks added with ``add_step_hook``."""
+        self.step_hooks = self.step_hooks.remove(hook)
+
+    def enable_instrumentation(self) -> Instrumentation:
+        """
+        Starts recording per-pipeline and per-step statistics of ``configured_parser``.
+
+        Pipelines are identified by the ``name`` key of their configuration (see
+        ``schema_parser.instrumentation``). Statistics recorded so far are kept.
+        """
+        if self.instrumentation is None:
+            self.instrumentation = Instrumentation()
+            self._update_run_observers()
+        return self.instrumentation
+
+    def disable_instrumentation(self) -> None:
+        """Stops recording statistics and discards them."""
+        self.instrumentation = None
+        self._update_run_observers()
+
+    def enable_flight_recorder(
+        self, capacity: int = 10, window_seconds: float = 60.0, max_input_chars: int = 4096
+    ) -> FlightRecorder:
+        """
+        Starts keeping the slowest events of every pipeline with per-step timings.
+
+        See ``schema_parser.flight_recorder.FlightRecorder`` for the arguments. A
+        recorder that is already enabled is returned as is.
+        """
+        if self.flight_recorder is None:
+            self.flight_recorder = FlightRecorder(capacity, window_seconds, max_input_chars)
+            self._update_run_observers()
+        return self.flight_recorder
+
+    def disable_flight_recorder(self) -> None:
+        """Stops recording slow events and discards them."""
+        self.flight_recorder = None
+        self._update_run_observers()
+
+    def _update_run_observers(self) -> None:
+        self.run_observers = tuple(
+            observer
+            for observer in (self.instrumentation, self.flight_recorder)
+            if observer is not None
+        )
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """
+        Returns a snapshot of the recorded statistics by pipeline name.
+
+        Returns:
+            Dictionary of pipeline statistics with their steps keyed by position and
+            function (e.g. ``"1:regex"``), empty if instrumentation is disabled
+        """
+        if self.instrumentation is None:
+            return {}
+        return self.instrumentation.snapshot()
+
+    def stats_openmetrics(self) -> str:
+        """Returns the recorded statistics in the OpenMetrics text format."""
+        return format_openmetrics(self.stats())
+
+    def batch_parser(
+        self,
+        events: Iterable[dict],
+        parser_config: dict,
+        keep_filtered: bool = False,
+        **options: Any,
+    ) -> list[dict | Filtered]:
+        """
+        Runs the configured steps on every event of a batch.
+
+        Args:
+            events: Events to parse
+            parser_config: Parser configuration
+            keep_filtered: Keep ``FILTERED`` in place of filtered events, so results
+                line up with the events. By default filtered events are omitted.
+            **options: Other options of ``configured_parser``
+
+        Returns:
+            List of results
+        """
+        results = []
+        for event in events:
+            result = self.configured_parser(event, parser_config, **options)
+            if result is not FILTERED or keep_filtered:
+                results.append(result)
+        return results
+
+    def routed_parser(
+        self,
+        event: dict,
+        router: Router | dict,
+        suppress_errors: bool = False,
+        log_errors: bool = False,
+        **options: Any,
+    ) -> dict:
+        """
+        Runs the parser configuration the router picks for the event.
+
+        Every event runs exactly one configuration, chosen by a dictionary lookup of
+        its discriminator value (see ``schema_parser.router``). Compile the router once
+        with ``Router.from_config`` to avoid compiling it for every event.
+
+        Args:
+            event: Event to parse
+            router: Compiled router or routed configuration
+            suppress_errors: Return the original event instead of raising errors,
+                including a missing route
+            log_errors: Log suppressed errors
+            **options: Other options of ``configured_parser``
+
+        Raises:
+            ValueError: If no route matches and there is no default route
+        """
+        if not isinstance(router, Router):
+            router = Router.from_config(router)
+
+        parser_config = router.route(event)
+        if parser_config is None:
+            error = ValueError(f"No route for field {router.field}")
+            if suppress_errors:
+                if log_errors:
+                    logger.error(f"Error parsing event: {error}")
+                return event
+            raise error
+        return self.configured_parser(
+            event, parser_config, suppress_errors=suppress_errors, log_errors=log_errors, **options
+        )
+
     def predefined_parser(self, event: dict, parser_name: str) -> dict:
         parser = self.predefined_parsers.get(parser_name)
         if not parser:
             raise ValueError(f"Parser {parser_name} not found")
         return parser.parse(event)
 
-    def query_parser(self, query: str) -> dict:
-        parser_config = self.query_normalizer.parse_query(query)
+    def query_parser(
+        self,
+        query: str,
+        output_fields: list[str] | None = None,
+        version: int = 1,
+        optimize: bool = False,
+    ) -> dict:
+        """
+        Normalizes a query string into a parser configuration.
+
+        ``version=2`` produces the format where every step carries its own arguments,
+        so a function can be used several times in one query (see
+        ``schema_parser.pipeline``). ``configured_parser`` accepts both versions.
+
+        If ``output_fields`` is given, only these fields of the result are expected to
+        be consumed, and the paths the pipeline does not need are pruned from parsed
+        JSON right after decoding (see ``schema_parser.analysis.push_down_projection``).
+
+        With ``optimize=True`` the steps are rewritten into an equivalent cheaper
+        pipeline (see ``schema_parser.optimizer``). The result always uses version 2.
+        """
+        parser_config = self.query_normalizer.parse_query(query, version=version)
+        if optimize:
+            parser_config = PipelineOptimizer().optimize(parser_config)
+        if output_fields is not None:
+            parser_config = push_down_projection(parser_config, output_fields)
         return parser_config
@@ -0,0 +1,206 @@
+"""
+Allocation profiling of pipeline steps with ``tracemalloc``.
+
+``MemoryProfiler`` runs a parser configuration on a sample of events with
+``tracemalloc`` tracing and attributes the memory of every event to the functions of
+its steps, using step hooks (see ``schema_parser.hooks``):
+
+- ``net_bytes``: memory still allocated after the step, e.g. a parsed JSON value
+- ``peak_bytes``: highest memory above the start of the step while it ran
+- ``blocks``: memory blocks still allocated after the step (with ``count_blocks``)
+
+Memory that is not allocated by a step, mostly the copy of the event and the final
+flatten pass, is reported as ``copy``. A failing step only adds its call and peak:
+what it allocated is mostly the exception and its traceback, which are released once
+the error is handled, so its net memory is left to ``copy``. Tracing slows the parser down several times,
+and counting blocks takes a ``tracemalloc`` snapshot around every step, so only a
+sample of events should be profiled.
+
+The profiler is also available from the command line::
+
+    python -m schema_parser --query '...' --events events.jsonl --profile-memory
+"""
+
+import copy
+import tracemalloc
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from schema_parser.manager import ParserManager
+
+COPY_STEP = "copy"
+
+
+@dataclass(slots=True)
+class StepMemory:
+    """Memory attributed to a step function over all profiled events."""
+
+    calls: int = 0
+    net_bytes: int = 0
+    peak_bytes: int = 0
+    max_peak_bytes: int = 0
+    blocks: int = 0
+
+
+@dataclass(slots=True)
+class MemoryReport:
+    """Result of ``MemoryProfiler.profile``."""
+
+    events: int
+    steps: dict[str, StepMemory]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "events": self.events,
+            "steps": {name: asdict(step) for name, step in self.steps.items()},
+        }
+
+    def format_table(self) -> str:
+        """Formats the report as a text table, the most allocating step first."""
+        header = (
+            f"{'step':<24}{'calls':>10}{'net bytes':>14}{'peak bytes':>14}"
+            f"{'max peak':>14}{'blocks':>10}"
+        )
+        lines = [f"Profiled events: {self.events}", header]
+        for name, step in sorted(self.steps.items(), key=lambda item: -item[1].net_bytes):
+            lines.append(
+                f"{name:<24}{step.calls:>10}{step.net_bytes:>14}{step.peak_bytes:>14}"
+                f"{step.max_peak_bytes:>14}{step.blocks:>10}"
+            )
+        return "\n".join(lines)
+
+
+def _blocks() -> int:
+    return sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+
+
+class MemoryProfiler:
+    """
+    Attributes the memory allocated while parsing events to pipeline steps.
+
+    Args:
+        manager: Parser manager to profile, a new ``ParserManager`` by default. The
+            profiled events run on a copy of it with the profiling hooks added, so
+            other threads parsing with the manager do not call them.
+        count_blocks: Whether to count memory blocks, which is much slower
+        frames: Number of frames ``tracemalloc`` stores per allocation
+
+    Example:
+        report = MemoryProfiler().profile(events, parser_config, every=100)
+        print(report.format_table())
+    """
+
+    def __init__(
+        self, manager: ParserManager | None = None, count_blocks: bool = False, frames: int = 1
+    ):
+        self.manager = manager or ParserManager()
+        self.count_blocks = count_blocks
+        self.frames = frames
+        self._steps: dict[str, StepMemory] = {}
+        self._start: tuple[int, int] = (0, 0)
+        self._event_steps = StepMemory()
+
+    def profile(
+        self,
+        events: Iterable[dict],
+        parser_config: dict,
+        every: int = 1,
+        max_events: int | None = None,
+        **options: Any,
+    ) -> MemoryReport:
+        """
+        Profiles a sample of events.
+
+        Args:
+            events: Events to parse
+            parser_config: Parser configuration
+            every: Profile every n-th event
+            max_events: Maximum number of profiled events
+            **options: Options of ``configured_parser``; errors are always suppressed
+
+        Returns:
+            Memory attributed to every step function and to ``copy``
+
+        ``tracemalloc`` traces the whole process, so events parsed by other threads
+        while profiling still add to the measured memory.
+        """
+        self._steps = {}
+        profiled = 0
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start(self.frames)
+        manager = copy.copy(self.manager)
+        manager.add_step_hook(before=self._before, after=self._after, on_error=self._on_error)
+        try:
+            for position, event in enumerate(events):
+                if max_events is not None and profiled >= max_events:
+                    break
+                if position % every:
+                    continue
+                self._profile_event(manager, event, parser_config, options)
+                profiled += 1
+        finally:
+            if started:
+                tracemalloc.stop()
+        return MemoryReport(events=profiled, steps=self._steps)
+
+    def _profile_event(
+        self,
+        manager: ParserManager,
+        event: dict,
+        parser_config: dict,
+        options: dict[str, Any],
+    ) -> None:
+        self._event_steps = StepMemory()
+        blocks = _blocks() if self.count_blocks else 0
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+
+        options = {**options, "suppress_errors": True}
+        result = manager.configured_parser(event, parser_config, **options)
+
+        after = tracemalloc.get_traced_memory()[0]
+        copy_step = self._steps.setdefault(COPY_STEP, StepMemory())
+        copy_step.calls += 1
+        copy_step.net_bytes += after - current - self._event_steps.net_bytes
+        if self.count_blocks:
+            copy_step.blocks += _blocks() - blocks - self._event_steps.blocks
+        # Measured while the result is still referenced, so its memory is not released
+        del result
+
+    def _before(self, function: str, args: dict[str, Any], data: dict[str, Any]) -> None:
+        blocks = _blocks() if self.count_blocks else 0
+        tracemalloc.reset_peak()
+        self._start = (tracemalloc.get_traced_memory()[0], blocks)
+
+    def _after(self, function: str, args: dict[str, Any], result: Any, elapsed: int) -> None:
+        step = self._record(function)
+        current = tracemalloc.get_traced_memory()[0]
+        start, start_blocks = self._start
+        net = current - start
+        step.net_bytes += net
+        self._event_steps.net_bytes += net
+        if self.count_blocks:
+            blocks = _blocks() - start_blocks
+            step.blocks += blocks
+            self._event_steps.blocks += blocks
+
+    def _on_error(
+        self,
+        function: str,
+        args: dict[str, Any],
+        data: dict[str, Any],
+        elapsed: int,
+        error: Exception,
+    ) -> None:
+        self._record(function)
+
+    def _record(self, function: str) -> StepMemory:
+        """Adds the call and the peak of the step that just ran."""
+        peak = tracemalloc.get_traced_memory()[1] - self._start[0]
+        step = self._steps.setdefault(function, StepMemory())
+        step.calls += 1
+        step.peak_bytes += peak
+        step.max_peak_bytes = max(step.max_peak_bytes, peak)
+        return step
@@ -0,0 +1,216 @@
+"""
+Execution of many pipelines on the same event with shared step prefixes.
+
+Pipelines of different tenants often start with the same steps, e.g.
+``parse_json(field="message", in_place=True) | extract(field="winlog.event_data")``,
+and diverge afterwards. ``MultiPipelineExecutor`` merges the pipelines into a trie of
+steps, so every shared prefix runs once per event. The intermediate result is copied
+only where branches fork; the last branch of a fork reuses it without a copy.
+"""
+
+import copy
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+import orjson
+from flatten_dict import flatten as flatten_dict_func
+
+from schema_parser.core.outcomes import FILTERED, Filtered
+from schema_parser.core.utils import FlatDict, flatten_copy
+from schema_parser.core.utils import normalize_keys as normalize_keys_func
+from schema_parser.manager import ParserManager
+from schema_parser.pipeline import PipelineStep, load_steps
+
+logger = logging.getLogger(__name__)
+
+
+class StepNode:
+    """
+    Node of the step trie.
+
+    ``steps`` are the steps from the parent node up to this node: a chain of steps
+    without forks is merged into a single node, so it runs in one call of the manager's
+    step loop. ``position`` is the index of the first of them in the pipelines.
+    ``tenants`` are the pipelines that end at this node.
+    """
+
+    __slots__ = ("steps", "position", "children", "tenants", "subtree_tenants")
+
+    def __init__(self, steps: list[PipelineStep] | None = None, position: int = 0):
+        self.steps = steps or []
+        self.position = position
+        self.children: dict[tuple[str, bytes], StepNode] = {}
+        self.tenants: list[str] = []
+        self.subtree_tenants: list[str] = []
+
+    def merge_chains(self) -> None:
+        """Merges every child with its only child until the next fork or tenant."""
+        for child in self.children.values():
+            while len(child.children) == 1 and not child.tenants:
+                (grandchild,) = child.children.values()
+                child.steps.extend(grandchild.steps)
+                child.children = grandchild.children
+                child.tenants = grandchild.tenants
+            child.merge_chains()
+
+
+@dataclass(slots=True)
+class RunContext:
+    """Options of a single ``MultiPipelineExecutor.execute`` call."""
+
+    event: dict
+    functions: dict[str, Any]
+    suppress_errors: bool
+    log_errors: bool
+    flatten: bool
+    flat_native: bool
+    normalize_keys: bool
+    skip_optional: bool
+
+
+def _step_key(step: PipelineStep) -> tuple[str, bytes]:
+    step_spec = step.args
+    if step.guard is not None or step.optional:
+        step_spec = [step.args, step.guard, step.optional]
+    return step.function, orjson.dumps(step_spec, option=orjson.OPT_SORT_KEYS, default=str)
+
+
+class MultiPipelineExecutor:
+    """
+    Runs the pipelines of many tenants on an event with shared prefixes run once.
+
+    The steps run in the step loop of ``ParserManager``, with its functions and step
+    hooks; the executor only schedules the shared prefixes and copies at the forks.
+
+    Args:
+        pipelines: Mapping of tenant names to parser configurations of any version
+        manager: Parser manager whose step loop runs the steps, a new
+            ``ParserManager`` by default
+
+    Example:
+        executor = MultiPipelineExecutor({"tenant_a": config_a, "tenant_b": config_b})
+        results = executor.execute(event, flatten=True)
+        # {"tenant_a": {...}, "tenant_b": {...}}
+    """
+
+    def __init__(self, pipelines: dict[str, dict], manager: ParserManager | None = None):
+        self.manager = manager or ParserManager()
+        self.root = StepNode()
+        self.step_count = 0
+        self.node_count = 0
+        for tenant, parser_config in pipelines.items():
+            self._insert(tenant, load_steps(parser_config))
+        self.root.merge_chains()
+
+    def _insert(self, tenant: str, steps: list[PipelineStep]) -> None:
+        node = self.root
+        node.subtree_tenants.append(tenant)
+        for position, step in enumerate(steps):
+            key = _step_key(step)
+            child = node.children.get(key)
+            if child is None:
+                child = node.children[key] = StepNode([step], position)
+                self.node_count += 1
+            node = child
+            node.subtree_tenants.append(tenant)
+        node.tenants.append(tenant)
+        self.step_count += len(steps)
+
+    @property
+    def shared_steps(self) -> int:
+        """Number of steps per event saved by running shared prefixes once."""
+        return self.step_count - self.node_count
+
+    def execute(
+        self,
+        event: dict,
+        suppress_errors: bool = False,
+        log_errors: bool = False,
+        flatten: bool = False,
+        flat_native: bool = False,
+        normalize_keys: bool = False,
+        skip_optional: bool = False,
+    ) -> dict[str, dict | Filtered]:
+        """
+        Runs all pipelines on a copy of the event.
+
+        The options have the same meaning as in ``ParserManager.configured_parser``.
+        With ``suppress_errors=True`` every tenant whose pipeline failed gets the
+        original event, the other tenants are not affected. Tenants whose pipeline
+        filtered the event out get ``FILTERED``.
+
+        Returns:
+            Mapping of tenant names to results
+        """
+        manager = self.manager
+        functions = manager.canonical_functions if normalize_keys else manager.core_functions
+        if normalize_keys:
+            result = normalize_keys_func(event)
+        elif flat_native:
+            result = FlatDict(flatten_copy(event))
+        else:
+            result = copy.deepcopy(event)
+
+        outputs: dict[str, dict | Filtered] = {}
+        context = RunContext(
+            event,
+            functions,
+            suppress_errors,
+            log_errors,
+            flatten,
+            flat_native,
+            normalize_keys,
+            skip_optional,
+        )
+        self._run(self.root, result, outputs, context)
+        return outputs
+
+    def _run(
+        self, node: StepNode, data: dict, outputs: dict[str, dict | Filtered], context: RunContext
+    ) -> None:
+        # Every consumer but the last one gets its own copy of the data
+        consumers = len(node.tenants) + len(node.children)
+        for tenant in node.tenants:
+            consumers -= 1
+            result = data if consumers == 0 else copy.deepcopy(data)
+            if context.flat_native:
+                result = dict(result)
+            elif context.flatten:
+                result = flatten_dict_func(result, reducer="dot")
+            outputs[tenant] = result
+
+        for child in node.children.values():
+            consumers -= 1
+            branch = data if consumers == 0 else copy.deepcopy(data)
+            try:
+                branch = self._run_steps(child, branch, context)
+            except Exception as e:
+                if not context.suppress_errors:
+                    raise e
+                if context.log_errors:
+                    logger.error(f"Error parsing event: {e}")
+                for tenant in child.subtree_tenants:
+                    outputs[tenant] = context.event
+                continue
+            if branch is FILTERED:
+                for tenant in child.subtree_tenants:
+                    outputs[tenant] = FILTERED
+                continue
+            self._run(child, branch, outputs, context)
+
+    def _run_steps(self, node: StepNode, data: dict, context: RunContext) -> dict | Filtered:
+        manager = self.manager
+        positions = range(node.position, node.position + len(node.steps))
+        steps = node.steps
+        if context.skip_optional:
+            positions = [
+                position for position, step in zip(positions, steps) if not step.optional
+            ]
+            steps = [step for step in steps if not step.optional]
+        args = (context.functions, context.flat_native, context.normalize_keys)
+        if not manager.step_hooks:
+            return manager._run_steps(steps, data, *args)
+        return manager._run_steps_observed(
+            steps, positions, data, *args, None, manager.step_hooks
+        )
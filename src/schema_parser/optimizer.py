@@ -0,0 +1,239 @@
+"""
+Algebraic rewrites of parser pipelines.
+
+The optimizer rewrites adjacent pairs of steps into cheaper equivalent steps until no
+rewrite applies any more:
+
+- consecutive ``drop`` steps are merged into one
+- ``set`` of a field that is dropped right after is eliminated
+- ``set`` of a field that is set again right after is eliminated
+- ``rename`` chained through a temporary top-level field (``a -> t``, ``t -> b``) is
+  replaced with ``a -> b`` and a drop of the temporary field
+- with ``canonical_keys=True``, ``drop`` of top-level fields placed after ``extract``
+  is pushed before it
+
+Every rewrite keeps the output (and the raised errors) of the pipeline identical.
+Steps with a guard and optional steps may or may not run, so they are never rewritten.
+Pushing drops before ``extract`` is only valid when events contain no literal dotted
+keys, i.e. when they are processed with ``normalize_keys=True``.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+from schema_parser.core.path_trie import is_glob
+from schema_parser.pipeline import CONFIG_VERSION, PipelineStep, dump_steps, upgrade_config
+
+RewriteResult = tuple[list[PipelineStep], str] | None
+
+
+def _covers(prefix: str, path: str) -> bool:
+    return path == prefix or path.startswith(f"{prefix}.")
+
+
+def _overlaps(first: str, second: str) -> bool:
+    return _covers(first, second) or _covers(second, first)
+
+
+def _split_fields(fields: str) -> list[str]:
+    return [field.strip() for field in fields.split(",") if field.strip()]
+
+
+def _rewritable(step: PipelineStep) -> bool:
+    return step.guard is None and not step.optional
+
+
+def format_step(step: PipelineStep) -> str:
+    """Formats a step as a function call, e.g. ``drop(fields="a,b")``."""
+    args = ", ".join(f"{name}={value!r}" for name, value in step.args.items())
+    call = f"optional {step.function}({args})" if step.optional else f"{step.function}({args})"
+    if step.guard is None:
+        return call
+    guard_args = ", ".join(
+        f"{name}={value!r}" for name, value in step.guard.items() if name != "type"
+    )
+    return f"{call} if {step.guard['type']}({guard_args})"
+
+
+class PipelineOptimizer:
+    """
+    Rewrites parser configurations into equivalent cheaper ones.
+
+    Args:
+        canonical_keys: Whether events are known to contain no literal dotted keys
+            (e.g. they are processed with ``normalize_keys=True``). Enables rewrites
+            that are only valid for canonical nested events.
+    """
+
+    def __init__(self, canonical_keys: bool = False):
+        self.canonical_keys = canonical_keys
+        self.rewrites: list[Callable[[PipelineStep, PipelineStep], RewriteResult]] = [
+            self._merge_drops,
+            self._eliminate_set_before_drop,
+            self._eliminate_set_before_set,
+            self._collapse_rename_chain,
+        ]
+        if canonical_keys:
+            self.rewrites.append(self._push_drop_before_extract)
+
+    def optimize(self, parser_config: dict) -> dict:
+        """
+        Returns an optimized copy of a parser configuration.
+
+        The result always uses the versioned format (see ``schema_parser.pipeline``),
+        since rewrites may repeat a function with different arguments.
+        """
+        steps, _ = self._rewrite(parser_config)
+        return dump_steps(steps, version=CONFIG_VERSION, name=parser_config.get("name"))
+
+    def explain(self, parser_config: dict) -> dict[str, list[str]]:
+        """
+        Returns the plans before and after optimization and the applied rewrites.
+
+        Returns:
+            Dictionary with ``before`` and ``after`` lists of formatted steps and a
+            ``rewrites`` list describing every rewrite in the order it was applied
+        """
+        before = [format_step(step) for step in self._load(parser_config)]
+        steps, rewrites = self._rewrite(parser_config)
+        return {
+            "before": before,
+            "after": [format_step(step) for step in steps],
+            "rewrites": rewrites,
+        }
+
+    @staticmethod
+    def _load(parser_config: dict) -> list[PipelineStep]:
+        # Work on a copy, the rewrites replace arguments of steps
+        return [
+            PipelineStep(
+                step["function"], step["args"], step.get("guard"), step.get("optional", False)
+            )
+            for step in upgrade_config(parser_config)["steps"]
+        ]
+
+    def _rewrite(self, parser_config: dict) -> tuple[list[PipelineStep], list[str]]:
+        steps = self._load(parser_config)
+        applied: list[str] = []
+        changed = True
+        while changed:
+            changed = False
+            for rewrite in self.rewrites:
+                index = 0
+                while index < len(steps) - 1:
+                    if not (_rewritable(steps[index]) and _rewritable(steps[index + 1])):
+                        index += 1
+                        continue
+                    result = rewrite(steps[index], steps[index + 1])
+                    if result is None:
+                        index += 1
+                        continue
+                    replacement, description = result
+                    steps[index : index + 2] = replacement
+                    applied.append(description)
+                    changed = True
+        return steps, applied
+
+    @staticmethod
+    def _merge_drops(first: PipelineStep, second: PipelineStep) -> RewriteResult:
+        if first.function != "drop" or second.function != "drop":
+            return None
+        fields = _split_fields(first.args["fields"]) + _split_fields(second.args["fields"])
+        merged = PipelineStep("drop", {"fields": ",".join(fields)})
+        return [merged], f"merged {format_step(first)} and {format_step(second)}"
+
+    @staticmethod
+    def _eliminate_set_before_drop(first: PipelineStep, second: PipelineStep) -> RewriteResult:
+        # Setting a dotted path creates intermediate dictionaries that survive the drop
+        if first.function != "set" or second.function != "drop":
+            return None
+        field = first.args["field"]
+        if "." in field or field not in _split_fields(second.args["fields"]):
+            return None
+        return [second], f"eliminated {format_step(first)} dropped by {format_step(second)}"
+
+    @staticmethod
+    def _eliminate_set_before_set(first: PipelineStep, second: PipelineStep) -> RewriteResult:
+        if first.function != "set" or second.function != "set":
+            return None
+        if first.args["field"] != second.args["field"]:
+            return None
+        return [second], f"eliminated {format_step(first)} overwritten by {format_step(second)}"
+
+    @staticmethod
+    def _collapse_rename_chain(first: PipelineStep, second: PipelineStep) -> RewriteResult:
+        if first.function != "rename" or second.function != "rename":
+            return None
+        source, temporary = first.args["from_field"], first.args["to_field"]
+        if second.args["from_field"] != temporary:
+            return None
+        target = second.args["to_field"]
+        # A dotted temporary may leave intermediate dictionaries behind
+        if "." in temporary:
+            return None
+        if _overlaps(source, temporary) or _overlaps(source, target):
+            return None
+        if _overlaps(temporary, target):
+            return None
+
+        rename = PipelineStep("rename", {"from_field": source, "to_field": target})
+        # The temporary field is overwritten and removed by the original chain
+        drop = PipelineStep("drop", {"fields": temporary})
+        return (
+            [rename, drop],
+            f"collapsed {format_step(first)} and {format_step(second)} into {format_step(rename)}",
+        )
+
+    @staticmethod
+    def _push_drop_before_extract(first: PipelineStep, second: PipelineStep) -> RewriteResult:
+        if first.function != "extract" or second.function != "drop":
+            return None
+        field = first.args["field"]
+        fields = _split_fields(second.args["fields"])
+        if not fields or any(
+            "." in name or is_glob(name) or _covers(name, field) for name in fields
+        ):
+            return None
+
+        # Extracted keys replace top-level keys, so they are dropped from both places
+        pushed_fields = fields + [f"{field}.{name}" for name in fields]
+        drop = PipelineStep("drop", {"fields": ",".join(pushed_fields)})
+        return [drop, first], f"pushed {format_step(second)} before {format_step(first)}"
+
+
+def _run(parser: Callable[..., Any], event: dict, parser_config: dict, options: dict) -> Any:
+    try:
+        return ("result", parser(event, parser_config, **options))
+    except Exception as e:
+        return ("error", type(e), str(e))
+
+
+def verify_equivalence(
+    parser: Callable[..., Any],
+    parser_config: dict,
+    optimized_config: dict,
+    events: list[dict],
+    **options: Any,
+) -> list[dict[str, Any]]:
+    """
+    Runs both configurations on every event and reports differences.
+
+    Results and raised errors (type and message) are compared.
+
+    Args:
+        parser: Parser callable, e.g. ``ParserManager().configured_parser``
+        parser_config: Original parser configuration
+        optimized_config: Optimized parser configuration
+        events: Events to run
+        **options: Additional options passed to the parser (e.g. ``flatten=True``)
+
+    Returns:
+        List of mismatches with the event and both outcomes. Empty if equivalent.
+    """
+    mismatches = []
+    for event in events:
+        expected = _run(parser, event, parser_config, options)
+        actual = _run(parser, event, optimized_config, options)
+        if expected != actual:
+            mismatches.append({"event": event, "expected": expected, "actual": actual})
+    return mismatches
@@ -0,0 +1,157 @@
+"""
+Parser configuration formats.
+
+Version 1 (the original format) lists function names in ``steps`` and keys their
+arguments by function name, so every function can only be configured once::
+
+    {"steps": ["parse_json", "rename"], "args": {"parse_json": {...}, "rename": {...}}}
+
+Version 2 stores the arguments with every step, so a function may appear any number
+of times in one pipeline::
+
+    {
+        "version": 2,
+        "steps": [
+            {"function": "rename", "args": {"from_field": "a", "to_field": "b"}},
+            {"function": "rename", "args": {"from_field": "c", "to_field": "d"}},
+        ],
+    }
+
+Configurations without a ``version`` key are version 1. Configurations of both
+versions may have a ``name``, which identifies the pipeline in statistics.
+
+A step may have a guard (see ``schema_parser.guards``) that is checked before the step
+runs; the step is skipped if the guard does not match. Version 2 stores it under the
+``guard`` key of the step, version 1 in a ``guards`` dictionary keyed by function name.
+
+A step may be optional: it is skipped when the parser runs with ``skip_optional=True``,
+e.g. under load (see ``schema_parser.adaptive``). Version 2 marks it with
+``"optional": true``, version 1 lists the function in an ``optional`` list.
+"""
+
+import copy
+from dataclasses import dataclass, field
+from typing import Any
+
+CONFIG_VERSION = 2
+
+
+@dataclass(slots=True)
+class PipelineStep:
+    """A single step of a pipeline with its own arguments."""
+
+    function: str
+    args: dict[str, Any] = field(default_factory=dict)
+    guard: dict[str, Any] | None = None
+    optional: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        step: dict[str, Any] = {"function": self.function, "args": self.args}
+        if self.guard is not None:
+            step["guard"] = self.guard
+        if self.optional:
+            step["optional"] = True
+        return step
+
+
+def get_config_version(parser_config: dict) -> int:
+    return parser_config.get("version", 1)
+
+
+def load_steps(parser_config: dict) -> list[PipelineStep]:
+    """
+    Loads the steps of a parser configuration of any supported version.
+
+    Args:
+        parser_config: Parser configuration
+
+    Returns:
+        List of steps in execution order
+
+    Raises:
+        ValueError: If the configuration version is not supported
+    """
+    version = get_config_version(parser_config)
+    if version == 1:
+        args = parser_config["args"]
+        guards = parser_config.get("guards", {})
+        optional = set(parser_config.get("optional", ()))
+        return [
+            PipelineStep(step, args.get(step, {}), guards.get(step), step in optional)
+            for step in parser_config["steps"]
+        ]
+    if version == 2:
+        return [
+            PipelineStep(
+                step["function"],
+                step.get("args", {}),
+                step.get("guard"),
+                step.get("optional", False),
+            )
+            for step in parser_config["steps"]
+        ]
+    raise ValueError(f"Unsupported parser config version {version}")
+
+
+def dump_steps(
+    steps: list[PipelineStep], version: int = CONFIG_VERSION, name: str | None = None
+) -> dict:
+    """
+    Builds a parser configuration from a list of steps.
+
+    Version 1 can only hold one set of arguments, one guard and one optional marker
+    per function. If a repeated function differs in any of them, version 1 would
+    merge its occurrences, so version 2 is produced instead.
+
+    Args:
+        steps: List of steps in execution order
+        version: Configuration version to produce
+        name: Name of the pipeline, e.g. to group its statistics
+
+    Returns:
+        Parser configuration
+
+    Raises:
+        ValueError: If the configuration version is not supported
+    """
+    if version == 1 and not _fits_version_1(steps):
+        version = 2
+    if version == 1:
+        config: dict[str, Any] = {"steps": [], "args": {}}
+        if name is not None:
+            config["name"] = name
+        for step in steps:
+            config["steps"].append(step.function)
+            config["args"][step.function] = step.args
+            if step.guard is not None:
+                config.setdefault("guards", {})[step.function] = step.guard
+            if step.optional and step.function not in config.get("optional", ()):
+                config.setdefault("optional", []).append(step.function)
+        return config
+    if version == 2:
+        config = {"version": 2, "steps": [step.to_dict() for step in steps]}
+        if name is not None:
+            config["name"] = name
+        return config
+    raise ValueError(f"Unsupported parser config version {version}")
+
+
+def _fits_version_1(steps: list[PipelineStep]) -> bool:
+    """Checks that every repeated function is configured the same way each time."""
+    seen: dict[str, PipelineStep] = {}
+    for step in steps:
+        first = seen.setdefault(step.function, step)
+        if first is not step and first != step:
+            return False
+    return True
+
+
+def upgrade_config(parser_config: dict) -> dict:
+    """Converts a parser configuration of any supported version to the current version."""
+    steps = [
+        PipelineStep(
+            step.function, copy.deepcopy(step.args), copy.deepcopy(step.guard), step.optional
+        )
+        for step in load_steps(parser_config)
+    ]
+    return dump_steps(steps, version=CONFIG_VERSION, name=parser_config.get("name"))
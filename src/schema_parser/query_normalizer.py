@@ -1,6 +1,31 @@
 import re
 from typing import Any
 
+from schema_parser.guards import GUARD_TYPES
+from schema_parser.pipeline import PipelineStep, dump_steps
+
+FIELD_PATTERN = re.compile(r"[a-zA-Z0-9_\.\-]*")
+FIELD_LIST_PATTERN = re.compile(r"[a-zA-Z0-9_\.\-,\s]*")
+GLOB_LIST_PATTERN = re.compile(r"[a-zA-Z0-9_\.\-,\s\*\?\[\]!]*")
+FIELD_MAPPING_ENTRY_PATTERN = re.compile(r"\s*[a-zA-Z0-9_\.\-]+\s*:\s*[a-zA-Z0-9_\.\-]+\s*")
+ARGUMENT_PATTERN = re.compile(
+    r"\s*(?P<name>[a-zA-Z_]\w*)\s*=\s*"
+    r"(?:\"(?P<string>(?:[^\"\\]|\\.)*)\"|(?P<literal>[^\s,()\"]+))\s*"
+)
+GUARD_PATTERN = re.compile(r"(?:if|when)\s+(?P<guard>.+)", re.DOTALL)
+OPTIONAL_PATTERN = re.compile(r"optional\s+")
+
+
+def _convert_literal(value: str) -> Any:
+    if value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    for convert in (int, float):
+        try:
+            return convert(value)
+        except ValueError:
+            pass
+    return value
+
 
 class QueryNormalizer:
     """
@@ -19,27 +44,49 @@ class QueryNormalizer:
             "set": self.set_normalize,
             "parse_win_event_log": self.parse_win_event_log_normalize,
             "extract": self.extract_normalize,
+            "rename_map": self.rename_map_normalize,
+            "keep": self.keep_normalize,
+            "map_fields": self.map_fields_normalize,
+            "filter": self.filter_normalize,
+            "require": self.require_normalize,
+            "sample": self.sample_normalize,
         }
 
     def json_normalize(self, query_part: str) -> dict[str, Any]:
-        # Match parse_json with field parameter and optional in_place parameter
+        # Match parse_json with field parameter and optional boolean parameters
         # Handles: parse_json(field="raw") or
-        # parse_json(field="raw", in_place=True/true/False/false)
+        # parse_json(field="raw", in_place=True/true/False/false, lazy=true)
+        # parse_json(field="raw", recursive=true, max_depth=2, decode_paths="a.b,c")
         # Also handles whitespace: parse_json( field = "raw" , in_place = True )
-        regex = (
-            r"parse_json\s*\("
-            r"\s*field\s*=\s*\"(?P<field>[a-zA-Z0-9_\.\-]*)\""
-            r"(?:\s*,\s*in_place\s*=\s*(?P<in_place>True|False|true|false))?"
-            r"\s*\)"
-        )
-        match = re.search(regex, query_part, re.IGNORECASE)
-        if match:
-            result = {"field": match.group("field")}
-            in_place_str = match.group("in_place")
-            if in_place_str:
-                result["in_place"] = in_place_str.lower() == "true"
-            return {"parse_json": result}
-        return None
+        # Parameter names are case-insensitive, e.g. parse_json(Field="raw", In_Place=true)
+        arguments = self._parse_arguments(query_part, "parse_json")
+        if not arguments:
+            return None
+        arguments = {name.lower(): value for name, value in arguments.items()}
+        if not self._is_field(arguments.get("field")):
+            return None
+
+        result = {"field": arguments.pop("field")}
+        for name in ("in_place", "lazy", "recursive"):
+            if name in arguments:
+                value = arguments.pop(name)
+                if not isinstance(value, bool):
+                    return None
+                result[name] = value
+        if "max_depth" in arguments:
+            max_depth = arguments.pop("max_depth")
+            if not isinstance(max_depth, int) or isinstance(max_depth, bool) or max_depth < 0:
+                return None
+            result["max_depth"] = max_depth
+        if "decode_paths" in arguments:
+            decode_paths = arguments.pop("decode_paths")
+            if not self._is_field_list(decode_paths):
+                return None
+            result["decode_paths"] = decode_paths
+        if arguments:
+            # Unknown parameters
+            return None
+        return {"parse_json": result}
 
     def regex_normalize(self, query_part: str) -> dict[str, Any]:
         # Match regex with pattern and field parameters
@@ -91,10 +138,11 @@ class QueryNormalizer:
         return None
 
     def drop_normalize(self, query_part: str) -> dict[str, Any]:
+        # Handles: drop(fields="a,b.c") or drop(fields="winlog.*.raw,*_tmp")
         # Also handles whitespace around = and parentheses
-        regex = r"drop\s*\(\s*fields\s*=\s*\"(?P<fields>[a-zA-Z0-9_\.\-]*)\"\s*\)"
+        regex = r"drop\s*\(\s*fields\s*=\s*\"(?P<fields>[^\"]*)\"\s*\)"
         match = re.search(regex, query_part)
-        if match:
+        if match and GLOB_LIST_PATTERN.fullmatch(match.group("fields")):
             return {"drop": {"fields": match.group("fields")}}
         return None
 
@@ -146,6 +194,240 @@ class QueryNormalizer:
             return {"extract": {"field": match.group("field")}}
         return None
 
+    def rename_map_normalize(self, query_part: str) -> dict[str, Any]:
+        # Match rename_map with an inline mapping or a mapping file path
+        # Handles: rename_map(mapping="a.b:x, c:y") or
+        # rename_map(path="mappings/ecs.csv", drop_unmapped=true)
+        arguments = self._parse_arguments(query_part, "rename_map")
+        if not arguments:
+            return None
+
+        result = {}
+        if "mapping" in arguments:
+            mapping = arguments.pop("mapping")
+            if not self._is_field_mapping(mapping):
+                return None
+            result["mapping"] = mapping
+        elif "path" in arguments:
+            path = arguments.pop("path")
+            if not isinstance(path, str) or not path:
+                return None
+            result["path"] = path
+        else:
+            return None
+        if "drop_unmapped" in arguments:
+            drop_unmapped = arguments.pop("drop_unmapped")
+            if not isinstance(drop_unmapped, bool):
+                return None
+            result["drop_unmapped"] = drop_unmapped
+        if arguments:
+            # Unknown parameters or both mapping and path
+            return None
+        return {"rename_map": result}
+
+    def keep_normalize(self, query_part: str) -> dict[str, Any]:
+        # Match keep with fields parameter, segments may be glob patterns
+        # Handles: keep(fields="user.name,event.*,*_id")
+        # Also handles whitespace around = and parentheses
+        regex = r"keep\s*\(\s*fields\s*=\s*\"(?P<fields>[^\"]*)\"\s*\)"
+        match = re.search(regex, query_part)
+        if match and GLOB_LIST_PATTERN.fullmatch(match.group("fields")):
+            return {"keep": {"fields": match.group("fields")}}
+        return None
+
+    def map_fields_normalize(self, query_part: str) -> dict[str, Any]:
+        # Match map_fields with a mapping table and a discriminator
+        # Handles: map_fields(table="mappings/sysmon.csv", key_field="EventID") or
+        # map_fields(table="mappings/aws.csv", key="cloudtrail", drop_unmapped=true)
+        arguments = self._parse_arguments(query_part, "map_fields")
+        if not arguments:
+            return None
+
+        table = arguments.pop("table", None)
+        if not isinstance(table, str) or not table:
+            return None
+        result: dict[str, Any] = {"table": table}
+        if "key_field" in arguments:
+            key_field = arguments.pop("key_field")
+            if not self._is_field(key_field) or not key_field:
+                return None
+            result["key_field"] = key_field
+        elif "key" in arguments:
+            result["key"] = str(arguments.pop("key"))
+        else:
+            return None
+        if "drop_unmapped" in arguments:
+            drop_unmapped = arguments.pop("drop_unmapped")
+            if not isinstance(drop_unmapped, bool):
+                return None
+            result["drop_unmapped"] = drop_unmapped
+        if arguments:
+            # Unknown parameters or both key_field and key
+            return None
+        return {"map_fields": result}
+
+    def filter_normalize(self, query_part: str) -> dict[str, Any]:
+        # Match filter with a field and exactly one condition
+        # Handles: filter(field="EventID", equals=4688), filter(field="level", in="info,warn")
+        # or filter(field="url", startswith="/health", exclude=true)
+        # in is stored as values, since it is a keyword in Python
+        arguments = self._parse_arguments(query_part, "filter")
+        if not arguments or not self._is_field(arguments.get("field")):
+            return None
+
+        result: dict[str, Any] = {"field": arguments.pop("field")}
+        conditions = [name for name in ("equals", "in", "startswith") if name in arguments]
+        if len(conditions) != 1:
+            return None
+        condition = conditions[0]
+        value = arguments.pop(condition)
+        if condition == "in":
+            result["values"] = str(value)
+        elif condition == "startswith":
+            if not isinstance(value, str):
+                return None
+            result["startswith"] = value
+        else:
+            result["equals"] = value
+        if "exclude" in arguments:
+            exclude = arguments.pop("exclude")
+            if not isinstance(exclude, bool):
+                return None
+            result["exclude"] = exclude
+        if arguments:
+            # Unknown parameters
+            return None
+        return {"filter": result}
+
+    def require_normalize(self, query_part: str) -> dict[str, Any]:
+        # Match require with fields parameter
+        # Handles: require(fields="user.name,host.name")
+        arguments = self._parse_arguments(query_part, "require")
+        if not arguments or set(arguments) != {"fields"}:
+            return None
+        fields = arguments["fields"]
+        if not self._is_field_list(fields) or not fields.strip():
+            return None
+        return {"require": {"fields": fields}}
+
+    def sample_normalize(self, query_part: str) -> dict[str, Any]:
+        # Match sample with rate and key parameters in any order
+        # Handles: sample(rate=0.1, key="host.name")
+        arguments = self._parse_arguments(query_part, "sample")
+        if not arguments or set(arguments) != {"rate", "key"}:
+            return None
+        rate, key = arguments["rate"], arguments["key"]
+        if isinstance(rate, bool) or not isinstance(rate, (int, float)) or not 0 <= rate <= 1:
+            return None
+        if not self._is_field(key) or not key:
+            return None
+        return {"sample": {"rate": rate, "key": key}}
+
+    @staticmethod
+    def _is_field(value: Any) -> bool:
+        return isinstance(value, str) and FIELD_PATTERN.fullmatch(value) is not None
+
+    @staticmethod
+    def _is_field_list(value: Any) -> bool:
+        return isinstance(value, str) and FIELD_LIST_PATTERN.fullmatch(value) is not None
+
+    @staticmethod
+    def _is_field_mapping(value: Any) -> bool:
+        if not isinstance(value, str):
+            return False
+        entries = [entry for entry in value.split(",") if entry.strip()]
+        return bool(entries) and all(map(FIELD_MAPPING_ENTRY_PATTERN.fullmatch, entries))
+
+    @staticmethod
+    def _parse_arguments(query_part: str, function_name: str) -> dict[str, Any] | None:
+        """
+        Parse keyword arguments of a function call in any order.
+
+        String values are double-quoted and kept verbatim (escape sequences are not
+        processed). Unquoted values are converted to bool (case-insensitive true/false),
+        int or float, otherwise kept as strings.
+
+        Args:
+            query_part: Query part starting with the function call
+            function_name: Name of the called function
+
+        Returns:
+            Dictionary of arguments, or None if the call is malformed
+        """
+        match = re.match(rf"{function_name}\s*\(\s*", query_part)
+        if not match:
+            return None
+
+        arguments: dict[str, Any] = {}
+        position = match.end()
+        if query_part.startswith(")", position):
+            return arguments
+
+        while True:
+            match = ARGUMENT_PATTERN.match(query_part, position)
+            if not match:
+                return None
+            if match.group("string") is not None:
+                arguments[match.group("name")] = match.group("string")
+            else:
+                arguments[match.group("name")] = _convert_literal(match.group("literal"))
+            position = match.end()
+            if query_part.startswith(",", position):
+                position += 1
+            elif query_part.startswith(")", position):
+                return arguments
+            else:
+                return None
+
+    def guard_normalize(self, guard_part: str) -> dict[str, Any] | None:
+        # Handles: exists(field="x"), startswith(field="message", value="<")
+        # or equals(field="EventID", value=4688)
+        for guard_type in GUARD_TYPES:
+            if not guard_part.startswith(guard_type):
+                continue
+            arguments = self._parse_arguments(guard_part, guard_type)
+            if not arguments or not self._is_field(arguments.get("field")):
+                return None
+            if set(arguments) != ({"field"} if guard_type == "exists" else {"field", "value"}):
+                return None
+            return {"type": guard_type, **arguments}
+        return None
+
+    @staticmethod
+    def _split_guard(query_part: str) -> tuple[str, str | None]:
+        """
+        Split a query part into the function call and the guard after ``if`` or ``when``.
+
+        The end of the call is found by matching parentheses outside string literals,
+        so ``if`` inside an argument is not taken for a guard. Other text after the call
+        is not a guard and is left in the query part.
+
+        Returns:
+            The function call and the guard call, or None if there is no guard
+        """
+        depth = 0
+        inside_string = False
+        escape_next = False
+        for i, char in enumerate(query_part):
+            if escape_next:
+                escape_next = False
+            elif char == "\\":
+                escape_next = True
+            elif char == '"':
+                inside_string = not inside_string
+            elif inside_string:
+                continue
+            elif char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+                if depth == 0:
+                    match = GUARD_PATTERN.fullmatch(query_part[i + 1 :].strip())
+                    if not match:
+                        break
+                    return query_part[: i + 1], match.group("guard").strip()
+        return query_part, None
+
     def normalize_query_part(self, query_part: str) -> tuple[str, dict[str, Any] | None]:
         for function_name, normalize_function in self.normalize_functions.items():
             if query_part.startswith(function_name):
@@ -158,18 +440,49 @@ class QueryNormalizer:
                     return function_name, None
         return None, None
 
-    def parse_query(self, parser_query: str):
+    def parse_query(self, parser_query: str, version: int = 1):
+        """
+        Parse a query string into a parser configuration.
+
+        Args:
+            parser_query: Query string with function calls separated by pipes
+            version: Configuration version to produce. Version 1 keys arguments by
+                function name, so a query that repeats a function with different
+                arguments, guards or optional markers is returned as version 2.
+                Version 2 stores the arguments with every step.
+
+        A function call may be followed by a guard after ``if`` or ``when``, e.g.
+        ``regex(...) if startswith(field="message", value="<")`` (see
+        ``schema_parser.guards``). A function call prefixed with ``optional`` is an
+        optional step, e.g. ``optional parse_json(field="raw", recursive=true)``.
+
+        Returns:
+            Parser configuration
+
+        Raises:
+            ValueError: If a guard after ``if`` or ``when`` is invalid
+        """
         parser_query = self._strip_comments(parser_query)
-        normalized_query: dict[str, Any] = {"steps": [], "args": {}}
+        steps: list[PipelineStep] = []
         for query_part in parser_query.split("|"):
             query_part = query_part.strip()
             if not query_part:
                 continue
+            optional = OPTIONAL_PATTERN.match(query_part)
+            if optional:
+                query_part = query_part[optional.end() :]
+            query_part, guard_part = self._split_guard(query_part)
+            guard = None
+            if guard_part is not None:
+                guard = self.guard_normalize(guard_part)
+                if guard is None:
+                    raise ValueError(f"Invalid guard in query part: {query_part} {guard_part}")
             function_name, result = self.normalize_query_part(query_part)
             if result:
-                normalized_query["steps"].append(function_name)
-                normalized_query["args"].update(result)
-        return normalized_query
+                steps.append(
+                    PipelineStep(function_name, result[function_name], guard, bool(optional))
+                )
+        return dump_steps(steps, version=version)
 
     @staticmethod
     def _strip_comments(query: str) -> str:
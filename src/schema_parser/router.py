@@ -0,0 +1,89 @@
+"""
+Routing of events to parser configurations.
+
+A routed configuration picks exactly one parser configuration per event by a
+discriminator, instead of trying configurations one by one::
+
+    {
+        "router": {"field": "EventID"},
+        "routes": {"4688": {...}, "4624": {...}},
+        "default": {...},
+    }
+
+With ``"match": "exact"`` (the default) the discriminator value is looked up in
+``routes`` as a string. With ``"match": "prefix"`` the longest route key the value
+starts with is used, e.g. to route raw lines by their first characters.
+"""
+
+from typing import Any
+
+from schema_parser.core.utils import get_value
+
+MATCH_TYPES = ("exact", "prefix")
+
+
+class Router:
+    """
+    Compiled routed configuration.
+
+    Args:
+        field: Field holding the discriminator value
+        routes: Mapping of discriminator values to parser configurations
+        default: Parser configuration for events without a matching route
+        match: ``exact`` or ``prefix``
+
+    Raises:
+        ValueError: If the match type is not supported
+    """
+
+    __slots__ = ("field", "routes", "default", "match", "_prefix_lengths")
+
+    def __init__(
+        self,
+        field: str,
+        routes: dict[str, dict],
+        default: dict | None = None,
+        match: str = "exact",
+    ):
+        if match not in MATCH_TYPES:
+            raise ValueError(f"Unsupported match type {match}, expected one of {MATCH_TYPES}")
+        self.field = field
+        self.routes = {str(key): parser_config for key, parser_config in routes.items()}
+        self.default = default
+        self.match = match
+        # Longest prefixes are tried first, one dictionary lookup per distinct length
+        self._prefix_lengths = sorted({len(key) for key in self.routes}, reverse=True)
+
+    @classmethod
+    def from_config(cls, routed_config: dict[str, Any]) -> "Router":
+        """Compiles a routed configuration (see the module docstring)."""
+        router = routed_config["router"]
+        return cls(
+            field=router["field"],
+            routes=routed_config.get("routes", {}),
+            default=routed_config.get("default"),
+            match=router.get("match", "exact"),
+        )
+
+    def route(self, event: dict[str, Any]) -> dict | None:
+        """
+        Returns the parser configuration for an event.
+
+        Returns:
+            The configuration of the matching route, the default configuration, or
+            None if there is neither
+        """
+        value = get_value(event, self.field)
+        if value is None or isinstance(value, (dict, list)):
+            return self.default
+        value = value if isinstance(value, str) else str(value)
+
+        if self.match == "exact":
+            return self.routes.get(value, self.default)
+
+        for length in self._prefix_lengths:
+            if length <= len(value):
+                parser_config = self.routes.get(value[:length])
+                if parser_config is not None:
+                    return parser_config
+        return self.default
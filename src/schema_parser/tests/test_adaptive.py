@@ -0,0 +1,87 @@
+import pytest
+
+from schema_parser import adaptive
+from schema_parser.adaptive import AdaptiveExecutor
+from schema_parser.manager import ParserManager
+
+QUERY = (
+    'parse_json(field="message", in_place=true) '
+    '| optional set(field="enriched", value="yes") '
+    '| filter(field="message.level", equals="debug", exclude=true)'
+)
+
+
+def _event(level="info"):
+    return {"message": '{"level": "%s"}' % level}
+
+
+@pytest.fixture
+def parser_config():
+    return ParserManager().query_parser(QUERY, version=2)
+
+
+def test_skip_optional(parser_config):
+    """Test that configured_parser skips optional steps on request"""
+    manager = ParserManager()
+
+    assert manager.configured_parser(_event(), parser_config) == {
+        "message": {"level": "info"},
+        "enriched": "yes",
+    }
+    assert manager.configured_parser(_event(), parser_config, skip_optional=True) == {
+        "message": {"level": "info"}
+    }
+
+
+def test_queue_depth_with_hysteresis(parser_config):
+    """Test that degraded mode starts above the threshold and ends at the resume depth"""
+    executor = AdaptiveExecutor(parser_config, max_queue_depth=100, resume_queue_depth=20)
+
+    depths = [50, 150, 90, 30, 20, 90]
+    results = [executor.parse(_event(), queue_depth=depth) for depth in depths]
+
+    assert ["enriched" in result for result in results] == [True, False, False, False, True, True]
+    assert executor.stats() == {
+        "events": 6,
+        "degraded_events": 3,
+        "mode_changes": 2,
+        "degraded": False,
+        "latency_ms": executor.latency_ms,
+    }
+
+
+def test_latency_threshold(parser_config, monkeypatch):
+    """Test that a high mean latency skips optional steps until it drops"""
+    clock = iter(
+        # start and end of every event: 5 ms, 5 ms, 1 ms, 0 ms, 0 ms, 0 ms
+        [0, 5_000_000, 0, 5_000_000, 0, 1_000_000, 0, 0, 0, 0, 0, 0]
+    )
+    monkeypatch.setattr(adaptive, "perf_counter_ns", lambda: next(clock))
+    executor = AdaptiveExecutor(parser_config, max_latency_ms=2, latency_window=2)
+
+    results = [executor.parse(_event()) for _ in range(6)]
+
+    # Mean latency before every event: 0, 5, 5, 3, 0.5, 0
+    assert ["enriched" in result for result in results] == [True, False, False, False, True, True]
+    assert executor.degraded_events == 3
+
+
+def test_process_uses_remaining_events_as_queue_depth(parser_config):
+    """Test that a batch runs degraded while many events are left"""
+    executor = AdaptiveExecutor(parser_config, max_queue_depth=3, resume_queue_depth=1)
+    events = [_event() for _ in range(6)] + [_event("debug")]
+
+    results = executor.process(events)
+
+    assert len(results) == 6
+    # 6 events are left when the first one is parsed, 1 when the sixth one is parsed
+    assert ["enriched" in result for result in results] == [False] * 5 + [True]
+    assert executor.stats()["degraded_events"] == 5
+
+
+def test_invalid_thresholds(parser_config):
+    """Test that missing or inverted thresholds raise errors"""
+    with pytest.raises(ValueError):
+        AdaptiveExecutor(parser_config)
+    with pytest.raises(ValueError):
+        AdaptiveExecutor(parser_config, max_queue_depth=10, resume_queue_depth=20)
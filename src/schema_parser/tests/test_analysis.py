@@ -0,0 +1,183 @@
+import orjson
+
+from schema_parser.analysis import push_down_projection, required_paths
+from schema_parser.manager import ParserManager
+
+CLOUDTRAIL_EVENT = {
+    "message": orjson.dumps(
+        {
+            "eventName": "AssumeRole",
+            "userIdentity": {"type": "AWSService", "invokedBy": "ec2.amazonaws.com"},
+            "requestParameters": {"roleArn": "arn:aws:iam::1:role/x", "policy": "p" * 100},
+            "responseElements": {"credentials": {"accessKeyId": "AKIA", "sessionToken": "t"}},
+            "resources": [{"ARN": "arn:aws:iam::1:role/x"}],
+        }
+    ).decode(),
+    "host": {"name": "collector"},
+}
+
+
+def _project(result: dict, fields: list[str]) -> dict:
+    return {field: result.get(field) for field in fields}
+
+
+def _assert_same_output(query: str, output_fields: list[str], event: dict) -> dict:
+    manager = ParserManager()
+    parser_config = manager.query_parser(query)
+    projected_config = push_down_projection(parser_config, output_fields)
+
+    for options in ({"flatten": True}, {"flat_native": True}):
+        expected = manager.configured_parser(event, parser_config, **options)
+        result = manager.configured_parser(event, projected_config, **options)
+
+        assert _project(result, output_fields) == _project(expected, output_fields)
+    return projected_config
+
+
+def test_push_down_projection_in_place():
+    """Test that parse_json only keeps the paths read by the following steps"""
+    query = (
+        'parse_json(field="message", in_place=True)'
+        ' | rename(from="message.userIdentity.invokedBy", to="source.service")'
+        ' | set(field="event.kind", value="event")'
+    )
+    output_fields = ["message.eventName", "source.service", "event.kind", "host.name"]
+
+    config = _assert_same_output(query, output_fields, CLOUDTRAIL_EVENT)
+
+    assert config["args"]["parse_json"]["paths"] == "eventName,userIdentity.invokedBy"
+
+
+def test_push_down_projection_not_in_place():
+    """Test that parse_json without in_place is projected on the output fields"""
+    query = 'parse_json(field="message") | extract(field="userIdentity")'
+    output_fields = ["type", "eventName"]
+
+    config = _assert_same_output(query, output_fields, CLOUDTRAIL_EVENT)
+
+    assert config["args"]["parse_json"]["paths"] == (
+        "eventName,type,userIdentity.eventName,userIdentity.type"
+    )
+
+
+def test_push_down_projection_keeps_rename_source_shape():
+    """Test that a renamed subtree that is not consumed still exists after projection"""
+    query = (
+        'parse_json(field="message", in_place=True)'
+        ' | rename(from="message.responseElements", to="tmp")'
+    )
+    output_fields = ["message.eventName"]
+
+    config = _assert_same_output(query, output_fields, CLOUDTRAIL_EVENT)
+
+    assert config["args"]["parse_json"]["paths"] == "eventName,responseElements"
+
+
+def test_push_down_projection_keeps_shape_only_field_present():
+    """Test that a parsed field whose values are not consumed is not projected to empty"""
+    query = 'parse_json(field="msg", in_place=true) | rename(from="msg", to="m")'
+    event = {"msg": '{"a": 1, "b": {"c": 2}}', "other": 1}
+
+    config = _assert_same_output(query, ["other"], event)
+
+    assert config["args"]["parse_json"]["paths"] == ""
+
+
+def test_push_down_projection_skipped_when_whole_field_is_consumed():
+    """Test that no projection is pushed when the whole parsed field is consumed"""
+    query = 'parse_json(field="message", in_place=True) | drop(fields="host")'
+    output_fields = ["message"]
+
+    config = _assert_same_output(query, output_fields, CLOUDTRAIL_EVENT)
+
+    assert "paths" not in config["args"]["parse_json"]
+
+
+def test_push_down_projection_with_unconsumed_parse():
+    """Test that parsed JSON that is never consumed is projected to nothing"""
+    query = 'parse_json(field="message", in_place=True)'
+
+    config = _assert_same_output(query, ["host.name"], CLOUDTRAIL_EVENT)
+
+    assert config["args"]["parse_json"]["paths"] == ""
+
+
+def test_required_paths():
+    """Test the input paths read by a pipeline"""
+    manager = ParserManager()
+    parser_config = manager.query_parser(
+        'extract(field="winlog.event_data")'
+        ' | rename(from="Image", to="process.executable")'
+        ' | drop(fields="winlog")'
+    )
+
+    paths = required_paths(parser_config, ["process.executable", "host.name"])
+
+    assert paths == [
+        "Image",
+        "host.name",
+        "winlog.event_data.Image",
+        "winlog.event_data.host.name",
+    ]
+    assert required_paths(parser_config) == [""]
+
+
+def test_query_parser_with_output_fields():
+    """Test that query_parser pushes projections when output fields are given"""
+    manager = ParserManager()
+    query = 'parse_json(field="message", in_place=True)'
+
+    parser_config = manager.query_parser(query, output_fields=["message.eventName"])
+    result = manager.configured_parser(CLOUDTRAIL_EVENT, parser_config)
+
+    assert result["message"] == {"eventName": "AssumeRole"}
+    assert result["host"] == {"name": "collector"}
+
+
+def test_push_down_projection_version_2():
+    """Test that every parse_json step of a version 2 configuration gets its own projection"""
+    manager = ParserManager()
+    event = {"a": '{"x": 1, "y": 2}', "b": '{"x": 3, "y": 4}'}
+    parser_config = manager.query_parser(
+        'parse_json(field="a", in_place=True) | parse_json(field="b", in_place=True)',
+        version=2,
+    )
+
+    projected = push_down_projection(parser_config, ["a.x", "b.y"])
+    result = manager.configured_parser(event, projected)
+
+    assert [step["args"]["paths"] for step in projected["steps"]] == ["x", "y"]
+    assert result == {"a": {"x": 1}, "b": {"y": 4}}
+
+
+def test_required_paths_with_keep():
+    """Test that keep limits the input paths to the kept fields"""
+    manager = ParserManager()
+    parser_config = manager.query_parser(
+        'parse_json(field="message", in_place=True) | keep(fields="message.eventName,host.*")'
+    )
+
+    assert required_paths(parser_config) == ["host", "message"]
+
+    projected_config = _assert_same_output(
+        'parse_json(field="message", in_place=True) | keep(fields="message.eventName,host.*")',
+        ["message.eventName", "host.name"],
+        CLOUDTRAIL_EVENT,
+    )
+    assert projected_config["args"]["parse_json"]["paths"] == "eventName"
+
+
+def test_push_down_projection_keeps_paths_live_across_missing_field():
+    """Test that paths after a parse_json of a missing field stay live before it"""
+    manager = ParserManager()
+    event = {"raw": '{"x":1,"y":2}'}
+    parser_config = manager.query_parser(
+        'parse_json(field="raw", in_place=True) | parse_json(field="raw.inner")', version=2
+    )
+
+    projected = push_down_projection(parser_config, ["raw.x"])
+    expected = manager.configured_parser(event, parser_config, flatten=True)
+    result = manager.configured_parser(event, projected, flatten=True)
+
+    assert result["raw.x"] == expected["raw.x"] == 1
+    assert [step["args"]["paths"] for step in projected["steps"]] == ["inner,x", "raw.x"]
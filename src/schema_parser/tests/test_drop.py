@@ -85,3 +85,44 @@ def test_drop_multiple_with_nested_paths():
     assert "name" not in result["user"]
     assert result["user"]["age"] == 30
     assert result["other"] == "preserved"
+
+
+def test_drop_glob_patterns():
+    """Test dropping fields matched by glob segments"""
+    function = DropFunction()
+    data = {
+        "winlog": {"a": {"raw": "1", "x": 2}, "b": {"raw": "3"}, "c": "str"},
+        "user_tmp": 1,
+        "event_tmp": 2,
+        "other": 3,
+    }
+    result = function.execute(data=data, fields="winlog.*.raw, *_tmp")
+
+    assert result == {"winlog": {"a": {"x": 2}, "b": {}, "c": "str"}, "other": 3}
+
+
+def test_drop_glob_patterns_with_exact_fields():
+    """Test mixing exact fields and glob patterns"""
+    function = DropFunction()
+    data = {"a.b": 1, "a": {"b": 2, "c": 3}, "x1": 1, "x2": 2, "y": 3}
+    result = function.execute(data=data, fields="a.b,x?")
+
+    assert result == {"a": {"b": 2, "c": 3}, "y": 3}
+
+
+def test_drop_glob_patterns_flat():
+    """Test dropping glob patterns from flat data"""
+    function = DropFunction()
+    data = {"winlog.a.raw": "1", "winlog.a.x": 2, "winlog.b.raw.y": 3, "user_tmp": 1}
+    result = function.execute_flat(data=data, fields="winlog.*.raw,*_tmp")
+
+    assert result == {"winlog.a.x": 2}
+
+
+def test_drop_canonical_single_walk():
+    """Test that drop without literal key checks removes exact and glob paths"""
+    function = DropFunction(literal_keys=False)
+    data = {"a": {"b": 1, "c": 2}, "x_tmp": 1, "d": "str"}
+    result = function.execute(data=data, fields="a.b, *_tmp, d.e")
+
+    assert result == {"a": {"c": 2}, "d": "str"}
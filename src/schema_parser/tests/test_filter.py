@@ -0,0 +1,114 @@
+import pickle
+
+import pytest
+
+from schema_parser.core.outcomes import FILTERED
+from schema_parser.functions.filter import FilterFunction, compile_condition
+from schema_parser.functions.require import RequireFunction
+
+
+def test_filter_equals():
+    """Test that filter keeps events whose field equals the value"""
+    function = FilterFunction()
+    data = {"event": {"id": 4688}}
+
+    assert function.execute(data=data, field="event.id", equals="4688") is data
+    assert function.execute(data=data, field="event.id", equals=4624) is FILTERED
+    assert function.execute(data=data, field="missing", equals="4688") is FILTERED
+
+
+def test_filter_in():
+    """Test that filter keeps events whose field is one of the values"""
+    function = FilterFunction()
+
+    assert function.execute(data={"level": "warn"}, field="level", values="info, warn") == {
+        "level": "warn"
+    }
+    assert function.execute(data={"level": "debug"}, field="level", values="info,warn") is FILTERED
+    assert function.execute(data={"level": ["warn"]}, field="level", values="warn") is FILTERED
+
+
+def test_filter_startswith_with_exclude():
+    """Test that exclude filters out the matching events"""
+    function = FilterFunction()
+
+    assert (
+        function.execute(
+            data={"url": "/health/live"}, field="url", startswith="/health", exclude=True
+        )
+        is FILTERED
+    )
+    assert function.execute(
+        data={"url": "/api"}, field="url", startswith="/health", exclude=True
+    ) == {"url": "/api"}
+    assert function.execute(data={}, field="url", startswith="/health", exclude=True) == {}
+
+
+def test_filter_literal_dotted_key():
+    """Test that filter reads literal dotted keys"""
+    function = FilterFunction()
+
+    assert function.execute(data={"event.id": "1"}, field="event.id", equals="1") == {
+        "event.id": "1"
+    }
+
+
+def test_filter_flat():
+    """Test filter on flat data"""
+    function = FilterFunction()
+    data = {"event.id": 1, "event.type": "x"}
+
+    assert function.execute_flat(data=data, field="event.id", equals=1) is data
+    assert function.execute_flat(data=data, field="event.type", values="y,z") is FILTERED
+
+
+def test_filter_equals_unhashable_value():
+    """Test that filter compares list values without caching the condition"""
+    function = FilterFunction()
+    data = {"tags": ["a", "b"]}
+
+    assert function.execute(data=data, field="tags", equals=["a", "b"]) is data
+    assert function.execute(data=data, field="tags", equals=["a"]) is FILTERED
+
+
+def test_filter_conditions_are_cached_by_value_type():
+    """Test that equal values of different types do not share a cached condition"""
+    assert compile_condition(equals=1) is not compile_condition(equals=True)
+    assert compile_condition(equals=True)("True")
+    assert not compile_condition(equals=True)("1")
+    assert compile_condition(equals=1)("1")
+    assert compile_condition(equals=1.0)("1.0")
+
+
+def test_filter_requires_one_condition():
+    """Test that filter without or with several conditions raises an error"""
+    function = FilterFunction()
+
+    with pytest.raises(ValueError):
+        function.execute(data={"a": 1}, field="a")
+    with pytest.raises(ValueError):
+        function.execute(data={"a": 1}, field="a", equals=1, startswith="1")
+
+
+def test_require():
+    """Test that require filters out events with missing or None fields"""
+    function = RequireFunction()
+    data = {"user": {"name": "John"}, "host": None}
+
+    assert function.execute(data=data, fields="user.name") is data
+    assert function.execute(data=data, fields="user.name, host") is FILTERED
+    assert function.execute(data=data, fields="user.id") is FILTERED
+
+
+def test_require_flat():
+    """Test require on flat data"""
+    function = RequireFunction()
+    data = {"user.name": "John"}
+
+    assert function.execute_flat(data=data, fields="user,user.name") is data
+    assert function.execute_flat(data=data, fields="host.name") is FILTERED
+
+
+def test_filtered_survives_pickling():
+    """Test that FILTERED keeps its identity across processes"""
+    assert pickle.loads(pickle.dumps(FILTERED)) is FILTERED
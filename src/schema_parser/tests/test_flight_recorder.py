@@ -0,0 +1,99 @@
+import orjson
+import pytest
+
+from schema_parser import flight_recorder
+from schema_parser.instrumentation import PipelineRun
+from schema_parser.manager import ParserManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(flight_recorder.time, "monotonic", clock)
+    return clock
+
+
+def _run(recorder, elapsed, name="tenant_a", steps=((0, "parse_json", 10),)):
+    run = PipelineRun((recorder,), name, {"message": "x" * elapsed})
+    run.records = [(index, function, ns, 1, 1, None) for index, function, ns in steps]
+    recorder.merge(run, elapsed, {}, None)
+
+
+def test_keeps_slowest_events_per_pipeline(clock):
+    """Test that only the N slowest events of every pipeline are kept, slowest first"""
+    recorder = flight_recorder.FlightRecorder(capacity=2)
+    for elapsed in (5, 50, 20, 1, 30):
+        _run(recorder, elapsed)
+    _run(recorder, 3, name="tenant_b")
+
+    current = recorder.snapshot()["current"]
+    assert [entry["elapsed_ns"] for entry in current["tenant_a"]] == [50, 30]
+    assert [entry["elapsed_ns"] for entry in current["tenant_b"]] == [3]
+
+
+def test_entry_has_truncated_input_and_dominant_step(clock):
+    """Test the per-step breakdown, the dominating step and the truncated input"""
+    recorder = flight_recorder.FlightRecorder(max_input_chars=20)
+    _run(recorder, 100, steps=((0, "keep", 5), (1, "regex", 90), (2, "set", 1)))
+
+    entry = recorder.snapshot()["current"]["tenant_a"][0]
+    assert entry["dominant_step"] == "1:regex"
+    assert [step["step"] for step in entry["steps"]] == ["0:keep", "1:regex", "2:set"]
+    assert entry["outcome"] == "ok"
+    assert entry["input"].startswith('{"message":"xxxxxxxx')
+    assert entry["input"].endswith("... (114 chars)")
+
+
+def test_windows(clock):
+    """Test that a finished window becomes the previous one and old windows are dropped"""
+    recorder = flight_recorder.FlightRecorder(window_seconds=60)
+    _run(recorder, 10)
+    clock.now += 61
+    _run(recorder, 20)
+
+    snapshot = recorder.snapshot()
+    assert [entry["elapsed_ns"] for entry in snapshot["previous"]["tenant_a"]] == [10]
+    assert [entry["elapsed_ns"] for entry in snapshot["current"]["tenant_a"]] == [20]
+
+    clock.now += 200
+    assert recorder.snapshot()["previous"] == {}
+    assert recorder.snapshot()["current"] == {}
+
+
+def test_records_configured_parser_events(tmp_path):
+    """Test recording through configured_parser and export to a JSON file"""
+    manager = ParserManager()
+    recorder = manager.enable_flight_recorder(capacity=5)
+    parser_config = {
+        **manager.query_parser('parse_json(field="message", in_place=true)', version=2),
+        "name": "json",
+    }
+    manager.configured_parser({"message": '{"a": 1}'}, parser_config)
+    manager.configured_parser({"message": "{invalid"}, parser_config, suppress_errors=True)
+
+    path = tmp_path / "slow.json"
+    recorder.export(path)
+
+    exported = orjson.loads(path.read_bytes())
+    entries = exported["current"]["json"]
+    assert len(entries) == 2
+    assert {entry["outcome"] for entry in entries} == {"ok", "error: ParseJsonFunctionError"}
+    assert all(entry["dominant_step"] == "0:parse_json" for entry in entries)
+    assert manager.instrumentation is None
+
+    manager.disable_flight_recorder()
+    assert manager.run_observers == ()
+
+
+def test_invalid_capacity():
+    """Test that a capacity below 1 raises an error"""
+    with pytest.raises(ValueError):
+        flight_recorder.FlightRecorder(capacity=0)
@@ -0,0 +1,185 @@
+import orjson
+import pytest
+
+from schema_parser.analysis import required_paths
+from schema_parser.guards import Guard, _compile, compile_guard, field_getter
+from schema_parser.manager import ParserManager
+from schema_parser.multi_pipeline import MultiPipelineExecutor
+from schema_parser.optimizer import PipelineOptimizer
+
+QUERY = (
+    'parse_json(field="message", in_place=true) if startswith(field="message", value="{") '
+    '| set(field="type", value="logon") when equals(field="message.EventID", value="4624") '
+    '| drop(fields="tmp") when exists(field="tmp")'
+)
+
+EVENTS = [
+    {"message": orjson.dumps({"EventID": 4624, "user": "john"}).decode(), "tmp": 1},
+    {"message": orjson.dumps({"EventID": 4688}).decode()},
+    {"message": "<13>plain syslog line", "tmp": None},
+    {"other": 1},
+]
+
+
+class TestGuard:
+    """Tests for compiled guards"""
+
+    def test_exists(self):
+        """Test that exists matches present values that are not None"""
+        guard = Guard("exists", "a.b")
+        getter = field_getter(flat_native=False, literal_keys=True)
+
+        assert guard.matches({"a": {"b": 0}}, getter)
+        assert guard.matches({"a.b": ""}, getter)
+        assert not guard.matches({"a": {"b": None}}, getter)
+        assert not guard.matches({"a": 1}, getter)
+
+    def test_startswith(self):
+        """Test that startswith only matches strings"""
+        guard = Guard("startswith", "message", "<")
+        getter = field_getter(flat_native=False, literal_keys=True)
+
+        assert guard.matches({"message": "<13>line"}, getter)
+        assert not guard.matches({"message": "line"}, getter)
+        assert not guard.matches({"message": ["<"]}, getter)
+        assert not guard.matches({}, getter)
+
+    def test_equals_compares_numbers_as_strings(self):
+        """Test that equals matches numbers by their string form"""
+        guard = Guard("equals", "EventID", "4688")
+        getter = field_getter(flat_native=True, literal_keys=True)
+
+        assert guard.matches({"EventID": 4688}, getter)
+        assert guard.matches({"EventID": "4688"}, getter)
+        assert not guard.matches({"EventID": 4624}, getter)
+
+    def test_equals_compares_number_value_with_strings(self):
+        """Test that a number value from a query matches the same number as a string"""
+        manager = ParserManager()
+        parser_config = manager.query_parser(
+            'set(field="type", value="process") when equals(field="EventID", value=4688)'
+        )
+
+        assert manager.configured_parser({"EventID": "4688"}, parser_config)["type"] == "process"
+        assert "type" not in manager.configured_parser({"EventID": "4624"}, parser_config)
+
+    def test_compile_guard_with_unhashable_value(self):
+        """Test that guards with list values are compiled without the cache"""
+        guard = compile_guard({"type": "equals", "field": "tags", "value": ["a", "b"]})
+        getter = field_getter(flat_native=False, literal_keys=True)
+
+        assert guard.matches({"tags": ["a", "b"]}, getter)
+        assert not guard.matches({"tags": ["a"]}, getter)
+
+    def test_compile_guard_distinguishes_value_types(self):
+        """Test that equal values of different types do not share a cached guard"""
+        getter = field_getter(flat_native=False, literal_keys=True)
+        for first, second in ((1.0, 1), (1, 1.0), (True, 1), (1, True)):
+            _compile.cache_clear()
+            for value in (first, second):
+                guard = compile_guard({"type": "equals", "field": "a", "value": value})
+
+                assert type(guard.value) is type(value)
+                assert guard.matches({"a": str(value)}, getter)
+
+    def test_invalid_guards(self):
+        """Test that unsupported types and missing values raise errors"""
+        with pytest.raises(ValueError):
+            Guard("matches", "a", "b")
+        with pytest.raises(ValueError):
+            Guard("equals", "a")
+
+    def test_compile_guard_is_cached(self):
+        """Test that the same guard is compiled once"""
+        guard = {"type": "startswith", "field": "message", "value": "<"}
+
+        assert compile_guard(guard) is compile_guard(dict(guard))
+        assert compile_guard(guard).to_dict() == guard
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"flatten": True}, {"flat_native": True}, {"normalize_keys": True}],
+)
+def test_guarded_steps_are_skipped(options):
+    """Test that steps run only on events their guards match"""
+    manager = ParserManager()
+    parser_config = manager.query_parser(QUERY, version=2)
+
+    results = [manager.configured_parser(event, parser_config, **options) for event in EVENTS]
+
+    flat = options.get("flatten") or options.get("flat_native")
+    assert results[0] == (
+        {"message.EventID": 4624, "message.user": "john", "type": "logon"}
+        if flat
+        else {"message": {"EventID": 4624, "user": "john"}, "type": "logon"}
+    )
+    assert results[1] == ({"message.EventID": 4688} if flat else {"message": {"EventID": 4688}})
+    assert results[2] == {"message": "<13>plain syslog line", "tmp": None}
+    assert results[3] == {"other": 1}
+
+
+def test_guard_avoids_errors():
+    """Test that a guarded step does not fail on events it does not apply to"""
+    manager = ParserManager()
+    parser_config = manager.query_parser(
+        'parse_json(field="message") if startswith(field="message", value="{")'
+    )
+
+    assert manager.configured_parser({"message": "<13>line"}, parser_config) == {
+        "message": "<13>line"
+    }
+
+
+def test_guarded_leading_keep_runs_on_copy():
+    """Test that a guarded leading keep is skipped without touching the event"""
+    manager = ParserManager()
+    parser_config = manager.query_parser(
+        'keep(fields="a") if exists(field="b") | set(field="c", value="d")'
+    )
+    event = {"a": {"x": 1}, "e": 2}
+
+    assert manager.configured_parser(event, parser_config) == {"a": {"x": 1}, "e": 2, "c": "d"}
+    assert event == {"a": {"x": 1}, "e": 2}
+
+
+def test_multi_pipeline_executor_checks_guards():
+    """Test that the multi-pipeline executor skips guarded steps like configured_parser"""
+    manager = ParserManager()
+    pipelines = {
+        "guarded": manager.query_parser(QUERY, version=2),
+        "unguarded": manager.query_parser(
+            'parse_json(field="message", in_place=true) | set(field="type", value="logon")',
+            version=2,
+        ),
+    }
+    executor = MultiPipelineExecutor(pipelines)
+
+    for event in EVENTS[:2]:
+        results = executor.execute(event, suppress_errors=True)
+        for tenant, parser_config in pipelines.items():
+            assert results[tenant] == manager.configured_parser(
+                event, parser_config, suppress_errors=True
+            )
+    # The guarded and unguarded parse_json steps are different steps
+    assert executor.shared_steps == 0
+
+
+def test_optimizer_keeps_guarded_steps():
+    """Test that guarded steps are not rewritten"""
+    manager = ParserManager()
+    parser_config = manager.query_parser(
+        'set(field="a", value="b") if exists(field="c") | drop(fields="a")', version=2
+    )
+
+    assert PipelineOptimizer().optimize(parser_config) == parser_config
+
+
+def test_required_paths_with_guards():
+    """Test that guarded steps keep the guard field and the paths of the skipped case"""
+    manager = ParserManager()
+    parser_config = manager.query_parser(
+        'rename(from="src", to="dst") if exists(field="flag")', version=2
+    )
+
+    assert required_paths(parser_config, ["dst"]) == ["dst", "flag", "src"]
@@ -0,0 +1,82 @@
+import pytest
+
+from schema_parser.core.exceptions import ParseJsonFunctionError
+from schema_parser.hooks import StepHooks
+from schema_parser.manager import ParserManager
+
+QUERY = (
+    'keep(fields="message,level") | parse_json(field="message", in_place=true) '
+    '| set(field="debug", value="yes") if equals(field="level", value="debug")'
+)
+
+
+def test_hooks_are_called_around_steps():
+    """Test that before and after hooks get the step, its arguments, the data and the time"""
+    manager = ParserManager()
+    calls = []
+    manager.add_step_hook(
+        before=lambda function, args, data: calls.append(("before", function, dict(args))),
+        after=lambda function, args, result, elapsed: calls.append(
+            ("after", function, elapsed >= 0, sorted(result))
+        ),
+    )
+    parser_config = manager.query_parser(QUERY, version=2)
+
+    result = manager.configured_parser({"message": '{"a": 1}', "level": "info"}, parser_config)
+
+    assert result == {"message": {"a": 1}, "level": "info"}
+    assert calls == [
+        ("before", "keep", {"fields": "message,level"}),
+        ("after", "keep", True, ["level", "message"]),
+        ("before", "parse_json", {"field": "message", "in_place": True}),
+        ("after", "parse_json", True, ["level", "message"]),
+    ]
+
+
+def test_on_error_hook():
+    """Test that on_error gets the error and the error is raised again"""
+    manager = ParserManager()
+    errors = []
+    manager.add_step_hook(
+        on_error=lambda function, args, data, elapsed, error: errors.append((function, error))
+    )
+    parser_config = manager.query_parser('parse_json(field="message", in_place=true)')
+
+    with pytest.raises(ParseJsonFunctionError):
+        manager.configured_parser({"message": "{invalid"}, parser_config)
+    assert manager.configured_parser({"message": "{"}, parser_config, suppress_errors=True) == {
+        "message": "{"
+    }
+    assert [function for function, _ in errors] == ["parse_json", "parse_json"]
+    assert all(isinstance(error, ParseJsonFunctionError) for _, error in errors)
+
+
+def test_hooks_with_instrumentation():
+    """Test that hooks and instrumentation work together"""
+    manager = ParserManager()
+    manager.enable_instrumentation()
+    functions = []
+    manager.add_step_hook(after=lambda function, args, result, elapsed: functions.append(function))
+    parser_config = manager.query_parser(QUERY, version=2)
+
+    manager.configured_parser({"message": "{}", "level": "debug"}, parser_config, flat_native=True)
+
+    assert functions == ["keep", "parse_json", "set"]
+    assert manager.stats()["default"]["steps"]["2:set"]["calls"] == 1
+
+
+def test_remove_step_hook():
+    """Test that removed hooks are not called and the hooks are per manager"""
+    manager = ParserManager()
+    calls = []
+    hook = manager.add_step_hook(before=lambda function, args, data: calls.append(function))
+    parser_config = manager.query_parser('set(field="a", value="b")')
+
+    manager.configured_parser({}, parser_config)
+    ParserManager().configured_parser({}, parser_config)
+    manager.remove_step_hook(hook)
+    manager.configured_parser({}, parser_config)
+
+    assert calls == ["set"]
+    assert not manager.step_hooks
+    assert not StepHooks()
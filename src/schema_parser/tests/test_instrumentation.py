@@ -0,0 +1,122 @@
+import pytest
+
+from schema_parser.instrumentation import Instrumentation, format_openmetrics
+from schema_parser.manager import ParserManager
+
+QUERY = (
+    'keep(fields="message,level") '
+    '| parse_json(field="message", in_place=true) '
+    '| set(field="debug", value="yes") if equals(field="level", value="debug") '
+    '| filter(field="message.id", equals=2, exclude=true)'
+)
+
+
+@pytest.fixture
+def manager():
+    manager = ParserManager()
+    manager.enable_instrumentation()
+    return manager
+
+
+def _config(manager, name="tenant_a"):
+    return {**manager.query_parser(QUERY, version=2), "name": name}
+
+
+def test_disabled_by_default():
+    """Test that no statistics are recorded unless enabled"""
+    manager = ParserManager()
+    manager.configured_parser({"message": "{}"}, _config(manager))
+
+    assert manager.instrumentation is None
+    assert manager.stats() == {}
+
+
+def test_step_statistics(manager):
+    """Test calls, skips, sizes and timings per step"""
+    parser_config = _config(manager)
+    events = [
+        {"message": '{"id": 1, "a": 1}', "level": "debug", "noise": 1},
+        {"message": '{"id": 2}', "level": "info"},
+    ]
+    for event in events:
+        manager.configured_parser(event, parser_config)
+
+    stats = manager.stats()["tenant_a"]
+    assert stats["events"] == 2
+    assert stats["filtered"] == 1
+    assert stats["errors"] == {}
+    assert list(stats["steps"]) == ["0:keep", "1:parse_json", "2:set", "3:filter"]
+
+    keep = stats["steps"]["0:keep"]
+    assert keep["calls"] == 2
+    assert keep["input_size"] == 5
+    assert keep["output_size"] == 4
+
+    set_step = stats["steps"]["2:set"]
+    assert (set_step["calls"], set_step["skipped"]) == (1, 1)
+    assert stats["total_ns"] >= sum(step["total_ns"] for step in stats["steps"].values())
+    assert all(step["max_ns"] <= step["total_ns"] for step in stats["steps"].values())
+
+
+def test_errors_by_class(manager):
+    """Test that errors are counted by exception class for the step and the pipeline"""
+    parser_config = _config(manager)
+    manager.configured_parser({"message": "{invalid"}, parser_config, suppress_errors=True)
+    with pytest.raises(Exception):
+        manager.configured_parser({"message": "{invalid"}, parser_config)
+
+    stats = manager.stats()["tenant_a"]
+    assert stats["errors"] == {"ParseJsonFunctionError": 2}
+    assert stats["steps"]["1:parse_json"]["errors"] == {"ParseJsonFunctionError": 2}
+    assert "2:set" not in stats["steps"]
+
+
+def test_positions_with_skipped_optional_steps(manager):
+    """Test that steps keep their positions when optional steps are skipped"""
+    parser_config = manager.query_parser(
+        'optional set(field="a", value="b") | set(field="c", value="d")', version=2
+    )
+    manager.configured_parser({}, parser_config, skip_optional=True, flat_native=True)
+
+    assert list(manager.stats()["default"]["steps"]) == ["1:set"]
+
+
+def test_results_match_uninstrumented_run():
+    """Test that instrumentation does not change results"""
+    plain = ParserManager()
+    instrumented = ParserManager()
+    instrumented.enable_instrumentation()
+    parser_config = _config(plain)
+    event = {"message": '{"id": 1, "user": {"name": "x"}}', "level": "debug"}
+
+    for options in ({}, {"flatten": True}, {"flat_native": True}, {"normalize_keys": True}):
+        assert instrumented.configured_parser(event, parser_config, **options) == (
+            plain.configured_parser(event, parser_config, **options)
+        )
+
+
+def test_openmetrics(manager):
+    """Test the OpenMetrics text format"""
+    manager.configured_parser({"message": '{"id": 1}', "level": "info"}, _config(manager, 'a"b'))
+
+    text = manager.stats_openmetrics()
+
+    assert text.endswith("# EOF\n")
+    assert "# TYPE schema_parser_step_calls counter" in text
+    assert (
+        'schema_parser_step_calls_total{pipeline="a\\"b",step="1",function="parse_json"} 1' in text
+    )
+    assert "# TYPE schema_parser_step_duration_max_seconds gauge" in text
+    assert format_openmetrics({}) == "# EOF\n"
+
+
+def test_reset_and_disable(manager):
+    """Test that statistics can be reset and are discarded when disabled"""
+    instrumentation = manager.instrumentation
+    manager.configured_parser({}, _config(manager))
+    instrumentation.reset()
+
+    assert isinstance(instrumentation, Instrumentation)
+    assert manager.stats() == {}
+    manager.disable_instrumentation()
+    assert manager.instrumentation is None
@@ -0,0 +1,78 @@
+from schema_parser.core.utils import flatten_value
+from schema_parser.functions.keep import KeepFunction
+
+
+def test_keep_basic():
+    """Test keeping top-level and nested fields"""
+    function = KeepFunction()
+    data = {"user": {"name": "John", "id": 1}, "event": {"type": "x"}, "noise": "y"}
+    result = function.execute(data=data, fields="user.name, event")
+
+    assert result == {"user": {"name": "John"}, "event": {"type": "x"}}
+
+
+def test_keep_does_not_modify_input():
+    """Test that keep builds a new dictionary and shares the kept subtrees"""
+    function = KeepFunction()
+    data = {"event": {"type": "x"}, "noise": "y"}
+    result = function.execute(data=data, fields="event")
+
+    assert data == {"event": {"type": "x"}, "noise": "y"}
+    assert result["event"] is data["event"]
+
+
+def test_keep_ignores_missing_fields():
+    """Test that missing fields and non-dictionary parents are ignored"""
+    function = KeepFunction()
+    data = {"user": "John", "event": {"id": 1}}
+    result = function.execute(data=data, fields="user.name,event.type,missing")
+
+    assert result == {}
+
+
+def test_keep_glob_patterns():
+    """Test keeping fields matched by glob segments"""
+    function = KeepFunction()
+    data = {
+        "winlog": {"a": {"Image": "1", "x": 2}, "b": {"Image": "3"}, "c": "str"},
+        "user_id": 1,
+        "event_id": 2,
+        "other": 3,
+    }
+    result = function.execute(data=data, fields="winlog.*.Image,*_id")
+
+    assert result == {
+        "winlog": {"a": {"Image": "1"}, "b": {"Image": "3"}},
+        "user_id": 1,
+        "event_id": 2,
+    }
+
+
+def test_keep_overlapping_exact_and_glob_paths():
+    """Test that exact and glob paths matching the same key are combined"""
+    function = KeepFunction()
+    data = {"d": {"a": {"x": 1, "y": 2}, "b": {"x": 3, "y": 4}}}
+    result = function.execute(data=data, fields="d.a.y,d.*.x")
+
+    assert result == {"d": {"a": {"x": 1, "y": 2}, "b": {"x": 3}}}
+
+
+def test_keep_literal_dotted_key():
+    """Test that literal dotted keys are kept"""
+    function = KeepFunction()
+    data = {"a.b": 1, "a": {"b": 2, "c": 3}}
+    result = function.execute(data=data, fields="a.b")
+
+    assert result == {"a.b": 1, "a": {"b": 2}}
+
+
+def test_keep_flat_matches_nested():
+    """Test that flat execution gives the flattened nested result"""
+    function = KeepFunction()
+    data = {"winlog": {"a": {"Image": "1", "x": 2}}, "user": {"id": 1, "name": "x"}, "z": 1}
+    fields = "winlog.*.Image,user"
+
+    flat = function.execute_flat(data=flatten_value(data), fields=fields)
+
+    assert flat == flatten_value(function.execute(data=data, fields=fields))
+    assert flat == {"winlog.a.Image": "1", "user.id": 1, "user.name": "x"}
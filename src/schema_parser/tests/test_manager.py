@@ -1,5 +1,6 @@
 import pytest
 
+from schema_parser.core.outcomes import FILTERED
 from schema_parser.manager import ParserManager
 
 
@@ -503,3 +504,323 @@ class TestParserManagerFlatten:
         # Result should be flattened
         assert "user.name" in result
         assert result["user.name"] == "John"
+
+
+class TestParserManagerFlatNative:
+    """Tests for the flat_native execution mode in configured_parser"""
+
+    def test_flat_native_matches_nested_with_flatten(self):
+        """Test that flat_native produces the same result as nested execution with flatten"""
+        manager = ParserManager()
+        event = {
+            "raw": '{"user": {"name": "John", "id": 1}, "tags": ["a", "b"]}',
+            "winlog": {"event_data": {"Image": "cmd.exe", "User": "admin"}},
+            "temp": {"x": 1},
+        }
+        parser_config = manager.query_parser(
+            'parse_json(field="raw", in_place=True)'
+            ' | extract(field="winlog.event_data")'
+            ' | drop(fields="temp")'
+        )
+
+        nested = manager.configured_parser(event, parser_config, flatten=True)
+        flat = manager.configured_parser(event, parser_config, flat_native=True)
+
+        assert flat == nested
+        assert flat["raw.user.name"] == "John"
+        assert flat["Image"] == "cmd.exe"
+        assert "temp.x" not in flat
+
+    def test_flat_native_rename_moves_subtree(self):
+        """Test that rename moves every key under the source prefix"""
+        manager = ParserManager()
+        event = {"user": {"name": "John", "profile": {"theme": "dark"}}, "other": "value"}
+        parser_config = {
+            "steps": ["rename"],
+            "args": {"rename": {"from_field": "user", "to_field": "account.user"}},
+        }
+
+        result = manager.configured_parser(event, parser_config, flat_native=True)
+
+        assert result == {
+            "account.user.name": "John",
+            "account.user.profile.theme": "dark",
+            "other": "value",
+        }
+
+    def test_flat_native_set_replaces_leaf_ancestor(self):
+        """Test that setting a nested path replaces a leaf ancestor"""
+        manager = ParserManager()
+        event = {"user": "not_a_dict"}
+        parser_config = {
+            "steps": ["set"],
+            "args": {"set": {"field": "user.name", "value": "John"}},
+        }
+
+        result = manager.configured_parser(event, parser_config, flat_native=True)
+
+        assert result == {"user.name": "John"}
+
+    def test_flat_native_keep_and_extract_match_nested(self):
+        """Test that keep and extract on the prefix index give the nested results"""
+        manager = ParserManager()
+        event = {"user": {"name": "John", "id": 1, "x": {"y": 2}}, "name": "old", "n": {"a": 1}}
+        parser_config = manager.query_parser(
+            'set(field="tmp", value="1") | extract(field="user") | keep(fields="name,x,id")'
+        )
+
+        result = manager.configured_parser(event, parser_config, flat_native=True)
+
+        assert result == manager.configured_parser(event, parser_config, flatten=True)
+        assert result == {"name": "John", "id": 1, "x.y": 2}
+
+    def test_flat_native_copies_mutable_values(self):
+        """Test that flat-native execution does not share lists with the event"""
+        manager = ParserManager()
+        event = {"user": {"groups": ["a"]}}
+        parser_config = manager.query_parser('set(field="x", value="1")')
+
+        result = manager.configured_parser(event, parser_config, flat_native=True)
+
+        assert result["user.groups"] == ["a"]
+        assert result["user.groups"] is not event["user"]["groups"]
+
+    def test_leading_keep_with_flat_native_event(self):
+        """Test that a leading keep matches flat keys like keep in any other position"""
+        manager = ParserManager()
+        event = {"a.b": 1, "a.c": 2, "x": 3}
+        leading = manager.query_parser('keep(fields="a")')
+        later = manager.query_parser('set(field="y", value="1") | keep(fields="a")')
+
+        result = manager.configured_parser(event, leading, flat_native=True)
+
+        assert result == {"a.b": 1, "a.c": 2}
+        assert result == manager.configured_parser(event, later, flat_native=True)
+        assert event == {"a.b": 1, "a.c": 2, "x": 3}
+
+    def test_flat_native_regex_on_flat_path(self):
+        """Test that regex reads a flat path"""
+        manager = ParserManager()
+        event = {"event": {"log": "10.0.0.1 GET /"}}
+        parser_config = {
+            "steps": ["regex"],
+            "args": {"regex": {"field": "event.log", "pattern": r"^(?P<ip>\S+) (?P<method>\S+)"}},
+        }
+
+        result = manager.configured_parser(event, parser_config, flat_native=True)
+
+        assert result == {"ip": "10.0.0.1", "method": "GET"}
+
+    def test_flat_native_extract_replaces_top_level_subtree(self):
+        """Test that extract replaces whole top-level subtrees like dict.update"""
+        manager = ParserManager()
+        event = {"data": {"user": {"name": "John"}}, "user": {"id": 1, "name": "old"}}
+        parser_config = {"steps": ["extract"], "args": {"extract": {"field": "data"}}}
+
+        nested = manager.configured_parser(event, parser_config, flatten=True)
+        flat = manager.configured_parser(event, parser_config, flat_native=True)
+
+        assert flat == nested == {"user.name": "John"}
+
+    def test_flat_native_error_returns_original_event(self):
+        """Test that suppressed errors return the original nested event"""
+        manager = ParserManager()
+        event = {"user": {"name": "John"}, "invalid_field": "not_a_dict"}
+        parser_config = {"steps": ["extract"], "args": {"extract": {"field": "invalid_field"}}}
+
+        with pytest.raises(ValueError):
+            manager.configured_parser(event, parser_config, flat_native=True)
+
+        result = manager.configured_parser(
+            event, parser_config, suppress_errors=True, flat_native=True
+        )
+        assert result == event
+
+    def test_flat_native_does_not_modify_original_event(self):
+        """Test that flat_native does not modify lists in the original event"""
+        manager = ParserManager()
+        event = {"data": {"items": [1, 2]}}
+        parser_config = {"steps": [], "args": {}}
+
+        result = manager.configured_parser(event, parser_config, flat_native=True)
+        result["data.items"].append(3)
+
+        assert event == {"data": {"items": [1, 2]}}
+
+    def test_flat_native_many_renames_and_sets(self):
+        """Test renames and sets after a step that builds a new dictionary"""
+        manager = ParserManager()
+        event = {"message": "10.0.0.1 GET", "user": {"name": "John"}}
+        parser_config = {
+            "version": 2,
+            "steps": [
+                {"function": "regex", "args": {"field": "message", "pattern": r"^(?P<ip>\S+) "}},
+                {"function": "rename", "args": {"from_field": "ip", "to_field": "source.ip"}},
+                {"function": "set", "args": {"field": "source", "value": {"port": 80}}},
+                {"function": "set", "args": {"field": "source.port", "value": 443}},
+                {"function": "set", "args": {"field": "tag", "value": "web"}},
+            ],
+        }
+
+        nested = manager.configured_parser(event, parser_config, flatten=True)
+        flat = manager.configured_parser(event, parser_config, flat_native=True)
+
+        assert flat == nested == {"source.port": 443, "tag": "web"}
+        assert type(flat) is dict
+
+
+class TestParserManagerNormalizeKeys:
+    """Tests for the normalize_keys option in configured_parser"""
+
+    def test_normalize_keys_handles_mixed_input(self):
+        """Test that mixed dotted and nested input is normalized before the steps run"""
+        manager = ParserManager()
+        event = {"winlog.event_data": {"Image": "cmd.exe"}, "winlog": {"channel": "Security"}}
+        parser_config = {
+            "steps": ["rename"],
+            "args": {"rename": {"from_field": "winlog.event_data.Image", "to_field": "image"}},
+        }
+
+        result = manager.configured_parser(event, parser_config, normalize_keys=True)
+
+        assert result == {"winlog": {"event_data": {}, "channel": "Security"}, "image": "cmd.exe"}
+
+    def test_normalize_keys_does_not_modify_original_event(self):
+        """Test that normalization replaces the deep copy without touching the original"""
+        manager = ParserManager()
+        event = {"user.name": "John", "data": {"items": [1, 2]}}
+        parser_config = {
+            "steps": ["set"],
+            "args": {"set": {"field": "user.id", "value": "1"}},
+        }
+
+        result = manager.configured_parser(event, parser_config, normalize_keys=True)
+        result["data"]["items"].append(3)
+
+        assert event == {"user.name": "John", "data": {"items": [1, 2]}}
+        assert result["user"] == {"name": "John", "id": "1"}
+
+    def test_normalize_keys_with_flatten(self):
+        """Test that normalized results flatten the same way as nested input"""
+        manager = ParserManager()
+        parser_config = {"steps": ["drop"], "args": {"drop": {"fields": "a.c"}}}
+
+        mixed = manager.configured_parser(
+            {"a.b": 1, "a": {"c": 2}}, parser_config, normalize_keys=True, flatten=True
+        )
+        nested = manager.configured_parser({"a": {"b": 1, "c": 2}}, parser_config, flatten=True)
+
+        assert mixed == nested == {"a.b": 1}
+
+
+class TestParserManagerConfigVersions:
+    """Tests for parser configuration versions in configured_parser"""
+
+    def test_repeated_steps_in_one_pass(self):
+        """Test that a version 2 configuration runs repeated functions with their arguments"""
+        manager = ParserManager()
+        event = {"message": '{"detail": "{\\"user\\": \\"john\\"}"}', "a": 1, "c": 2}
+        parser_config = manager.query_parser(
+            'parse_json(field="message", in_place=True)'
+            ' | parse_json(field="message.detail", in_place=True)'
+            ' | rename(from="a", to="b")'
+            ' | rename(from="c", to="d")',
+            version=2,
+        )
+
+        result = manager.configured_parser(event, parser_config)
+
+        assert result == {"message": {"detail": {"user": "john"}}, "b": 1, "d": 2}
+
+    def test_version_1_and_version_2_produce_same_result(self):
+        """Test that both formats of the same query give the same result"""
+        manager = ParserManager()
+        event = {"user": {"name": "John"}, "temp": "x"}
+        query = 'extract(field="user") | drop(fields="temp") | set(field="status", value="ok")'
+
+        result_v1 = manager.configured_parser(event, manager.query_parser(query))
+        result_v2 = manager.configured_parser(event, manager.query_parser(query, version=2))
+
+        assert result_v1 == result_v2 == {"name": "John", "status": "ok"}
+
+    def test_query_parser_optimize(self):
+        """Test that query_parser can return an optimized configuration"""
+        manager = ParserManager()
+        event = {"a": 1, "b": 2, "c": 3}
+        query = (
+            'rename(from="a", to="tmp") | rename(from="tmp", to="x") | drop(fields="b")'
+            ' | drop(fields="c")'
+        )
+
+        parser_config = manager.query_parser(query, version=2, optimize=True)
+
+        assert [step["function"] for step in parser_config["steps"]] == ["rename", "drop"]
+        assert manager.configured_parser(event, parser_config) == {"x": 1}
+
+
+class TestParserManagerKeep:
+    """Tests for a leading keep step in configured_parser"""
+
+    def test_leading_keep_does_not_modify_event(self):
+        """Test that the result of a leading keep is copied"""
+        manager = ParserManager()
+        event = {"user": {"name": "John"}, "noise": {"x": 1}}
+        parser_config = manager.query_parser(
+            'keep(fields="user") | set(field="user.name", value="Jane")'
+        )
+
+        result = manager.configured_parser(event, parser_config)
+
+        assert result == {"user": {"name": "Jane"}}
+        assert event == {"user": {"name": "John"}, "noise": {"x": 1}}
+
+    def test_leading_keep_with_flat_native(self):
+        """Test a leading keep with flat-native execution"""
+        manager = ParserManager()
+        event = {"user": {"name": "John", "id": 1}, "noise": 1}
+        parser_config = manager.query_parser('keep(fields="user.*") | drop(fields="user.id")')
+
+        result = manager.configured_parser(event, parser_config, flat_native=True)
+
+        assert result == {"user.name": "John"}
+
+
+class TestParserManagerFilter:
+    """Tests for filtered events in configured_parser and batch_parser"""
+
+    QUERY = (
+        'filter(field="url", startswith="/health", exclude=true) '
+        '| require(fields="user") | set(field="parsed", value="yes")'
+    )
+    EVENTS = [
+        {"url": "/health", "user": "a"},
+        {"url": "/api"},
+        {"url": "/api", "user": "b"},
+    ]
+
+    def test_filtered_event_stops_processing(self):
+        """Test that a filtered event returns FILTERED without raising"""
+        manager = ParserManager()
+        parser_config = manager.query_parser(self.QUERY)
+
+        for options in ({}, {"flatten": True}, {"flat_native": True}, {"normalize_keys": True}):
+            assert manager.configured_parser(self.EVENTS[0], parser_config, **options) is FILTERED
+            assert manager.configured_parser(self.EVENTS[1], parser_config, **options) is FILTERED
+
+    def test_batch_parser_omits_filtered_events(self):
+        """Test that batch_parser omits filtered events by default"""
+        manager = ParserManager()
+        parser_config = manager.query_parser(self.QUERY)
+
+        assert manager.batch_parser(self.EVENTS, parser_config) == [
+            {"url": "/api", "user": "b", "parsed": "yes"}
+        ]
+
+    def test_batch_parser_keeps_filtered_events(self):
+        """Test that keep_filtered keeps results aligned with the events"""
+        manager = ParserManager()
+        parser_config = manager.query_parser(self.QUERY)
+
+        results = manager.batch_parser(self.EVENTS, parser_config, keep_filtered=True, flatten=True)
+
+        assert results == [FILTERED, FILTERED, {"url": "/api", "user": "b", "parsed": "yes"}]
@@ -0,0 +1,141 @@
+import pytest
+
+from schema_parser.core.mapping_table import load_mapping_table
+from schema_parser.core.utils import flatten_value
+from schema_parser.functions.map_fields import MapFieldsFunction
+from schema_parser.functions.parse_win_event_log import parser as win_event_log_parser
+from schema_parser.functions.parse_win_event_log.parser import (
+    FIELDS_MAPPING_BY_EVENT_ID,
+    FIELDS_MAPPING_TABLE,
+)
+
+TABLE = """key,from_field,to_field
+1,Image,process.executable
+1,CommandLine,process.command_line
+3,DestinationIp,destination.ip
+cloudtrail,eventName,event.action
+"""
+
+
+@pytest.fixture
+def table(tmp_path):
+    path = tmp_path / "sysmon.csv"
+    path.write_text(TABLE, encoding="utf-8")
+    return str(path)
+
+
+def test_map_fields_by_key_field(table):
+    """Test renaming fields with the mappings of the event discriminator"""
+    function = MapFieldsFunction()
+    data = {"EventID": 1, "Image": "a.exe", "CommandLine": "a.exe -x", "DestinationIp": "1"}
+    result = function.execute(data=data, table=table, key_field="EventID")
+
+    assert result == {
+        "EventID": 1,
+        "process": {"executable": "a.exe", "command_line": "a.exe -x"},
+        "DestinationIp": "1",
+    }
+
+
+def test_map_fields_with_fixed_key(table):
+    """Test renaming fields with the mappings of a fixed discriminator"""
+    function = MapFieldsFunction()
+    data = {"eventName": "AssumeRole", "other": 1}
+    result = function.execute(data=data, table=table, key="cloudtrail", drop_unmapped=True)
+
+    assert result == {"event": {"action": "AssumeRole"}}
+
+
+def test_map_fields_unknown_key(table):
+    """Test that events with an unknown or missing discriminator are unchanged"""
+    function = MapFieldsFunction()
+
+    assert function.execute(
+        data={"EventID": 7, "Image": "a"}, table=table, key_field="EventID"
+    ) == {
+        "EventID": 7,
+        "Image": "a",
+    }
+    assert function.execute(data={"Image": "a"}, table=table, key_field="EventID") == {"Image": "a"}
+
+
+def test_map_fields_requires_key(table):
+    """Test that key_field or key is required"""
+    function = MapFieldsFunction()
+    with pytest.raises(ValueError):
+        function.execute(data={}, table=table)
+
+
+def test_map_fields_flat(table):
+    """Test that flat execution gives the flattened nested result"""
+    function = MapFieldsFunction()
+    data = {"event": {"id": 3}, "DestinationIp": "1", "Image": "a.exe"}
+
+    flat = function.execute_flat(data=flatten_value(data), table=table, key_field="event.id")
+
+    assert flat == {"event.id": 3, "destination.ip": "1", "Image": "a.exe"}
+
+
+def test_load_mapping_table_is_cached(table):
+    """Test that tables are loaded once and indexed by the discriminator"""
+    mapping_table = load_mapping_table(table)
+
+    assert load_mapping_table(table) is mapping_table
+    assert mapping_table.lookup("1", "Image") == "process.executable"
+    assert mapping_table.lookup("2", "Image") is None
+    assert sorted(mapping_table) == ["1", "3", "cloudtrail"]
+
+
+def test_load_mapping_table_missing_columns(tmp_path):
+    """Test that a table without the required columns raises ValueError"""
+    path = tmp_path / "bad.csv"
+    path.write_text("a,b\n1,2\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_mapping_table(str(path))
+
+
+def test_windows_event_log_mapping_table():
+    """Test that the Windows Event Log mapping uses a mapping table"""
+    assert (
+        FIELDS_MAPPING_TABLE.lookup("4688", "(Creator) Subject", "Account Name")
+        == "SubjectUserName"
+    )
+
+
+def test_windows_event_log_mapping_dictionary():
+    """Test that the nested dictionary of the Windows Event Log mapping is kept"""
+    mapping = FIELDS_MAPPING_BY_EVENT_ID["4688"]["(Creator) Subject"]
+
+    assert isinstance(FIELDS_MAPPING_BY_EVENT_ID, dict)
+    assert mapping["Account Name"] == "SubjectUserName"
+    assert set(FIELDS_MAPPING_BY_EVENT_ID) == set(FIELDS_MAPPING_TABLE)
+
+
+def test_windows_event_log_mapping_dictionary_is_built_lazily():
+    """Test that the nested dictionary is built on first access and then shared"""
+    assert "FIELDS_MAPPING_BY_EVENT_ID" not in vars(win_event_log_parser)
+    assert win_event_log_parser.FIELDS_MAPPING_BY_EVENT_ID is FIELDS_MAPPING_BY_EVENT_ID
+
+
+def test_map_fields_with_windows_event_log_table():
+    """Test that sources of a table with several source columns are joined paths"""
+    function = MapFieldsFunction()
+    data = {
+        "EventID": 4688,
+        "(Creator) Subject": {"Account Name": "admin", "Logon ID": "0x3E7"},
+        "Process Information": {"New Process Name": "C:\\a.exe"},
+        "Unmapped": "x",
+    }
+    result = function.execute(data=data, table="windows_event_log", key_field="EventID")
+
+    assert result["SubjectUserName"] == "admin"
+    assert result["SubjectLogonId"] == "0x3E7"
+    assert result["NewProcessName"] == "C:\\a.exe"
+    assert result["Unmapped"] == "x"
+
+    flat = function.execute_flat(
+        data=flatten_value({"EventID": "4688", "(Creator) Subject": {"Account Name": "admin"}}),
+        table="windows_event_log",
+        key_field="EventID",
+    )
+    assert flat == {"EventID": "4688", "SubjectUserName": "admin"}
@@ -0,0 +1,90 @@
+import pytest
+
+from schema_parser.core.mapping_table import MAPPING_REGISTRY, MappingRegistry
+from schema_parser.functions.map_fields import MapFieldsFunction
+
+SYSMON_TABLE = """key,from_field,to_field
+1,Image,process.executable
+1,CommandLine,process.command_line
+3,Image,process.executable
+"""
+
+SECURITY_TABLE = """key,from_field,to_field
+4688,NewProcessName,process.executable
+"""
+
+
+@pytest.fixture
+def tables(tmp_path):
+    sysmon = tmp_path / "sysmon.csv"
+    sysmon.write_text(SYSMON_TABLE, encoding="utf-8")
+    security = tmp_path / "security.csv"
+    security.write_text(SECURITY_TABLE, encoding="utf-8")
+    return str(sysmon), str(security)
+
+
+def test_registry_loads_table_once(tables, tmp_path, monkeypatch):
+    """Test that a table referenced by different paths is read once"""
+    registry = MappingRegistry()
+    sysmon, _ = tables
+    table = registry.load(sysmon)
+
+    monkeypatch.chdir(tmp_path)
+    assert registry.load("sysmon.csv") is table
+
+
+def test_registry_interns_field_names(tables):
+    """Test that repeated field names are stored once across tables"""
+    registry = MappingRegistry()
+    sysmon, security = tables
+    sysmon_table = registry.load(sysmon)
+    security_table = registry.load(security)
+
+    first = sysmon_table.lookup("1", "Image")
+    assert first is sysmon_table.lookup("3", "Image")
+    assert first is security_table.lookup("4688", "NewProcessName")
+
+
+def test_registry_tables_are_read_only(tables):
+    """Test that tables are exposed as read-only views"""
+    registry = MappingRegistry()
+    table = registry.load(tables[0])
+
+    with pytest.raises(TypeError):
+        table.index["2"] = {}
+    with pytest.raises(TypeError):
+        table.get("1")[("Image",)] = "x"
+
+
+def test_registry_named_tables(tables):
+    """Test registering tables under logsource names"""
+    registry = MappingRegistry()
+    table = registry.register("windows_sysmon", tables[0])
+
+    assert registry.get("windows_sysmon") is table
+    assert registry.names() == ["windows_sysmon"]
+
+
+def test_registry_footprint(tables):
+    """Test that the footprint is reported per table with shared strings counted once"""
+    registry = MappingRegistry()
+    sysmon, security = tables
+    registry.register("windows_sysmon", sysmon)
+    registry.load(security)
+
+    report = registry.footprint()
+
+    assert set(report) == {"windows_sysmon", security, "total"}
+    assert report["windows_sysmon"] > 0
+    assert report["total"] == report["windows_sysmon"] + report[security]
+    assert report[security] < registry.load(security).footprint()
+
+
+def test_map_fields_with_registered_table(tables):
+    """Test map_fields with a table registered in the process-wide registry"""
+    MAPPING_REGISTRY.register("test_windows_security", tables[1])
+    function = MapFieldsFunction()
+    data = {"EventID": "4688", "NewProcessName": "a.exe"}
+    result = function.execute(data=data, table="test_windows_security", key_field="EventID")
+
+    assert result == {"EventID": "4688", "process": {"executable": "a.exe"}}
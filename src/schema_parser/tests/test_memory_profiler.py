@@ -0,0 +1,146 @@
+import tracemalloc
+
+import orjson
+import pytest
+
+from schema_parser.__main__ import main
+from schema_parser.manager import ParserManager
+from schema_parser.memory_profiler import COPY_STEP, MemoryProfiler
+
+CONFIG = {
+    "version": 2,
+    "steps": [
+        {"function": "parse_json", "args": {"field": "raw"}},
+        {"function": "drop", "args": {"fields": ["raw"]}},
+    ],
+}
+
+
+def _events(count):
+    payload = {f"key_{index}": "value" * 20 for index in range(50)}
+    return [{"raw": orjson.dumps(payload).decode()} for _ in range(count)]
+
+
+def test_attributes_memory_to_steps():
+    """Test that every step function and the copy get their calls and bytes"""
+    report = MemoryProfiler().profile(_events(5), CONFIG)
+
+    assert report.events == 5
+    assert set(report.steps) == {"parse_json", "drop", COPY_STEP}
+    assert all(step.calls == 5 for step in report.steps.values())
+    parse_json = report.steps["parse_json"]
+    assert parse_json.net_bytes > 5 * 50 * 100
+    assert parse_json.max_peak_bytes >= parse_json.net_bytes / 5
+    assert report.steps["parse_json"].net_bytes > report.steps["drop"].net_bytes
+    assert not tracemalloc.is_tracing()
+
+
+def test_samples_events():
+    """Test that only every n-th event is profiled, up to max_events"""
+    profiler = MemoryProfiler()
+    assert profiler.profile(_events(10), CONFIG, every=3).events == 4
+    assert profiler.profile(_events(10), CONFIG, every=2, max_events=2).events == 2
+
+
+def test_counts_blocks_and_removes_hook():
+    """Test that blocks are counted on request and the hook is removed afterwards"""
+    manager = ParserManager()
+    report = MemoryProfiler(manager, count_blocks=True).profile(_events(2), CONFIG)
+
+    assert report.steps["parse_json"].blocks > 0
+    assert not manager.step_hooks
+    assert set(report.to_dict()["steps"]["drop"]) == {
+        "calls",
+        "net_bytes",
+        "peak_bytes",
+        "max_peak_bytes",
+        "blocks",
+    }
+
+
+def test_hooks_are_not_registered_on_the_manager():
+    """Test that other parsers using the manager do not call the profiling hooks"""
+    manager = ParserManager()
+    registered = []
+    manager.add_step_hook(before=lambda *args: registered.append(len(manager.step_hooks.hooks)))
+
+    report = MemoryProfiler(manager).profile(_events(1), CONFIG)
+
+    assert report.steps["parse_json"].calls == 1
+    assert registered == [1, 1]
+    assert len(manager.step_hooks.hooks) == 1
+
+
+def test_step_errors_are_profiled():
+    """Test that a failing step is still attributed and errors are suppressed"""
+    report = MemoryProfiler().profile([{"raw": "{invalid"}], CONFIG)
+    assert report.steps["parse_json"].calls == 1
+
+
+def test_failing_steps_do_not_make_copy_negative():
+    """Test that the memory of a failed step is not subtracted from the copy"""
+    report = MemoryProfiler().profile([{"raw": "{invalid"}] * 20, CONFIG)
+
+    assert report.steps["parse_json"].calls == 20
+    assert report.steps["parse_json"].net_bytes == 0
+    assert report.steps[COPY_STEP].net_bytes >= 0
+
+
+def test_cli_profile_memory(tmp_path, capsys):
+    """Test the --profile-memory flag of the command line interface"""
+    events = tmp_path / "events.jsonl"
+    events.write_bytes(b"\n".join(orjson.dumps(event) for event in _events(3)))
+
+    query = 'parse_json(field="raw") | drop(fields=["raw"])'
+    assert main(["--query", query, "--events", str(events), "--profile-memory", "--json"]) == 0
+    report = orjson.loads(capsys.readouterr().out)
+    assert report["events"] == 3
+    assert report["steps"]["parse_json"]["calls"] == 3
+
+    assert main(["--query", query, "--events", str(events)]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 3
+    assert "raw" not in orjson.loads(lines[0])
+
+
+@pytest.mark.parametrize("every", ["0", "-1"])
+def test_cli_rejects_every_below_1(tmp_path, every):
+    """Test that --every must be a positive number"""
+    with pytest.raises(SystemExit):
+        main(["--query", 'parse_json(field="raw")', "--profile-memory", "--every", every])
+
+
+def test_cli_repeated_steps(tmp_path, capsys):
+    """Test that repeated steps of a CLI query keep their own arguments"""
+    events = tmp_path / "events.jsonl"
+    events.write_bytes(orjson.dumps({"a": 1, "c": 2}))
+
+    query = 'rename(from="a", to="b") | rename(from="c", to="d")'
+    assert main(["--query", query, "--events", str(events)]) == 0
+    assert orjson.loads(capsys.readouterr().out) == {"b": 1, "d": 2}
+
+
+def test_cli_reports_malformed_lines(tmp_path, capsys):
+    """Test that invalid JSON and failing events are reported per line and skipped"""
+    events = tmp_path / "events.jsonl"
+    events.write_bytes(
+        b'{"raw": "{\\"a\\": 1}"}\n{not json\n{"raw": "{invalid"}\n{"raw": "{\\"b\\": 2}"}\n'
+    )
+
+    assert main(["--query", 'parse_json(field="raw")', "--events", str(events)]) == 1
+    captured = capsys.readouterr()
+    assert [orjson.loads(line) for line in captured.out.splitlines()] == [{"a": 1}, {"b": 2}]
+    errors = captured.err.splitlines()
+    assert len(errors) == 2
+    assert errors[0].startswith("Line 2: invalid JSON")
+    assert errors[1].startswith("Line 3: ParseJsonFunctionError")
+
+
+def test_cli_writes_lazy_values_as_json(tmp_path, capsys):
+    """Test that lazily parsed values are written as JSON, not as their repr"""
+    events = tmp_path / "events.jsonl"
+    events.write_bytes(orjson.dumps({"raw": '{"a":1}'}))
+
+    query = 'parse_json(field="raw", in_place=true, lazy=true)'
+    assert main(["--query", query, "--events", str(events)]) == 0
+    assert orjson.loads(capsys.readouterr().out) == {"raw": {"a": 1}}
@@ -0,0 +1,131 @@
+import orjson
+import pytest
+
+from schema_parser.core.outcomes import FILTERED
+from schema_parser.functions import CORE_FUNCTIONS
+from schema_parser.manager import ParserManager
+from schema_parser.multi_pipeline import MultiPipelineExecutor
+
+PREFIX = 'parse_json(field="message", in_place=True) | extract(field="message")'
+
+QUERIES = {
+    "tenant_a": PREFIX + ' | rename(from="user", to="user.name")',
+    "tenant_b": PREFIX + ' | drop(fields="host")',
+    "tenant_c": PREFIX,
+    "tenant_d": 'set(field="tag", value="x")',
+    "tenant_e": PREFIX + ' | rename(from="missing", to="x")',
+}
+
+EVENT = {
+    "message": orjson.dumps({"user": "john", "host": {"name": "h1"}, "tags": ["a"]}).decode(),
+    "source": "collector",
+}
+
+
+def _pipelines(version=2):
+    manager = ParserManager()
+    return {
+        tenant: manager.query_parser(query, version=version) for tenant, query in QUERIES.items()
+    }
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"flatten": True}, {"flat_native": True}, {"normalize_keys": True}],
+)
+def test_results_match_configured_parser(options):
+    """Test that every tenant gets the same result as from configured_parser"""
+    manager = ParserManager()
+    pipelines = _pipelines()
+    executor = MultiPipelineExecutor(pipelines)
+
+    results = executor.execute(EVENT, suppress_errors=True, **options)
+
+    assert results == {
+        tenant: manager.configured_parser(EVENT, config, suppress_errors=True, **options)
+        for tenant, config in pipelines.items()
+    }
+
+
+def test_shared_prefix_runs_once(monkeypatch):
+    """Test that a prefix shared by several tenants runs once per event"""
+    calls = []
+    parse_json = CORE_FUNCTIONS["parse_json"]
+    execute = parse_json.execute
+    monkeypatch.setattr(
+        parse_json, "execute", lambda **kwargs: calls.append(1) or execute(**kwargs)
+    )
+    executor = MultiPipelineExecutor(_pipelines(version=1))
+
+    executor.execute(EVENT, suppress_errors=True)
+
+    assert len(calls) == 1
+    assert executor.shared_steps == 6
+
+
+def test_branches_do_not_share_data():
+    """Test that results of forked branches are independent"""
+    executor = MultiPipelineExecutor(_pipelines())
+
+    results = executor.execute(EVENT, suppress_errors=True)
+    results["tenant_c"]["tags"].append("b")
+
+    assert results["tenant_a"]["tags"] == ["a"]
+    assert results["tenant_b"]["tags"] == ["a"]
+
+
+def test_failed_pipeline_does_not_affect_others():
+    """Test error handling of a single failed tenant pipeline"""
+    executor = MultiPipelineExecutor(_pipelines())
+
+    results = executor.execute(EVENT, suppress_errors=True)
+
+    assert results["tenant_e"] is EVENT
+    assert results["tenant_a"]["user"] == {"name": "john"}
+    with pytest.raises(ValueError):
+        executor.execute(EVENT)
+
+
+def test_filtered_tenants():
+    """Test that tenants whose pipeline filters the event out get FILTERED"""
+    manager = ParserManager()
+    executor = MultiPipelineExecutor(
+        {
+            "filtered": manager.query_parser(
+                'require(fields="missing") | set(field="a", value="b")'
+            ),
+            "kept": manager.query_parser('set(field="a", value="b")'),
+        }
+    )
+
+    assert executor.execute({"x": 1}) == {"filtered": FILTERED, "kept": {"x": 1, "a": "b"}}
+
+
+def test_skip_optional():
+    """Test that optional steps are skipped on request and not shared with required ones"""
+    manager = ParserManager()
+    executor = MultiPipelineExecutor(
+        {
+            "optional": manager.query_parser('optional set(field="a", value="b")', version=2),
+            "required": manager.query_parser('set(field="a", value="b")', version=2),
+        }
+    )
+
+    assert executor.shared_steps == 0
+    assert executor.execute({"x": 1}, skip_optional=True) == {
+        "optional": {"x": 1},
+        "required": {"x": 1, "a": "b"},
+    }
+
+
+def test_steps_run_in_the_manager_step_loop():
+    """Test that steps run with the hooks of the manager, shared steps once"""
+    manager = ParserManager()
+    functions = []
+    manager.add_step_hook(before=lambda function, args, data: functions.append(function))
+    executor = MultiPipelineExecutor(_pipelines(), manager)
+
+    results = executor.execute(EVENT, suppress_errors=True)
+
+    assert results["tenant_d"] == {**EVENT, "tag": "x"}
+    assert sorted(functions) == ["drop", "extract", "parse_json", "rename", "rename", "set"]
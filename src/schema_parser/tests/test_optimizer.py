@@ -0,0 +1,202 @@
+import random
+
+import pytest
+
+from schema_parser.manager import ParserManager
+from schema_parser.optimizer import PipelineOptimizer, verify_equivalence
+
+
+def _config(*steps):
+    return {
+        "version": 2,
+        "steps": [{"function": function, "args": args} for function, args in steps],
+    }
+
+
+def test_merge_consecutive_drops():
+    """Test that consecutive drops are merged into one step"""
+    config = _config(("drop", {"fields": "a"}), ("drop", {"fields": "b, c"}))
+
+    assert PipelineOptimizer().optimize(config) == _config(("drop", {"fields": "a,b,c"}))
+
+
+def test_eliminate_set_before_drop():
+    """Test that a set of a dropped field is eliminated"""
+    config = _config(("set", {"field": "a", "value": 1}), ("drop", {"fields": "b,a"}))
+
+    assert PipelineOptimizer().optimize(config) == _config(("drop", {"fields": "b,a"}))
+
+
+def test_keep_dotted_set_before_drop():
+    """Test that a set of a dotted field is kept, it creates intermediate dictionaries"""
+    config = _config(("set", {"field": "a.b", "value": 1}), ("drop", {"fields": "a.b"}))
+
+    assert PipelineOptimizer().optimize(config) == config
+
+
+def test_eliminate_overwritten_set():
+    """Test that a set overwritten by the next step is eliminated"""
+    config = _config(
+        ("set", {"field": "a.b", "value": 1}),
+        ("set", {"field": "a.b", "value": 2}),
+    )
+
+    assert PipelineOptimizer().optimize(config) == _config(("set", {"field": "a.b", "value": 2}))
+
+
+def test_collapse_rename_chain():
+    """Test that renames chained through a temporary field are collapsed"""
+    config = _config(
+        ("rename", {"from_field": "a", "to_field": "tmp"}),
+        ("rename", {"from_field": "tmp", "to_field": "b.c"}),
+        ("drop", {"fields": "x"}),
+    )
+
+    assert PipelineOptimizer().optimize(config) == _config(
+        ("rename", {"from_field": "a", "to_field": "b.c"}),
+        ("drop", {"fields": "tmp,x"}),
+    )
+
+
+def test_keep_rename_chain_through_overlapping_fields():
+    """Test that renames through overlapping fields are kept"""
+    config = _config(
+        ("rename", {"from_field": "a", "to_field": "tmp"}),
+        ("rename", {"from_field": "tmp", "to_field": "a.b"}),
+    )
+
+    assert PipelineOptimizer().optimize(config) == config
+
+
+def test_push_drop_before_extract_requires_canonical_keys():
+    """Test that drops are only pushed before extract for canonical events"""
+    config = _config(("extract", {"field": "user"}), ("drop", {"fields": "id"}))
+
+    assert PipelineOptimizer().optimize(config) == config
+    assert PipelineOptimizer(canonical_keys=True).optimize(config) == _config(
+        ("drop", {"fields": "id,user.id"}),
+        ("extract", {"field": "user"}),
+    )
+
+
+def test_optimize_version_1_config():
+    """Test that version 1 configurations are optimized into version 2"""
+    config = {
+        "steps": ["set", "drop"],
+        "args": {"set": {"field": "a", "value": 1}, "drop": {"fields": "a"}},
+    }
+
+    assert PipelineOptimizer().optimize(config) == _config(("drop", {"fields": "a"}))
+    assert config["steps"] == ["set", "drop"]
+
+
+def test_explain():
+    """Test that explain reports both plans and the applied rewrites"""
+    config = _config(("drop", {"fields": "a"}), ("drop", {"fields": "b"}))
+
+    plan = PipelineOptimizer().explain(config)
+
+    assert plan["before"] == ["drop(fields='a')", "drop(fields='b')"]
+    assert plan["after"] == ["drop(fields='a,b')"]
+    assert plan["rewrites"] == ["merged drop(fields='a') and drop(fields='b')"]
+
+
+def test_verify_equivalence_reports_mismatch():
+    """Test that verify_equivalence reports events with different results"""
+    manager = ParserManager()
+    config = _config(("set", {"field": "a", "value": 1}))
+    other = _config(("set", {"field": "a", "value": 2}))
+
+    mismatches = verify_equivalence(manager.configured_parser, config, other, [{}])
+
+    assert len(mismatches) == 1
+    assert mismatches[0]["expected"] == ("result", {"a": 1})
+    assert mismatches[0]["actual"] == ("result", {"a": 2})
+
+
+class TestDifferential:
+    """Differential tests: optimized and original pipelines produce identical output"""
+
+    FIELDS = ["a", "b", "t", "u", "a.x", "b.y", "d.e", "user", "user.a"]
+    PATTERNS = ["*", "[ab]", "user.*", "*.x"]
+
+    CORPUS = [
+        {},
+        {"a": 1, "b": 2},
+        {"a": {"x": 1, "z": 2}, "b": {"y": 3}, "t": "old"},
+        {"a": None, "b": "", "t": []},
+        {"user": {"a": 1, "b": {"y": 2}, "t": 3}, "a": "top"},
+        {"user": {}, "d": {"e": 1}, "u": 0},
+        {"user": "not a dict", "d": "x"},
+        {"a.x": "literal", "a": {"x": "nested"}, "d.e": 1},
+        {"user": {"a.x": 1, "user": {"a": 2}}, "b.y": 1},
+    ]
+
+    @classmethod
+    def _random_step(cls, rng: random.Random) -> list[tuple[str, dict]]:
+        field, other = rng.choice(cls.FIELDS), rng.choice(cls.FIELDS)
+        choice = rng.randrange(7)
+        if choice == 0:
+            fields = ",".join(rng.sample(cls.FIELDS + cls.PATTERNS, rng.randint(1, 3)))
+            return [("drop", {"fields": fields})]
+        if choice == 1:
+            return [("set", {"field": field, "value": rng.choice([1, "v", {"k": 1}])})]
+        if choice == 2:
+            return [("rename", {"from_field": field, "to_field": other})]
+        if choice == 3:
+            return [("extract", {"field": rng.choice(["user", "a", "d", "user.user"])})]
+        # Patterns the optimizer rewrites
+        if choice == 4:
+            return [
+                ("rename", {"from_field": field, "to_field": "t"}),
+                ("rename", {"from_field": "t", "to_field": other}),
+            ]
+        if choice == 5:
+            return [
+                ("set", {"field": field, "value": 1}),
+                ("drop", {"fields": f"{field},{other}"}),
+            ]
+        return [
+            ("extract", {"field": rng.choice(["user", "a", "d"])}),
+            ("drop", {"fields": ",".join(rng.sample(["a", "b", "t", "u", "u*"], 2))}),
+        ]
+
+    @classmethod
+    def _random_config(cls, seed: int) -> dict:
+        rng = random.Random(seed)
+        steps = []
+        for _ in range(rng.randint(1, 4)):
+            steps.extend(cls._random_step(rng))
+        return _config(*steps)
+
+    @pytest.mark.parametrize(
+        "options, canonical_keys",
+        [
+            ({}, False),
+            ({"flat_native": True}, False),
+            ({"flatten": True}, False),
+            ({"normalize_keys": True}, True),
+            ({"normalize_keys": True, "flat_native": True}, True),
+        ],
+    )
+    def test_random_pipelines(self, options, canonical_keys):
+        """Test that optimized random pipelines behave exactly like the originals"""
+        manager = ParserManager()
+        optimizer = PipelineOptimizer(canonical_keys=canonical_keys)
+        rewritten = 0
+
+        for seed in range(300):
+            config = self._random_config(seed)
+            plan = optimizer.explain(config)
+            rewritten += bool(plan["rewrites"])
+
+            mismatches = verify_equivalence(
+                manager.configured_parser,
+                config,
+                optimizer.optimize(config),
+                self.CORPUS,
+                **options,
+            )
+            assert not mismatches, (seed, plan, mismatches[0])
+
+        assert rewritten > 100
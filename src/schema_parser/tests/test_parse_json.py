@@ -1,6 +1,8 @@
+import orjson
 import pytest
 
 from schema_parser.core.exceptions import ParseJsonFunctionError
+from schema_parser.core.lazy_json import dumps
 from schema_parser.functions.parse_json import ParseJsonFunction
 
 
@@ -726,3 +728,174 @@ def test_parse_json_nested_path_missing():
     # Should return data unchanged when nested path is not found
     assert result == data
     assert result["user"]["name"] == "John"
+
+
+def test_parse_json_with_paths_keeps_only_selected_subtrees():
+    """Test that paths projects the parsed object right after decoding"""
+    function = ParseJsonFunction()
+    data = {"raw": '{"user": {"name": "John", "id": 1}, "big": {"x": [1, 2]}, "tag": "a"}'}
+    result = function.execute(data=data, field="raw", in_place=True, paths="user.name,tag")
+
+    assert result == {"raw": {"user": {"name": "John"}, "tag": "a"}}
+
+
+def test_parse_json_with_paths_keeps_values_on_the_way():
+    """Test that values on the way to a selected path keep their existence and type"""
+    function = ParseJsonFunction()
+    data = {"raw": '{"user": "not_a_dict", "event": {"other": 1}}'}
+    result = function.execute(data=data, field="raw", paths="user.name,event.id")
+
+    # A dictionary with values is not projected to an empty one, which the flat
+    # representation would treat as missing
+    assert result == {"user": "not_a_dict", "event": {"other": 1}}
+
+
+def test_parse_json_lazy_defers_parsing():
+    """Test that lazy=True stores a proxy that is parsed on first access"""
+    from schema_parser.core.lazy_json import LazyJson
+
+    function = ParseJsonFunction()
+    data = {"raw": '{"user": {"name": "John"}}'}
+    result = function.execute(data=data, field="raw", in_place=True, lazy=True)
+
+    assert isinstance(result["raw"], LazyJson)
+    assert not result["raw"].parsed
+    assert result["raw"]["user"] == {"name": "John"}
+    assert result["raw"].parsed
+
+
+def test_parse_json_lazy_serializes_original_string():
+    """Test that an untouched proxy is serialized back to the original JSON"""
+
+    function = ParseJsonFunction()
+    data = {"raw": '{"b": 1,  "a": [1, 2]}'}
+    result = function.execute(data=data, field="raw", in_place=True, lazy=True)
+
+    assert dumps(result) == b'{"raw":{"b": 1,  "a": [1, 2]}}'
+    assert not result["raw"].parsed
+
+    result["raw"]["c"] = 3
+    assert dumps(result) == b'{"raw":{"b":1,"a":[1,2],"c":3}}'
+
+
+def test_parse_json_lazy_serializes_invalid_json_as_string():
+    """Test that an untouched proxy over invalid JSON is serialized as the original string"""
+    function = ParseJsonFunction()
+    data = {"raw": '{"broken": '}
+    result = function.execute(data=data, field="raw", in_place=True, lazy=True)
+
+    assert orjson.loads(dumps(result)) == {"raw": '{"broken": '}
+
+
+def test_parse_json_lazy_validates_once():
+    """Test that an untouched proxy is validated once and stays unparsed"""
+    function = ParseJsonFunction()
+    data = {"raw": '{"a": {"b": 1}, "c": 2}'}
+    result = function.execute(data=data, field="raw", in_place=True, lazy=True, paths="c")
+
+    assert dumps(result) == dumps(result) == b'{"raw":{"a": {"b": 1}, "c": 2}}'
+    assert result["raw"]._valid is True
+    assert not result["raw"].parsed
+
+    # An accessed proxy is serialized as the transformed value
+    assert result["raw"]["c"] == 2
+    assert dumps(result) == b'{"raw":{"c":2}}'
+
+
+def test_parse_json_lazy_reports_invalid_json_on_access():
+    """Test that invalid JSON raises ParseJsonFunctionError on first access"""
+    function = ParseJsonFunction()
+    data = {"raw": '{"broken": '}
+    result = function.execute(data=data, field="raw", in_place=True, lazy=True)
+
+    with pytest.raises(ParseJsonFunctionError) as exc_info:
+        result["raw"]["broken"]
+
+    assert exc_info.value.field == "raw"
+
+
+def test_parse_json_lazy_parses_non_objects_eagerly():
+    """Test that JSON arrays and scalars are parsed right away"""
+    function = ParseJsonFunction()
+    data = {"raw": "[1, 2]"}
+    result = function.execute(data=data, field="raw", in_place=True, lazy=True)
+
+    assert result == {"raw": [1, 2]}
+
+
+def test_parse_json_lazy_with_nested_path_access():
+    """Test that path helpers traverse lazy proxies"""
+    from schema_parser.core.utils import delete_value, get_value, set_value
+
+    function = ParseJsonFunction()
+    data = {"raw": '{"user": {"name": "John", "id": 1}}'}
+    result = function.execute(data=data, field="raw", in_place=True, lazy=True)
+
+    assert get_value(result, "raw.user.name") == "John"
+    set_value(result, "raw.user.email", "john@example.com")
+    assert delete_value(result, "raw.user.id") == 1
+    assert dict(result["raw"]) == {"user": {"name": "John", "email": "john@example.com"}}
+
+
+def test_parse_json_recursive_decodes_embedded_json():
+    """Test that recursive=True decodes JSON strings embedded in the parsed value"""
+    function = ParseJsonFunction()
+    inner = '{"policy": "{\\"Version\\": \\"2012\\"}", "items": "[1, 2]"}'
+    data = {"raw": orjson.dumps({"requestParameters": inner, "message": "plain text"}).decode()}
+    result = function.execute(data=data, field="raw", in_place=True, recursive=True)
+
+    assert result["raw"] == {
+        "requestParameters": {"policy": {"Version": "2012"}, "items": [1, 2]},
+        "message": "plain text",
+    }
+
+
+def test_parse_json_recursive_respects_max_depth():
+    """Test that max_depth limits the number of nested decoding levels"""
+    function = ParseJsonFunction()
+    inner = '{"policy": "{\\"Version\\": \\"2012\\"}"}'
+    data = {"raw": orjson.dumps({"requestParameters": inner}).decode()}
+    result = function.execute(data=data, field="raw", recursive=True, max_depth=1)
+
+    assert result == {"requestParameters": {"policy": '{"Version": "2012"}'}}
+
+
+def test_parse_json_recursive_leaves_invalid_json_strings():
+    """Test that strings that only look like JSON are left as is"""
+    function = ParseJsonFunction()
+    data = {"raw": orjson.dumps({"a": "{not json", "b": "[", "c": "123"}).decode()}
+    result = function.execute(data=data, field="raw", recursive=True)
+
+    assert result == {"a": "{not json", "b": "[", "c": "123"}
+
+
+def test_parse_json_recursive_with_decode_paths():
+    """Test that decode_paths restricts decoding and may cross embedded strings"""
+    function = ParseJsonFunction()
+    inner = '{"policy": "{\\"Version\\": \\"2012\\"}", "other": "{\\"x\\": 1}"}'
+    data = {
+        "raw": orjson.dumps(
+            {"requestParameters": inner, "records": [{"detail": '{"y": 2}'}], "keep": '{"z": 3}'}
+        ).decode()
+    }
+    result = function.execute(
+        data=data,
+        field="raw",
+        recursive=True,
+        decode_paths="requestParameters.policy,records.detail",
+    )
+
+    assert result == {
+        "requestParameters": {"policy": {"Version": "2012"}, "other": '{"x": 1}'},
+        "records": [{"detail": {"y": 2}}],
+        "keep": '{"z": 3}',
+    }
+
+
+def test_parse_json_recursive_lazy():
+    """Test that recursive decoding is applied when a lazy proxy is parsed"""
+    function = ParseJsonFunction()
+    data = {"raw": orjson.dumps({"message": '{"level": "info"}'}).decode()}
+    result = function.execute(data=data, field="raw", in_place=True, lazy=True, recursive=True)
+
+    assert result["raw"]["message"] == {"level": "info"}
@@ -0,0 +1,128 @@
+import pytest
+
+from schema_parser.pipeline import PipelineStep, dump_steps, load_steps, upgrade_config
+
+
+def test_load_steps_version_1():
+    """Test loading steps of a configuration without version"""
+    parser_config = {
+        "steps": ["parse_json", "rename"],
+        "args": {
+            "parse_json": {"field": "raw", "in_place": True},
+            "rename": {"from_field": "raw", "to_field": "data"},
+        },
+    }
+
+    assert load_steps(parser_config) == [
+        PipelineStep("parse_json", {"field": "raw", "in_place": True}),
+        PipelineStep("rename", {"from_field": "raw", "to_field": "data"}),
+    ]
+
+
+def test_load_steps_version_2_with_repeated_function():
+    """Test that every step of a version 2 configuration keeps its own arguments"""
+    parser_config = {
+        "version": 2,
+        "steps": [
+            {"function": "rename", "args": {"from_field": "a", "to_field": "b"}},
+            {"function": "rename", "args": {"from_field": "c", "to_field": "d"}},
+            {"function": "set", "args": {"field": "e", "value": "f"}},
+        ],
+    }
+
+    assert load_steps(parser_config) == [
+        PipelineStep("rename", {"from_field": "a", "to_field": "b"}),
+        PipelineStep("rename", {"from_field": "c", "to_field": "d"}),
+        PipelineStep("set", {"field": "e", "value": "f"}),
+    ]
+
+
+def test_load_steps_unsupported_version():
+    """Test that an unknown configuration version raises ValueError"""
+    with pytest.raises(ValueError):
+        load_steps({"version": 99, "steps": []})
+
+
+def test_dump_steps_version_1_keeps_identical_repeated_function():
+    """Test that version 1 is kept when a repeated function is configured the same way"""
+    steps = [
+        PipelineStep("rename", {"from_field": "a", "to_field": "b"}),
+        PipelineStep("rename", {"from_field": "a", "to_field": "b"}),
+    ]
+
+    assert dump_steps(steps, version=1) == {
+        "steps": ["rename", "rename"],
+        "args": {"rename": {"from_field": "a", "to_field": "b"}},
+    }
+
+
+@pytest.mark.parametrize(
+    "second",
+    [
+        PipelineStep("regex", {"field": "message", "pattern": "^<"}),
+        PipelineStep("regex", {"field": "message", "pattern": "(?<word>\\w+)"}),
+        PipelineStep(
+            "regex",
+            {"field": "message", "pattern": "^<"},
+            {"type": "startswith", "field": "message", "value": "<"},
+            optional=True,
+        ),
+    ],
+)
+def test_dump_steps_version_1_falls_back_to_version_2(second):
+    """Test that a repeated function that would be merged in version 1 is dumped as version 2"""
+    steps = [
+        PipelineStep(
+            "regex",
+            {"field": "message", "pattern": "^<"},
+            {"type": "startswith", "field": "message", "value": "<"},
+        ),
+        second,
+    ]
+
+    config = dump_steps(steps, version=1)
+
+    assert config["version"] == 2
+    assert load_steps(config) == steps
+
+
+def test_upgrade_config():
+    """Test converting a version 1 configuration to version 2"""
+    parser_config = {
+        "steps": ["extract", "set"],
+        "args": {"extract": {"field": "user"}, "set": {"field": "status", "value": "active"}},
+    }
+
+    upgraded = upgrade_config(parser_config)
+
+    assert upgraded == {
+        "version": 2,
+        "steps": [
+            {"function": "extract", "args": {"field": "user"}},
+            {"function": "set", "args": {"field": "status", "value": "active"}},
+        ],
+    }
+    upgraded["steps"][0]["args"]["field"] = "changed"
+    assert parser_config["args"]["extract"]["field"] == "user"
+
+
+@pytest.mark.parametrize("version", [1, 2])
+def test_guards_round_trip(version):
+    """Test that guards are kept when steps are dumped and loaded"""
+    steps = [
+        PipelineStep("parse_json", {"field": "raw"}, {"type": "exists", "field": "raw"}),
+        PipelineStep("set", {"field": "a", "value": "b"}),
+    ]
+
+    assert load_steps(dump_steps(steps, version=version)) == steps
+
+
+@pytest.mark.parametrize("version", [1, 2])
+def test_optional_round_trip(version):
+    """Test that optional steps are kept when steps are dumped and loaded"""
+    steps = [
+        PipelineStep("parse_json", {"field": "raw"}, optional=True),
+        PipelineStep("set", {"field": "a", "value": "b"}),
+    ]
+
+    assert load_steps(dump_steps(steps, version=version)) == steps
@@ -1,3 +1,5 @@
+import pytest
+
 from schema_parser.query_normalizer import QueryNormalizer
 
 
@@ -34,6 +36,17 @@ class TestParseJson:
         assert result["args"]["parse_json"]["field"] == "raw"
         assert result["args"]["parse_json"]["in_place"] is True
 
+    def test_parse_json_parameter_names_are_case_insensitive(self):
+        """Test parse_json with parameter names in any case, as in version 1 queries"""
+        normalizer = QueryNormalizer()
+
+        assert normalizer.parse_query('parse_json(Field="raw")')["args"] == {
+            "parse_json": {"field": "raw"}
+        }
+        assert normalizer.parse_query('parse_json(field="raw", In_Place=true)')["args"] == {
+            "parse_json": {"field": "raw", "in_place": True}
+        }
+
     def test_parse_json_with_in_place_false(self):
         """Test parse_json with in_place=False"""
         normalizer = QueryNormalizer()
@@ -206,6 +219,14 @@ class TestDrop:
         assert result["steps"] == ["drop"]
         assert result["args"]["drop"]["fields"] == "field_name"
 
+    def test_drop_with_multiple_fields_and_globs(self):
+        """Test drop with a list of fields and glob patterns"""
+        normalizer = QueryNormalizer()
+        query = 'drop(fields="event.count, winlog.*.raw, *_tmp")'
+        result = normalizer.parse_query(query)
+
+        assert result["args"]["drop"]["fields"] == "event.count, winlog.*.raw, *_tmp"
+
     def test_drop_with_dotted_field(self):
         """Test drop with dotted field name"""
         normalizer = QueryNormalizer()
@@ -644,6 +665,350 @@ rename(from="old", to="new")"""
 | set(field="url", value="http://example.com#fragment") # URL with fragment"""
         result = normalizer.parse_query(query)
 
-        assert result["steps"] == ["set", "parse_json", "set"]
-        assert result["args"]["set"]["field"] == "url"
-        assert result["args"]["set"]["value"] == "http://example.com#fragment"
+        assert [step["function"] for step in result["steps"]] == ["set", "parse_json", "set"]
+        assert result["steps"][0]["args"]["value"] == "/usr/bin#test"
+        assert result["steps"][2]["args"]["field"] == "url"
+        assert result["steps"][2]["args"]["value"] == "http://example.com#fragment"
+
+
+class TestParseJsonOptions:
+    """Tests for additional parse_json parameters"""
+
+    def test_parse_json_with_lazy(self):
+        """Test parse_json with lazy parameter"""
+        normalizer = QueryNormalizer()
+        query = 'parse_json(field="raw", in_place=true, lazy=true)'
+        result = normalizer.parse_query(query)
+
+        assert result["args"]["parse_json"] == {"field": "raw", "in_place": True, "lazy": True}
+
+    def test_parse_json_parameters_in_any_order(self):
+        """Test parse_json with parameters in any order"""
+        normalizer = QueryNormalizer()
+        query = 'parse_json( lazy = True , field = "raw" , in_place = True )'
+        result = normalizer.parse_query(query)
+
+        assert result["args"]["parse_json"] == {"field": "raw", "in_place": True, "lazy": True}
+
+    def test_parse_json_with_unknown_parameter(self):
+        """Test that parse_json with an unknown parameter is not parsed"""
+        normalizer = QueryNormalizer()
+        query = 'parse_json(field="raw", unknown=true)'
+        result = normalizer.parse_query(query)
+
+        assert result["steps"] == []
+
+    def test_parse_json_with_recursive_options(self):
+        """Test parse_json with recursive decoding parameters"""
+        normalizer = QueryNormalizer()
+        query = (
+            'parse_json(field="raw", in_place=true, recursive=true, max_depth=2,'
+            ' decode_paths="requestParameters,message")'
+        )
+        result = normalizer.parse_query(query)
+
+        assert result["args"]["parse_json"] == {
+            "field": "raw",
+            "in_place": True,
+            "recursive": True,
+            "max_depth": 2,
+            "decode_paths": "requestParameters,message",
+        }
+
+    def test_parse_json_with_invalid_max_depth(self):
+        """Test that a non-integer max_depth is rejected"""
+        normalizer = QueryNormalizer()
+        query = 'parse_json(field="raw", recursive=true, max_depth="two")'
+        result = normalizer.parse_query(query)
+
+        assert result["steps"] == []
+
+
+class TestVersion2Format:
+    """Tests for the version 2 configuration format"""
+
+    def test_repeated_functions_keep_their_arguments(self):
+        """Test that repeated functions keep their own arguments in version 2"""
+        normalizer = QueryNormalizer()
+        query = 'rename(from="a", to="b") | rename(from="c", to="d") | drop(fields="e")'
+        result = normalizer.parse_query(query, version=2)
+
+        assert result == {
+            "version": 2,
+            "steps": [
+                {"function": "rename", "args": {"from_field": "a", "to_field": "b"}},
+                {"function": "rename", "args": {"from_field": "c", "to_field": "d"}},
+                {"function": "drop", "args": {"fields": "e"}},
+            ],
+        }
+
+    def test_default_version_is_1(self):
+        """Test that the default format is still version 1"""
+        normalizer = QueryNormalizer()
+        result = normalizer.parse_query('set(field="a", value="b")')
+
+        assert result == {"steps": ["set"], "args": {"set": {"field": "a", "value": "b"}}}
+
+
+class TestRenameMap:
+    """Tests for rename_map function normalization"""
+
+    def test_inline_mapping(self):
+        """Test rename_map with an inline mapping"""
+        normalizer = QueryNormalizer()
+        result = normalizer.parse_query('rename_map(mapping="user.name:user_name, src:source.ip")')
+
+        assert result == {
+            "steps": ["rename_map"],
+            "args": {"rename_map": {"mapping": "user.name:user_name, src:source.ip"}},
+        }
+
+    def test_mapping_file(self):
+        """Test rename_map with a mapping file and drop_unmapped"""
+        normalizer = QueryNormalizer()
+        result = normalizer.parse_query(
+            'rename_map(path="mappings/ecs.csv", drop_unmapped=true) | rename(from="a", to="b")'
+        )
+
+        assert result["steps"] == ["rename_map", "rename"]
+        assert result["args"]["rename_map"] == {
+            "path": "mappings/ecs.csv",
+            "drop_unmapped": True,
+        }
+
+    def test_invalid_calls(self):
+        """Test that malformed rename_map calls are skipped"""
+        normalizer = QueryNormalizer()
+        queries = [
+            'rename_map(mapping="a")',
+            'rename_map(mapping="a:b", path="x.csv")',
+            "rename_map(drop_unmapped=true)",
+            'rename_map(mapping="a:b", drop_unmapped="yes")',
+        ]
+
+        for query in queries:
+            assert normalizer.parse_query(query) == {"steps": [], "args": {}}
+
+
+class TestKeep:
+    """Tests for keep function normalization"""
+
+    def test_keep_with_glob_patterns(self):
+        """Test keep with exact paths and glob patterns"""
+        normalizer = QueryNormalizer()
+        result = normalizer.parse_query('keep( fields = "user.name, winlog.*.Image, *_id" )')
+
+        assert result == {
+            "steps": ["keep"],
+            "args": {"keep": {"fields": "user.name, winlog.*.Image, *_id"}},
+        }
+
+    def test_keep_invalid_characters(self):
+        """Test that keep with invalid characters is skipped"""
+        normalizer = QueryNormalizer()
+        result = normalizer.parse_query('keep(fields="user;name")')
+
+        assert result == {"steps": [], "args": {}}
+
+
+class TestMapFields:
+    """Tests for map_fields function normalization"""
+
+    def test_map_fields_with_key_field(self):
+        """Test map_fields with a discriminator field"""
+        normalizer = QueryNormalizer()
+        result = normalizer.parse_query('map_fields(table="maps/sysmon.csv", key_field="EventID")')
+
+        assert result["args"]["map_fields"] == {"table": "maps/sysmon.csv", "key_field": "EventID"}
+
+    def test_map_fields_with_fixed_key(self):
+        """Test map_fields with a fixed discriminator and drop_unmapped"""
+        normalizer = QueryNormalizer()
+        result = normalizer.parse_query(
+            'map_fields(key="cloudtrail", table="maps/aws.csv", drop_unmapped=true)'
+        )
+
+        assert result["args"]["map_fields"] == {
+            "table": "maps/aws.csv",
+            "key": "cloudtrail",
+            "drop_unmapped": True,
+        }
+
+    def test_map_fields_without_discriminator(self):
+        """Test that map_fields without key_field or key is skipped"""
+        normalizer = QueryNormalizer()
+        result = normalizer.parse_query('map_fields(table="maps/sysmon.csv")')
+
+        assert result == {"steps": [], "args": {}}
+
+
+class TestGuards:
+    """Tests for guards after if and when"""
+
+    def test_guards(self):
+        """Test steps with if and when guards"""
+        normalizer = QueryNormalizer()
+        result = normalizer.parse_query(
+            'regex(field="message", pattern="^<(?P<pri>\\d+)>") if startswith(field="message", '
+            'value="<") | parse_json(field="payload") when exists(field="payload")',
+            version=2,
+        )
+
+        assert [step["guard"] for step in result["steps"]] == [
+            {"type": "startswith", "field": "message", "value": "<"},
+            {"type": "exists", "field": "payload"},
+        ]
+
+    def test_repeated_guarded_function_falls_back_to_version_2(self):
+        """Test that a guard of a repeated function is not applied to its other steps"""
+        normalizer = QueryNormalizer()
+        result = normalizer.parse_query(
+            'regex(field="message", pattern="^<(?<tag>\\w+)") if startswith(field="message", value="<")'
+            ' | regex(field="message", pattern="(?<word>\\w+)")'
+        )
+
+        assert result["version"] == 2
+        assert "guard" in result["steps"][0]
+        assert "guard" not in result["steps"][1]
+
+    def test_guard_in_version_1(self):
+        """Test that version 1 keeps guards by function name"""
+        normalizer = QueryNormalizer()
+        result = normalizer.parse_query(
+            'set(field="a", value="b") when equals(field="EventID", value=4688)'
+        )
+
+        assert result == {
+            "steps": ["set"],
+            "args": {"set": {"field": "a", "value": "b"}},
+            "guards": {"set": {"type": "equals", "field": "EventID", "value": 4688}},
+        }
+
+    def test_if_inside_string_is_not_a_guard(self):
+        """Test that if inside an argument is kept in the argument"""
+        normalizer = QueryNormalizer()
+        result = normalizer.parse_query('set(field="a", value="x if exists(field=y)")')
+
+        assert result == {
+            "steps": ["set"],
+            "args": {"set": {"field": "a", "value": "x if exists(field=y)"}},
+        }
+
+    def test_invalid_guards(self):
+        """Test that invalid guards raise an error instead of dropping the step"""
+        normalizer = QueryNormalizer()
+        queries = [
+            'set(field="a", value="b") if equals(field="c")',
+            'set(field="a", value="b") if exists(field="c", value="d")',
+            'set(field="a", value="b") if matches(field="c", value="d")',
+            'set(field="a", value="b") when exist(field="c")',
+        ]
+        for query in queries:
+            with pytest.raises(ValueError, match="Invalid guard"):
+                normalizer.parse_query(query)
+
+    def test_text_after_call_is_not_a_guard(self):
+        """Test that text after a call without if or when keeps the step"""
+        normalizer = QueryNormalizer()
+        result = normalizer.parse_query('drop(fields="a") garbage | parse_json(field="raw") extra')
+
+        assert result == {
+            "steps": ["drop", "parse_json"],
+            "args": {"drop": {"fields": "a"}, "parse_json": {"field": "raw"}},
+        }
+
+
+class TestFilter:
+    """Tests for filter and require function normalization"""
+
+    def test_filter_conditions(self):
+        """Test filter with every condition"""
+        normalizer = QueryNormalizer()
+        result = normalizer.parse_query(
+            'filter(field="EventID", equals=4688) | filter(field="level", in="info, warn") '
+            '| filter(field="url", startswith="/health", exclude=true)',
+            version=2,
+        )
+
+        assert [step["args"] for step in result["steps"]] == [
+            {"field": "EventID", "equals": 4688},
+            {"field": "level", "values": "info, warn"},
+            {"field": "url", "startswith": "/health", "exclude": True},
+        ]
+
+    def test_require(self):
+        """Test require with a list of fields"""
+        normalizer = QueryNormalizer()
+        result = normalizer.parse_query('require( fields = "user.name, host.name" )')
+
+        assert result == {
+            "steps": ["require"],
+            "args": {"require": {"fields": "user.name, host.name"}},
+        }
+
+    def test_invalid_calls(self):
+        """Test that invalid filter and require calls are skipped"""
+        normalizer = QueryNormalizer()
+        queries = [
+            'filter(field="a")',
+            'filter(field="a", equals="b", in="c")',
+            'filter(field="a", equals="b", exclude="yes")',
+            'filter(field="a", startswith=1)',
+            'require(fields="")',
+            'require(fields="a;b")',
+        ]
+        for query in queries:
+            assert normalizer.parse_query(query) == {"steps": [], "args": {}}
+
+
+class TestSample:
+    """Tests for sample function normalization"""
+
+    def test_sample(self):
+        """Test sample with arguments in any order"""
+        normalizer = QueryNormalizer()
+
+        for query in (
+            'sample(rate=0.1, key="host.name")',
+            'sample( key = "host.name", rate = 0.1 )',
+        ):
+            assert normalizer.parse_query(query) == {
+                "steps": ["sample"],
+                "args": {"sample": {"rate": 0.1, "key": "host.name"}},
+            }
+
+    def test_invalid_calls(self):
+        """Test that invalid sample calls are skipped"""
+        normalizer = QueryNormalizer()
+        queries = [
+            'sample(rate=1.5, key="host")',
+            'sample(rate="0.1", key="host")',
+            'sample(rate=true, key="host")',
+            "sample(rate=0.1)",
+            'sample(rate=0.1, key="host name")',
+        ]
+        for query in queries:
+            assert normalizer.parse_query(query) == {"steps": [], "args": {}}
+
+
+class TestOptional:
+    """Tests for optional steps"""
+
+    def test_optional_steps(self):
+        """Test optional steps with and without guards"""
+        normalizer = QueryNormalizer()
+        result = normalizer.parse_query(
+            'optional parse_json(field="raw", recursive=true) | '
+            'optional  set(field="a", value="b") when exists(field="c") | drop(fields="d")',
+            version=2,
+        )
+
+        assert [step.get("optional", False) for step in result["steps"]] == [True, True, False]
+        assert result["steps"][1]["guard"] == {"type": "exists", "field": "c"}
+
+    def test_optional_in_version_1(self):
+        """Test that version 1 lists optional functions"""
+        normalizer = QueryNormalizer()
+        result = normalizer.parse_query('optional set(field="a", value="b") | drop(fields="a")')
+
+        assert result["optional"] == ["set"]
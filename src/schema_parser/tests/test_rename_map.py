@@ -0,0 +1,135 @@
+import os
+
+import pytest
+
+from schema_parser.core.utils import flatten_value
+from schema_parser.functions.rename_map import RenameMapFunction, compile_inline_mapping
+
+
+def test_rename_map_inline_mapping():
+    """Test renaming several fields with an inline mapping"""
+    function = RenameMapFunction()
+    data = {"user": {"name": "John", "id": 1}, "src": "10.0.0.1", "other": "value"}
+    result = function.execute(data=data, mapping="user.name:user_name, src:source.ip")
+
+    assert result == {
+        "user": {"id": 1},
+        "user_name": "John",
+        "source": {"ip": "10.0.0.1"},
+        "other": "value",
+    }
+
+
+def test_rename_map_dict_mapping_moves_subtrees():
+    """Test that a mapped field is moved with its whole subtree"""
+    function = RenameMapFunction()
+    data = {"winlog": {"event_data": {"Image": "a.exe"}}}
+    result = function.execute(data=data, mapping={"winlog.event_data": "process"})
+
+    assert result == {"winlog": {}, "process": {"Image": "a.exe"}}
+
+
+def test_rename_map_skips_missing_fields():
+    """Test that missing source fields are skipped"""
+    function = RenameMapFunction()
+    data = {"a": 1, "b": "not a dict"}
+    result = function.execute(data=data, mapping="a:x, b.c:y, missing:z")
+
+    assert result == {"x": 1, "b": "not a dict"}
+
+
+def test_rename_map_swaps_fields():
+    """Test that all sources are read before targets are written"""
+    function = RenameMapFunction()
+    result = function.execute(data={"a": 1, "b": 2}, mapping="a:b, b:a")
+
+    assert result == {"a": 2, "b": 1}
+
+
+def test_rename_map_drop_unmapped():
+    """Test that drop_unmapped keeps only the renamed fields"""
+    function = RenameMapFunction()
+    data = {"user": {"name": "John", "id": 1}, "noise": "x"}
+    result = function.execute(data=data, mapping="user.name:user.name", drop_unmapped=True)
+
+    assert result == {"user": {"name": "John"}}
+
+
+def test_rename_map_literal_dotted_key():
+    """Test that a literal dotted key is renamed like in rename"""
+    function = RenameMapFunction()
+    data = {"a.b": "literal", "a": {"b": "nested"}}
+    result = function.execute(data=data, mapping="a.b:x")
+
+    assert result == {"a": {"b": "nested"}, "x": "literal"}
+
+
+def test_rename_map_overlapping_sources():
+    """Test that overlapping source fields raise ValueError"""
+    function = RenameMapFunction()
+    with pytest.raises(ValueError):
+        function.execute(data={}, mapping="a:x, a.b:y")
+
+
+def test_rename_map_requires_mapping():
+    """Test that a mapping or a path is required"""
+    function = RenameMapFunction()
+    with pytest.raises(ValueError):
+        function.execute(data={})
+
+
+@pytest.mark.parametrize(
+    "file_name, content",
+    [
+        ("mapping.csv", "from_field,to_field\nuser.name,user_name\nsrc,source.ip\n"),
+        ("mapping.json", '{"user.name": "user_name", "src": "source.ip"}'),
+    ],
+)
+def test_rename_map_from_file(tmp_path, file_name, content):
+    """Test loading the mapping from CSV and JSON files"""
+    mapping_file = tmp_path / file_name
+    mapping_file.write_text(content, encoding="utf-8")
+    function = RenameMapFunction()
+    data = {"user": {"name": "John"}, "src": "10.0.0.1"}
+    result = function.execute(data=data, path=str(mapping_file))
+
+    assert result == {"user": {}, "user_name": "John", "source": {"ip": "10.0.0.1"}}
+
+
+def test_rename_map_inline_mapping_is_compiled_once():
+    """Test that an inline mapping is parsed and compiled only on first use"""
+    compile_inline_mapping.cache_clear()
+    function = RenameMapFunction()
+    for _ in range(3):
+        function.execute(data={"a": 1}, mapping="a:b")
+
+    info = compile_inline_mapping.cache_info()
+    assert (info.misses, info.hits) == (1, 2)
+
+
+def test_rename_map_reloads_changed_file(tmp_path):
+    """Test that a mapping file is loaded again after it changes"""
+    mapping_file = tmp_path / "mapping.json"
+    mapping_file.write_text('{"a": "b"}', encoding="utf-8")
+    function = RenameMapFunction()
+    assert function.execute(data={"a": 1}, path=str(mapping_file)) == {"b": 1}
+
+    mapping_file.write_text('{"a": "c"}', encoding="utf-8")
+    stat = mapping_file.stat()
+    os.utime(mapping_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert function.execute(data={"a": 1}, path=str(mapping_file)) == {"c": 1}
+
+
+@pytest.mark.parametrize("drop_unmapped", [False, True])
+def test_rename_map_flat_matches_nested(drop_unmapped):
+    """Test that flat execution gives the flattened nested result"""
+    function = RenameMapFunction()
+    mapping = "user:account, src.ip:source.ip, a:b, b:a, missing:x"
+    data = {"user": {"name": "John", "id": 1}, "src": {"ip": "1", "port": 2}, "a": 1, "b": {"c": 2}}
+
+    flat = function.execute_flat(
+        data=flatten_value(data), mapping=mapping, drop_unmapped=drop_unmapped
+    )
+    nested = function.execute(data=data, mapping=mapping, drop_unmapped=drop_unmapped)
+
+    assert flat == flatten_value(nested)
@@ -0,0 +1,75 @@
+import pytest
+
+from schema_parser.manager import ParserManager
+from schema_parser.router import Router
+
+SECURITY_CONFIG = {"steps": ["set"], "args": {"set": {"field": "source", "value": "security"}}}
+SYSMON_CONFIG = {"steps": ["set"], "args": {"set": {"field": "source", "value": "sysmon"}}}
+DEFAULT_CONFIG = {"steps": ["set"], "args": {"set": {"field": "source", "value": "other"}}}
+
+
+def test_route_by_exact_value():
+    """Test that the discriminator value picks the route"""
+    router = Router("event.id", {"4688": SECURITY_CONFIG, 1: SYSMON_CONFIG}, DEFAULT_CONFIG)
+
+    assert router.route({"event": {"id": "4688"}}) is SECURITY_CONFIG
+    assert router.route({"event": {"id": 1}}) is SYSMON_CONFIG
+    assert router.route({"event": {"id": 7}}) is DEFAULT_CONFIG
+    assert router.route({"event": {"id": {"x": 1}}}) is DEFAULT_CONFIG
+    assert router.route({}) is DEFAULT_CONFIG
+
+
+def test_route_by_longest_prefix():
+    """Test that prefix routing picks the longest matching prefix"""
+    router = Router("message", {"<": SYSMON_CONFIG, "<Event": SECURITY_CONFIG}, match="prefix")
+
+    assert router.route({"message": "<Event xmlns=...>"}) is SECURITY_CONFIG
+    assert router.route({"message": "<Evt>"}) is SYSMON_CONFIG
+    assert router.route({"message": "{}"}) is None
+
+
+def test_router_unsupported_match():
+    """Test that an unknown match type raises ValueError"""
+    with pytest.raises(ValueError):
+        Router("message", {}, match="regex")
+
+
+class TestRoutedParser:
+    """Tests for ParserManager.routed_parser"""
+
+    ROUTED_CONFIG = {
+        "router": {"field": "EventID"},
+        "routes": {"4688": SECURITY_CONFIG, "1": SYSMON_CONFIG},
+    }
+
+    def test_routed_parser(self):
+        """Test that each event runs the configuration of its route"""
+        manager = ParserManager()
+        router = Router.from_config(self.ROUTED_CONFIG)
+
+        assert manager.routed_parser({"EventID": 4688}, router) == {
+            "EventID": 4688,
+            "source": "security",
+        }
+        assert manager.routed_parser({"EventID": "1"}, self.ROUTED_CONFIG, flatten=True) == {
+            "EventID": "1",
+            "source": "sysmon",
+        }
+
+    def test_routed_parser_without_route(self):
+        """Test that a missing route raises unless errors are suppressed"""
+        manager = ParserManager()
+        event = {"EventID": 5}
+
+        with pytest.raises(ValueError):
+            manager.routed_parser(event, self.ROUTED_CONFIG)
+        assert manager.routed_parser(event, self.ROUTED_CONFIG, suppress_errors=True) is event
+
+    def test_routed_parser_default_route(self):
+        """Test that events without a matching route use the default route"""
+        manager = ParserManager()
+        routed_config = {**self.ROUTED_CONFIG, "default": DEFAULT_CONFIG}
+
+        result = manager.routed_parser({"EventID": 5}, routed_config)
+
+        assert result == {"EventID": 5, "source": "other"}
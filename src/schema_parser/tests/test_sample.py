@@ -0,0 +1,98 @@
+import threading
+
+import pytest
+
+from schema_parser.core.outcomes import FILTERED
+from schema_parser.functions.sample import SAMPLE_COUNTERS, SampleFunction, keeps
+from schema_parser.manager import ParserManager
+
+
+@pytest.fixture(autouse=True)
+def reset_counters():
+    SAMPLE_COUNTERS.reset()
+    yield
+    SAMPLE_COUNTERS.reset()
+
+
+def test_sample_is_deterministic():
+    """Test that every event with the same key value gets the same decision"""
+    function = SampleFunction()
+    decisions = {
+        host: function.execute(data={"host": {"name": host}}, rate=0.5, key="host.name")
+        is not FILTERED
+        for host in ("a", "b", "c", "d")
+    }
+
+    for _ in range(3):
+        for host, kept in decisions.items():
+            result = function.execute(data={"host": {"name": host}}, rate=0.5, key="host.name")
+            assert (result is not FILTERED) == kept
+
+
+def test_sample_keeps_the_rate():
+    """Test that the kept fraction of distinct key values is close to the rate"""
+    kept = sum(keeps(f"host-{index}", 0.1) for index in range(10000))
+
+    assert 900 < kept < 1100
+
+
+def test_higher_rate_keeps_superset():
+    """Test that raising the rate never sheds a value a lower rate keeps"""
+    values = [f"host-{index}" for index in range(1000)]
+
+    assert {v for v in values if keeps(v, 0.1)} <= {v for v in values if keeps(v, 0.3)}
+
+
+def test_sample_bounds():
+    """Test rates 0 and 1, numeric keys and events without the key"""
+    function = SampleFunction()
+
+    assert function.execute(data={"id": 7}, rate=1, key="id") == {"id": 7}
+    assert function.execute(data={"id": 7}, rate=0, key="id") is FILTERED
+    assert function.execute(data={"other": 1}, rate=0, key="id") == {"other": 1}
+    assert keeps(7, 0.5) == keeps("7", 0.5)
+
+
+def test_sample_flat():
+    """Test that flat and nested data get the same decision"""
+    function = SampleFunction()
+    for index in range(50):
+        nested = function.execute(data={"host": {"name": str(index)}}, rate=0.5, key="host.name")
+        flat = function.execute_flat(data={"host.name": str(index)}, rate=0.5, key="host.name")
+        assert (nested is FILTERED) == (flat is FILTERED)
+
+
+def test_invalid_rate():
+    """Test that a rate outside of 0 and 1 raises an error"""
+    with pytest.raises(ValueError):
+        SampleFunction().execute(data={"a": "b"}, rate=1.5, key="a")
+
+
+def test_counters():
+    """Test that kept and shed events are counted per step"""
+    manager = ParserManager()
+    parser_config = manager.query_parser('sample(rate=0.25, key="host")')
+    events = [{"host": f"host-{index}"} for index in range(200)]
+
+    results = manager.batch_parser(events, parser_config)
+
+    counts = manager.sample_counters.snapshot()
+    assert counts == {"host:0.25": {"kept": len(results), "shed": 200 - len(results)}}
+
+
+def test_counters_from_several_threads():
+    """Test that decisions counted by several threads are summed in the snapshot"""
+    function = SampleFunction()
+    events = [{"host": f"host-{index}"} for index in range(100)]
+
+    def run():
+        for event in events:
+            function.execute(data=event, rate=1, key="host")
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert SAMPLE_COUNTERS.snapshot() == {"host:1": {"kept": 400, "shed": 0}}
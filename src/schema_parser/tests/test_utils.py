@@ -362,3 +362,144 @@ def test_set_value_with_complex_direct_key():
     assert "level1.level2.level3" not in data
     assert data["level1"]["level2"]["level3"] == "nested"
     assert data["other"] == "value"
+
+
+# Tests for flat helpers
+def test_flatten_value_drops_empty_dicts():
+    """Test that flatten_value joins keys with dots and drops empty dicts"""
+    from schema_parser.core.utils import flatten_value
+
+    data = {"a": {"b": 1, "c": {}}, "d": [{"e": 1}]}
+    assert flatten_value(data) == {"a.b": 1, "d": [{"e": 1}]}
+    assert flatten_value({"b": 1}, "a") == {"a.b": 1}
+
+
+def test_get_flat_value_leaf_and_subtree():
+    """Test that get_flat_value returns leaves and relative subtrees"""
+    from schema_parser.core.utils import get_flat_value
+
+    data = {"a.b": 1, "a.c.d": 2, "ab": 3}
+    assert get_flat_value(data, "a.b") == 1
+    assert get_flat_value(data, "a") == {"b": 1, "c.d": 2}
+    assert get_flat_value(data, "missing") is None
+
+
+def test_pop_flat_value_subtree():
+    """Test that pop_flat_value removes a whole subtree without touching siblings"""
+    from schema_parser.core.utils import pop_flat_value
+
+    data = {"a.b": 1, "a.c": 2, "ab": 3}
+    assert pop_flat_value(data, "a") == {"b": 1, "c": 2}
+    assert data == {"ab": 3}
+    assert pop_flat_value(data, "missing") is None
+
+
+def test_set_flat_value_replaces_subtree_and_ancestors():
+    """Test that set_flat_value replaces subtrees and leaf ancestors"""
+    from schema_parser.core.utils import set_flat_value
+
+    data = {"a": "leaf", "b.c": 1, "b.d": 2}
+    set_flat_value(data, "a.x", {"y": 1})
+    set_flat_value(data, "b", "value")
+    assert data == {"a.x.y": 1, "b": "value"}
+
+
+# Tests for normalize_keys
+def test_normalize_keys_expands_dotted_keys():
+    """Test that normalize_keys merges dotted and nested keys into nested form"""
+    from schema_parser.core.utils import normalize_keys
+
+    data = {"a.b": 1, "a": {"c": 2, "d.e": 3}, "f": "value"}
+    assert normalize_keys(data) == {"a": {"b": 1, "c": 2, "d": {"e": 3}}, "f": "value"}
+
+
+def test_normalize_keys_later_key_replaces_non_dict():
+    """Test that a later dotted key replaces a non-dict value like set_value does"""
+    from schema_parser.core.utils import normalize_keys
+
+    assert normalize_keys({"a": "leaf", "a.b": 1}) == {"a": {"b": 1}}
+    assert normalize_keys({"a.b": 1, "a": "leaf"}) == {"a": "leaf"}
+
+
+def test_normalize_keys_does_not_modify_input():
+    """Test that normalize_keys copies dicts and lists"""
+    from schema_parser.core.utils import normalize_keys
+
+    data = {"a.b": [{"c": 1}], "d": {"e": 1}}
+    result = normalize_keys(data)
+    result["a"]["b"][0]["c"] = 2
+    result["d"]["e"] = 2
+    assert data == {"a.b": [{"c": 1}], "d": {"e": 1}}
+
+
+def test_literal_keys_disabled_skips_direct_key():
+    """Test that literal_keys=False only traverses nested dictionaries"""
+    from schema_parser.core.utils import delete_value, get_value, set_value
+
+    data = {"a.b": "direct", "a": {"b": "nested"}}
+    assert get_value(data, "a.b", literal_keys=False) == "nested"
+    set_value(data, "a.b", "new", literal_keys=False)
+    assert data == {"a.b": "direct", "a": {"b": "new"}}
+    assert delete_value(data, "a.b", literal_keys=False) == "new"
+    assert data == {"a.b": "direct", "a": {}}
+
+
+def test_flat_dict_prefix_index():
+    """Test that the prefix index of FlatDict follows every change of the dictionary"""
+    from schema_parser.core.utils import FlatDict, get_flat_value, pop_flat_value, set_flat_value
+
+    data = FlatDict({"a.b": 1, "a.c.d": 2, "ab": 3})
+    assert data.has_subtree("a") and data.has_subtree("a.c")
+    assert not data.has_subtree("ab") and not data.has_subtree("a.b")
+
+    set_flat_value(data, "x.y", {"z": 1})
+    assert data.has_subtree("x.y")
+    assert pop_flat_value(data, "a") == {"b": 1, "c.d": 2}
+    assert not data.has_subtree("a") and not data.has_subtree("a.c")
+    del data["x.y.z"]
+    data.update({"u.v": 1})
+    assert not data.has_subtree("x")
+    assert get_flat_value(data, "u") == {"v": 1}
+    assert get_flat_value(data, "missing") is None
+    assert data == {"ab": 3, "u.v": 1}
+
+
+def test_flat_dict_subtree_keys():
+    """Test that the keys of a subtree are listed from the index in dictionary order"""
+    from schema_parser.core.utils import FlatDict
+
+    data = FlatDict({"a.c": 1, "b": 2, "a.b.x": 3})
+    assert data.subtree_keys("a") == ["a.c", "a.b.x"]
+    assert data.subtree_keys("a.b") == ["a.b.x"]
+    assert data.subtree_keys("b") == []
+
+    data.update({"a.d": 4, "b": 5})
+    data["a.c"] = 6
+    assert data.subtree_keys("a") == ["a.c", "a.b.x", "a.d"]
+
+
+def test_flatten_copy():
+    """Test that flatten_copy flattens like flatten_value and copies mutable leaves"""
+    from schema_parser.core.utils import flatten_copy, flatten_value
+
+    value = {"a": {"b": [1], "c": {}}, "d": "x"}
+    flat = flatten_copy(value)
+
+    assert flat == flatten_value(value) == {"a.b": [1], "d": "x"}
+    assert flat["a.b"] is not value["a"]["b"]
+
+
+def test_flat_dict_copies():
+    """Test that copies of a FlatDict keep their type and a consistent index"""
+    import copy
+    import pickle
+
+    from schema_parser.core.utils import FlatDict
+
+    data = FlatDict({"a.b": [1]})
+    data.has_subtree("a")
+    for duplicate in (copy.deepcopy(data), pickle.loads(pickle.dumps(data))):
+        assert type(duplicate) is FlatDict
+        assert duplicate == data and duplicate["a.b"] is not data["a.b"]
+        duplicate["c.d"] = 1
+        assert duplicate.has_subtree("a") and duplicate.has_subtree("c")